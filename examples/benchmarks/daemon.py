@@ -0,0 +1,102 @@
+import os
+import sys
+import time
+import tempfile
+import threading
+import argparse
+
+import numpy as np
+
+from ingenialink.canopen.daemon import BusDaemon, DaemonClient
+
+
+class SimServo(object):
+    """ Servo simulating a fixed SDO transaction time. """
+
+    def __init__(self, latency):
+        self._latency = latency
+        self._lock = threading.Lock()
+        self._values = {}
+
+    def raw_read(self, reg, subnode=1):
+        with self._lock:
+            time.sleep(self._latency)
+            return self._values.get((reg, subnode), 0)
+
+    def raw_write(self, reg, data, confirm=True, extended=0, subnode=1):
+        with self._lock:
+            time.sleep(self._latency)
+            self._values[(reg, subnode)] = data
+
+    def state_subscribe(self, cb):
+        return 0
+
+
+def client(path, reg, n_reqs, latencies):
+    cli = DaemonClient(path)
+    servo = cli.servo(1)
+
+    for _ in range(n_reqs):
+        start = time.perf_counter()
+        servo.raw_read(reg)
+        latencies.append(time.perf_counter() - start)
+
+    cli.close()
+
+
+def run(path, n_clients, n_reqs, shared):
+    latencies = [[] for _ in range(n_clients)]
+    threads = [threading.Thread(target=client,
+                                args=(path, 'REG' if shared else
+                                      'REG_{}'.format(i), n_reqs,
+                                      latencies[i]))
+               for i in range(n_clients)]
+
+    start = time.perf_counter()
+    for thread in threads:
+        thread.start()
+    for thread in threads:
+        thread.join()
+    elapsed = time.perf_counter() - start
+
+    lat = np.concatenate([np.asarray(lt) for lt in latencies]) * 1e3
+    per_client = [len(lt) / elapsed for lt in latencies]
+    print('{:2d} client(s), {} register(s): {:8.0f} req/s, latency p50 '
+          '{:.2f} ms p99 {:.2f} ms, per client min/max {:.0f}/{:.0f} '
+          'req/s'.format(n_clients, 'same' if shared else 'own ',
+                         n_clients * n_reqs / elapsed,
+                         np.percentile(lat, 50), np.percentile(lat, 99),
+                         min(per_client), max(per_client)))
+
+
+def main():
+    parser = argparse.ArgumentParser(description='Bus daemon benchmark')
+    parser.add_argument('--latency', type=float, default=2e-4,
+                        help='simulated SDO transaction time (s)')
+    parser.add_argument('--requests', type=int, default=1000,
+                        help='requests per client')
+    args = parser.parse_args()
+
+    path = os.path.join(tempfile.mkdtemp(), 'il.sock')
+    daemon = BusDaemon({1: SimServo(args.latency)}, path)
+    daemon.start()
+
+    # direct access, no daemon
+    servo = SimServo(args.latency)
+    start = time.perf_counter()
+    for _ in range(args.requests):
+        servo.raw_read('REG')
+    print('direct: {:8.0f} req/s'.format(
+        args.requests / (time.perf_counter() - start)))
+
+    for n_clients in (1, 4, 16):
+        for shared in (False, True):
+            run(path, n_clients, args.requests, shared)
+
+    print(daemon.stats['deduplicated'], 'reads deduplicated')
+    daemon.stop()
+
+
+if __name__ == '__main__':
+    main()
+    sys.exit(0)
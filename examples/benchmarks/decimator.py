@@ -0,0 +1,52 @@
+import sys
+from time import perf_counter
+
+import numpy as np
+
+from ingenialink.decimator import Decimator
+
+
+_N_SAMPLES = 10000000
+""" int: Capture length (samples). """
+
+_BLOCK_SZ = 100000
+""" int: Block size pushed at once (samples). """
+
+_N_BUCKETS = 1920
+""" int: Number of buckets (pixels) per query. """
+
+_N_QUERIES = 100
+""" int: Number of queries per window size. """
+
+
+def run_benchmark():
+    rng = np.random.default_rng(0)
+    dec = Decimator(1)
+
+    t_push = 0.
+    for start in range(0, _N_SAMPLES, _BLOCK_SZ):
+        t = np.arange(start, start + _BLOCK_SZ) * 1e-3
+        d = [rng.standard_normal(_BLOCK_SZ)]
+
+        t0 = perf_counter()
+        dec.push(t, d)
+        t_push += perf_counter() - t0
+
+    print('Push: {} samples in {:.3f} s ({:.1f} Msamples/s), {} levels'.format(
+        dec.samples, t_push, dec.samples / t_push / 1e6, dec.levels))
+
+    for width in (1000, 100000, 1000000, _N_SAMPLES):
+        starts = rng.integers(0, _N_SAMPLES - width + 1, _N_QUERIES)
+
+        t0 = perf_counter()
+        for start in starts:
+            t, _, _, _ = dec.window_idx(start, start + width, _N_BUCKETS)
+        elapsed = (perf_counter() - t0) / _N_QUERIES
+
+        print('Window {:>8} samples -> {:>4} buckets: {:.3f} ms/query'.format(
+            width, len(t), elapsed * 1e3))
+
+
+if __name__ == '__main__':
+    run_benchmark()
+    sys.exit(0)
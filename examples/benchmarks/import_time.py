@@ -0,0 +1,75 @@
+import re
+import sys
+import argparse
+import subprocess
+
+
+_HEAVY = ('canopen', 'can', 'numpy')
+""" tuple: Top-level packages that must not be loaded by ``import
+    ingenialink``.
+"""
+
+_ENTRY = re.compile(r'import time:\s+(\d+)\s+\|\s+(\d+)\s+\|(\s*)(\S+)')
+""" re: ``-X importtime`` entry (self us, cumulative us, indent, module). """
+
+
+def import_time(module):
+    """ Obtain the modules imported by a fresh interpreter importing module.
+
+        Args:
+            module (str): Module to import.
+
+        Returns:
+            dict: Cumulative import time (us) per imported module.
+    """
+
+    p = subprocess.run([sys.executable, '-X', 'importtime', '-c',
+                        'import ' + module],
+                       stderr=subprocess.PIPE, universal_newlines=True)
+    if p.returncode:
+        raise RuntimeError(p.stderr)
+
+    times = {}
+    for line in p.stderr.splitlines():
+        m = _ENTRY.match(line)
+        if m:
+            times[m.group(4)] = int(m.group(2))
+
+    return times
+
+
+def run_benchmark():
+    parser = argparse.ArgumentParser(
+        description='Check the import time of ingenialink')
+    parser.add_argument('--budget', type=float, default=None,
+                        help='fail if the import takes longer (ms)')
+    parser.add_argument('--runs', type=int, default=5,
+                        help='number of interpreter runs')
+    args = parser.parse_args()
+
+    best = None
+    for _ in range(args.runs):
+        times = import_time('ingenialink')
+        total = times['ingenialink'] / 1e3
+        best = total if best is None else min(best, total)
+
+    heavy = sorted(m for m in times if m.split('.')[0] in _HEAVY)
+
+    print('import ingenialink: {:.1f} ms (best of {})'.format(best, args.runs))
+    for m in sorted(times, key=times.get, reverse=True)[:10]:
+        print('  {:>8.1f} ms  {}'.format(times[m] / 1e3, m))
+
+    failed = False
+    if heavy:
+        print('Eagerly imported: {}'.format(', '.join(heavy)))
+        failed = True
+
+    if args.budget is not None and best > args.budget:
+        print('Import time over budget ({} ms)'.format(args.budget))
+        failed = True
+
+    return 1 if failed else 0
+
+
+if __name__ == '__main__':
+    sys.exit(run_benchmark())
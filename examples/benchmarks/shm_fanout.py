@@ -0,0 +1,79 @@
+import sys
+import time
+import multiprocessing as mp
+
+import numpy as np
+
+from ingenialink.shm import ShmPublisher, ShmSubscriber
+
+
+_N_CH = 4
+""" int: Number of channels. """
+
+_BLOCK_SZ = 1000
+""" int: Samples published at once. """
+
+_DURATION = 2.
+""" float: Duration of each run (s). """
+
+
+def subscriber(name, stop, results):
+    sub = ShmSubscriber(name)
+    samples = 0
+    checksum = 0.
+
+    while not stop.is_set():
+        t, d, _ = sub.read()
+        if len(t):
+            # touch the data, as a real consumer would
+            checksum += d[:, -1].sum()
+            samples += len(t)
+        else:
+            time.sleep(0)
+
+    results.put((samples, sub.lost))
+    sub.close()
+
+
+def run(n_subs):
+    ctx = mp.get_context('spawn')
+    pub = ShmPublisher(_N_CH, capacity=1 << 18)
+    stop = ctx.Event()
+    results = ctx.Queue()
+
+    procs = [ctx.Process(target=subscriber, args=(pub.name, stop, results))
+             for _ in range(n_subs)]
+    for p in procs:
+        p.start()
+    time.sleep(1.)
+
+    t = np.arange(_BLOCK_SZ, dtype=np.float64)
+    d = [np.random.standard_normal(_BLOCK_SZ) for _ in range(_N_CH)]
+
+    start = time.perf_counter()
+    while time.perf_counter() - start < _DURATION:
+        pub.publish(t, d)
+    elapsed = time.perf_counter() - start
+    time.sleep(0.1)
+
+    stop.set()
+    stats = [results.get() for _ in procs]
+    for p in procs:
+        p.join()
+
+    published = pub.seq
+    pub.close()
+
+    delivered = sum(s for s, _ in stats)
+    lost = sum(lost for _, lost in stats)
+    print('{} subscriber(s): published {:.2f} Msamples/s, delivered '
+          '{:.2f} Msamples/s per subscriber ({:.2f} total), lost {}'.format(
+              n_subs, published / elapsed / 1e6,
+              delivered / n_subs / elapsed / 1e6, delivered / elapsed / 1e6,
+              lost))
+
+
+if __name__ == '__main__':
+    for n in (1, 4, 8):
+        run(n)
+    sys.exit(0)
@@ -0,0 +1,67 @@
+import sys
+import time
+import random
+import struct
+
+import canopen
+import numpy as np
+
+from ingenialink.canopen.sync import SyncAcquisition
+
+
+_NODES = (1, 2, 3)
+""" tuple: Simulated node ids. """
+
+_DROP = 0.01
+""" float: Probability of a simulated TPDO not being sent. """
+
+
+def simulate_nodes(channel):
+    """ Simulate nodes sending a TPDO (position, velocity) on each SYNC. """
+
+    net = canopen.Network()
+    net.connect(interface='virtual', channel=channel)
+
+    def on_sync(can_id, data, timestamp):
+        counter = data[0] if data else 0
+        for node_id in _NODES:
+            if random.random() < _DROP:
+                continue
+            net.send_message(0x180 + node_id,
+                             struct.pack('<ih', 1000 * node_id + counter,
+                                         -node_id))
+
+    net.subscribe(0x80, on_sync)
+
+    return net
+
+
+def run_example(channel='sync_example'):
+    nodes = simulate_nodes(channel)
+
+    net = canopen.Network()
+    net.connect(interface='virtual', channel=channel)
+
+    acq = SyncAcquisition(net)
+    for node_id in _NODES:
+        acq.add_pdo(0x180 + node_id,
+                    [('pos_{}'.format(node_id), 0, np.int32),
+                     ('vel_{}'.format(node_id), 4, np.int16)])
+
+    acq.start(period=0.002)
+    time.sleep(2.)
+    acq.stop()
+
+    t, counter, d, mask = acq.data
+    print('Cycles: {}, fields: {}'.format(len(t), acq.fields))
+    print('Complete cycles: {}'.format(np.count_nonzero(mask.all(axis=1))))
+    print('Stats: {}'.format(acq.stats))
+    print('Last cycle: {}'.format(d[-1]))
+
+    net.disconnect()
+    nodes.disconnect()
+
+
+if __name__ == '__main__':
+    run_example()
+    sys.exit()
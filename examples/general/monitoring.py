@@ -1,8 +1,8 @@
 import sys
-import numpy as np
 from time import sleep
 
 import ingenialink as il
+from ingenialink.monitoring import MonitoringDecoder
 
 
 def monitoring():
@@ -26,6 +26,9 @@ def monitoring():
         mapped_reg = servo.dict.regs['BUS_VOLTAGE_READINGS'].address
         dtype = servo.dict.regs['BUS_VOLTAGE_READINGS'].dtype.value
         servo.net.monitoring_set_mapped_register(0, mapped_reg, dtype)
+        decoder = MonitoringDecoder(
+            servo.net.monitoring_mapping,
+            bytes_per_block=servo.net.monitoring_get_bytes_per_block())
         # Enable monitoring
         servo.net.monitoring_enable()
         # Check monitoring status
@@ -42,12 +45,9 @@ def monitoring():
                     if first_data_entry:
                         max_data_value = monit_nmb_blocks
                         first_data_entry = False
-                    servo.net.monitoring_read_data()
-                    register = servo.dict.regs['BUS_VOLTAGE_READINGS'].dtype
-                    tmp_monitor_data = servo.net.monitoring_channel_data(0, register)
-                    monitoring_data = monitoring_data + tmp_monitor_data
-                    if len(monitoring_data) >= 1001:
-                        np.resize(monitoring_data, 1001)
+                    decoder.read(servo.net)
+                    if len(decoder) >= 1001:
+                        monitoring_data = decoder.channel_data(0)[:1001]
                         read_process_finished = True
             except Exception as e:
                 print("Error:", str(e))
@@ -0,0 +1,25 @@
+import sys
+
+import ingenialink as il
+from ingenialink.monitoring import MonitoringSession
+
+
+def monitoring_session():
+    _, servo = il.lucky(il.NET_PROT.ETH, "summit.xml",
+                        address_ip='192.168.2.22', port_ip=1061)
+
+    session = MonitoringSession(servo, ['BUS_VOLTAGE_READINGS'], window=1000)
+    with session:
+        samples = 0
+        while samples < 10000:
+            block = session.get(timeout=1.)
+            if block is not None:
+                samples += len(block.data)
+                print(block.seq, block.data['ch0'].mean())
+
+    print(session.stats)
+
+
+if __name__ == '__main__':
+    monitoring_session()
+    sys.exit(0)
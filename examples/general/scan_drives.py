@@ -2,37 +2,27 @@ import sys
 from time import sleep
 
 import ingenialink as il
+from ingenialink.discovery import DiscoveryService
 
 
-def scan_port(drives, protocol, port):
-    new_drives = drives
-    try:
-        network_in_use = False
-        for drive in new_drives:
-            if drive['network'].prot == protocol and drive['network'].port == port:
-                network_in_use = True
-        if not network_in_use:
-            network = il.Network(protocol, port)
-            sleep(0.1)
-            drives_detected = network.servos()
-            for drive in drives_detected:
-                new_drives.append({"port": port, "drive": drive, "network": network, "protocol": protocol})
-    except:
-        pass
-    return new_drives
+def on_evt(evt, protocol, port, drives):
+    print('{}: {} {} drives {}'.format(evt.name, protocol.name, port, drives))
+
 
 def run_example_scan():
-    protocol = il.NET_PROT.MCB
-    drives = []
-    while True:
-        ports_to_scan = il.devices(protocol)
-        for port in ports_to_scan:
-            drives = scan_port(drives, protocol, port)
-        print(drives)
-        sleep(1)
+    service = DiscoveryService(protocols=[il.NET_PROT.MCB], on_evt=on_evt)
+    service.start(period=1.)
+    try:
+        while True:
+            sleep(1)
+    except KeyboardInterrupt:
+        pass
+    finally:
+        service.stop()
+        service.pool.close()
 
 
 if __name__ == '__main__':
     test = run_example_scan()
 
-    sys.exit()
\ No newline at end of file
+    sys.exit()
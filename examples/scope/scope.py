@@ -7,12 +7,13 @@ from qtpy.QtGui import (QStandardItemModel, QStandardItem, QImage, QPixmap,
                         QPalette)
 from qtpy.QtWidgets import QApplication, QMainWindow
 
+import pyqtgraph as pg
 import qtawesome as qta
 import qtmodern.styles
 import qtmodern.windows
 
-import numpy as np
 import ingenialink as il
+from ingenialink.decimator import Decimator
 
 
 _RESOURCES = join(dirname(abspath(__file__)), 'resources')
@@ -72,6 +73,12 @@ class ScopeWindow(QMainWindow):
     _N_SAMPLES = 1000
     """ int: Number of samples. """
 
+    _N_BUCKETS = 500
+    """ int: Maximum number of plotted points. """
+
+    _SHOW_MEAN = True
+    """ bool: Overlay the bucket mean on the min/max envelope. """
+
     _POLLER_T_S = 10e-3
     """ float: Poller sampling period (s). """
 
@@ -180,8 +187,20 @@ class ScopeWindow(QMainWindow):
                                         self._PRANGE + 10])
             self._plot.showGrid(x=True, y=True)
 
-            self._curve = self.scope.getPlotItem().plot()
-            self._curve.setPen(color='y', width=2)
+            # min/max envelope, keeps spikes shorter than a bucket
+            self._curveMin = self._plot.plot()
+            self._curveMin.setPen(color='y', width=1)
+            self._curveMax = self._plot.plot()
+            self._curveMax.setPen(color='y', width=1)
+
+            self._envelope = pg.FillBetweenItem(self._curveMin,
+                                                self._curveMax,
+                                                brush=(255, 255, 0, 80))
+            self._plot.addItem(self._envelope)
+
+            self._curveMean = self._plot.plot()
+            self._curveMean.setPen(color='w', width=2)
+            self._curveMean.setVisible(self._SHOW_MEAN)
 
         elif state == self.stateIdle:
             self.cboxServos.setEnabled(True)
@@ -245,9 +264,7 @@ class ScopeWindow(QMainWindow):
         self._poller.configure(self._POLLER_T_S, self._POLLER_BUF_SZ)
         self._poller.ch_configure(0, reg)
 
-        self._data = np.zeros(self._N_SAMPLES)
-        self._time = np.arange(-self._N_SAMPLES * self._POLLER_T_S, 0,
-                               self._POLLER_T_S)
+        self._decimator = Decimator(1)
 
         self._timerPlotUpdate.start(1000 / self._FPS)
 
@@ -325,12 +342,18 @@ class ScopeWindow(QMainWindow):
         samples = len(t)
 
         if samples:
-            self._time = np.roll(self._time, -samples)
-            self._time[-samples:] = t
-            self._data = np.roll(self._data, -samples)
-            self._data[-samples:] = d[0]
-
-            self._curve.setData(self._time, self._data)
+            self._decimator.push(t, d)
+
+            # bounded history, only the latest samples are displayed
+            if self._decimator.samples > 2 * self._N_SAMPLES:
+                self._decimator.trim(self._N_SAMPLES)
+
+            t, mn, mx, mean = self._decimator.last(self._N_SAMPLES,
+                                                   self._N_BUCKETS)
+            self._curveMin.setData(t, mn[0])
+            self._curveMax.setData(t, mx[0])
+            if self._SHOW_MEAN:
+                self._curveMean.setData(t, mean[0])
 
 
 if __name__ == '__main__':
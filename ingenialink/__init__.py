@@ -1,3 +1,6 @@
+import sys
+import importlib
+
 from .net import (Network, NetworkMonitor, devices, NET_PROT, NET_STATE,
                   NET_DEV_EVT)
 from .servo import (Servo, lucky, SERVO_STATE, SERVO_FLAGS, SERVO_MODE,
@@ -8,9 +11,6 @@ from .poller import Poller
 from .registers import Register, REG_DTYPE, REG_ACCESS, REG_PHY
 from .dict_ import Dictionary
 from .dict_labels import LabelsDictionary
-from .canopen.servo_node import Servo as CANOpenServo
-from .canopen.net import Network as CANOpenNetwork
-from .canopen.poller_node import Poller as CANOpenPoller
 from ._ingenialink import lib
 from ._utils import pstr
 
@@ -28,6 +28,43 @@ __all__ = ['Network', 'NetworkMonitor', 'devices', 'NET_PROT', 'NET_DEV_EVT',
 
 __version__ = '5.1.0'
 
+_LAZY = {'CANOpenServo': ('.canopen.servo_node', 'Servo'),
+         'CANOpenNetwork': ('.canopen.net', 'Network'),
+         'CANOpenPoller': ('.canopen.poller_node', 'Poller'),
+         'CAN_DEVICE': ('.canopen.net', 'CAN_DEVICE'),
+         'canopen': ('.canopen', None)}
+""" dict: Names imported on first access (module, attribute). The CANopen
+    stack pulls python-canopen and python-can, so it is only loaded when
+    used.
+"""
+
+
+def __getattr__(name):
+    """ Import lazily loaded names on first access. """
+
+    if name not in _LAZY:
+        raise AttributeError(
+            'module {!r} has no attribute {!r}'.format(__name__, name))
+
+    module, attr = _LAZY[name]
+    value = importlib.import_module(module, __name__)
+    if attr:
+        value = getattr(value, attr)
+
+    globals()[name] = value
+
+    return value
+
+
+def __dir__():
+    return sorted(set(globals()) | set(_LAZY))
+
+
+if sys.version_info < (3, 7):
+    # module __getattr__ (PEP 562) is not available, import eagerly
+    for _name in _LAZY:
+        __getattr__(_name)
+
 try:
     __ingenialink_C_version__ = pstr(lib.il_version())
 except:
@@ -0,0 +1,241 @@
+import time
+from threading import Thread, Event, Lock
+
+import numpy as np
+
+import logging
+
+log = logging.getLogger(__name__)
+
+
+class StreamStats(object):
+    """ Streaming per-channel statistics.
+
+        Acquisition blocks are folded into running statistics (count,
+        minimum, maximum, mean, RMS and variance, merged block by block with
+        Welford's/Chan's update) and fixed-bin histograms, so memory does
+        not depend on the run length. Blocks are pushed as with `Recorder`,
+        or read periodically from an attached source (`Poller`, the CANopen
+        `Poller` or a `MonitoringSession`). NaN samples (e.g. disabled or
+        missing channels) are ignored.
+
+        Args:
+            n_ch (int): Number of channels.
+            bins (int, optional): Histogram bins, 0 to disable histograms.
+            ranges (list, optional): Histogram (min, max) range of every
+                channel (or a single range for all of them). Samples out of
+                range are counted as underflow/overflow.
+            snapshot_period (int, float, optional): Period (s) of the
+                snapshots taken while pushing blocks, see `last_snapshot`.
+            on_snapshot (callback, optional): Snapshot callback, receiving
+                the snapshot.
+
+        Raises:
+            ValueError: If the parameters are not valid.
+    """
+
+    def __init__(self, n_ch, bins=0, ranges=None, snapshot_period=None,
+                 on_snapshot=None):
+        if n_ch < 1:
+            raise ValueError('Invalid number of channels')
+
+        if bins < 0:
+            raise ValueError('Invalid number of bins')
+
+        self._n_ch = n_ch
+        self._bins = bins
+        self._edges = None
+        if bins:
+            if ranges is None:
+                raise ValueError('Histogram ranges required')
+            if len(ranges) == 2 and np.isscalar(ranges[0]):
+                ranges = [ranges] * n_ch
+            if len(ranges) != n_ch:
+                raise ValueError('Unexpected number of ranges')
+
+            self._edges = [np.linspace(lo, hi, bins + 1) for lo, hi in ranges]
+
+        self._snapshot_period = snapshot_period
+        self._on_snapshot = on_snapshot
+
+        self._lock = Lock()
+        self._sources = []
+        self._stop = Event()
+
+        self.reset()
+
+    def reset(self):
+        """ Reset the statistics. """
+
+        with self._lock:
+            self._n = np.zeros(self._n_ch, dtype=np.int64)
+            self._mean = np.zeros(self._n_ch)
+            self._m2 = np.zeros(self._n_ch)
+            self._sumsq = np.zeros(self._n_ch)
+            self._min = np.full(self._n_ch, np.inf)
+            self._max = np.full(self._n_ch, -np.inf)
+            self._hist = np.zeros((self._n_ch, self._bins), dtype=np.int64)
+            self._under = np.zeros(self._n_ch, dtype=np.int64)
+            self._over = np.zeros(self._n_ch, dtype=np.int64)
+            self._t_last = None
+            self._snapshot = None
+            self._snapshot_t = time.monotonic()
+
+    def _fold(self, ch, x):
+        """ Fold the samples of a channel into its statistics. """
+
+        x = x[~np.isnan(x)]
+        n_b = len(x)
+        if not n_b:
+            return
+
+        mean_b = x.mean()
+        m2_b = np.square(x - mean_b).sum()
+
+        n_a = self._n[ch]
+        n = n_a + n_b
+        delta = mean_b - self._mean[ch]
+        self._mean[ch] += delta * n_b / n
+        self._m2[ch] += m2_b + delta * delta * n_a * n_b / n
+        self._n[ch] = n
+
+        self._sumsq[ch] += np.square(x).sum()
+        self._min[ch] = min(self._min[ch], x.min())
+        self._max[ch] = max(self._max[ch], x.max())
+
+        if self._bins:
+            edges = self._edges[ch]
+            self._hist[ch] += np.histogram(x, bins=edges)[0]
+            self._under[ch] += np.count_nonzero(x < edges[0])
+            self._over[ch] += np.count_nonzero(x > edges[-1])
+
+    def push(self, t, d):
+        """ Fold an acquisition block.
+
+            Args:
+                t (list, array): Time vector.
+                d (list): Data vectors, one per channel (None if disabled).
+
+            Raises:
+                ValueError: If the number of channels is not valid.
+        """
+
+        if len(d) != self._n_ch:
+            raise ValueError('Unexpected number of channels')
+
+        with self._lock:
+            for ch, data in enumerate(d):
+                if data is not None:
+                    self._fold(ch, np.asarray(data, dtype=np.float64))
+
+            if len(t):
+                self._t_last = t[-1]
+
+            snapshot = None
+            if (self._snapshot_period is not None and
+                    time.monotonic() - self._snapshot_t >=
+                    self._snapshot_period):
+                snapshot = self._take()
+                self._snapshot = snapshot
+                self._snapshot_t = time.monotonic()
+
+        if snapshot is not None and self._on_snapshot is not None:
+            try:
+                self._on_snapshot(snapshot)
+            except Exception as e:
+                log.error(e)
+
+    def push_block(self, block):
+        """ Fold a monitoring block (see `MonitoringSession`).
+
+            Args:
+                block (MonitoringBlock): Block, channels in field order.
+        """
+
+        data = block.data
+        self.push([block.t_ns], [data[name] for name in data.dtype.names])
+
+    def attach(self, source, period=1.):
+        """ Read an acquisition source.
+
+            Args:
+                source: `MonitoringSession` (its blocks are folded as they
+                    are read), or object with a `data` property returning a
+                    (time, data, ...) tuple, as `Poller`, read periodically
+                    from a thread.
+                period (int, float, optional): Read period (s).
+        """
+
+        if hasattr(source, 'add_sink'):
+            source.add_sink(self.push_block)
+            self._sources.append(
+                lambda: source.remove_sink(self.push_block))
+            return
+
+        def run():
+            while not self._stop.wait(period):
+                data = source.data
+                self.push(data[0], data[1])
+            data = source.data
+            self.push(data[0], data[1])
+
+        thread = Thread(target=run)
+        thread.daemon = True
+        thread.start()
+        self._sources.append(thread.join)
+
+    def detach(self):
+        """ Stop reading all the attached sources. """
+
+        self._stop.set()
+        for release in self._sources:
+            release()
+        self._sources = []
+        self._stop.clear()
+
+    def _take(self):
+        n = self._n
+        valid = n > 0
+        with np.errstate(invalid='ignore', divide='ignore'):
+            var = np.where(valid, self._m2 / n, np.nan)
+            rms = np.where(valid, np.sqrt(self._sumsq / n), np.nan)
+
+        snapshot = {
+            't': self._t_last,
+            'count': n.copy(),
+            'min': np.where(valid, self._min, np.nan),
+            'max': np.where(valid, self._max, np.nan),
+            'mean': np.where(valid, self._mean, np.nan),
+            'rms': rms,
+            'var': var,
+            'std': np.sqrt(var)
+        }
+
+        if self._bins:
+            snapshot['hist'] = self._hist.copy()
+            snapshot['edges'] = [edges.copy() for edges in self._edges]
+            snapshot['underflow'] = self._under.copy()
+            snapshot['overflow'] = self._over.copy()
+
+        return snapshot
+
+    def snapshot(self):
+        """ Obtain the current statistics.
+
+            Returns:
+                dict: Last time pushed ('t'), and per-channel arrays of
+                    'count', 'min', 'max', 'mean', 'rms', 'var' and 'std'
+                    (population), NaN for channels without samples. With
+                    histograms, also 'hist' (counts per channel and bin),
+                    'edges', 'underflow' and 'overflow'.
+        """
+
+        with self._lock:
+            return self._take()
+
+    @property
+    def last_snapshot(self):
+        """ dict: Last periodic snapshot (see `snapshot`), None if none was
+            taken yet.
+        """
+        return self._snapshot
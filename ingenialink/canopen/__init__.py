@@ -1,3 +1,38 @@
+import sys
+import importlib
+
+from . import constants
 from .constants import *
-from .dictionary import DictionaryCANOpen
-from .net import CAN_DEVICE, CAN_BAUDRATE
+
+_LAZY = {'DictionaryCANOpen': ('.dictionary', 'DictionaryCANOpen'),
+         'CAN_DEVICE': ('.net', 'CAN_DEVICE'),
+         'CAN_BAUDRATE': ('.net', 'CAN_BAUDRATE'),
+         'TX_CLASS': ('.scheduler', 'TX_CLASS')}
+""" dict: Names imported on first access (module, attribute). """
+
+__all__ = ([name for name in dir(constants) if not name.startswith('_')] +
+           list(_LAZY))
+
+
+def __getattr__(name):
+    """ Import lazily loaded names on first access. """
+
+    if name not in _LAZY:
+        raise AttributeError(
+            'module {!r} has no attribute {!r}'.format(__name__, name))
+
+    module, attr = _LAZY[name]
+    value = getattr(importlib.import_module(module, __name__), attr)
+    globals()[name] = value
+
+    return value
+
+
+def __dir__():
+    return sorted(set(globals()) | set(_LAZY))
+
+
+if sys.version_info < (3, 7):
+    # module __getattr__ (PEP 562) is not available, import eagerly
+    for _name in _LAZY:
+        __getattr__(_name)
@@ -0,0 +1,253 @@
+import time
+import threading
+
+from ..exceptions import ILValueError
+from .registers import REG_DTYPE
+
+import can
+
+
+DTYPE_SIZE = {REG_DTYPE.U8: 1,
+              REG_DTYPE.S8: 1,
+              REG_DTYPE.U16: 2,
+              REG_DTYPE.S16: 2,
+              REG_DTYPE.U32: 4,
+              REG_DTYPE.S32: 4,
+              REG_DTYPE.FLOAT: 4,
+              REG_DTYPE.U64: 8,
+              REG_DTYPE.S64: 8}
+""" dict: Size (bytes) of each register data type. """
+
+BUDGET_POLICIES = ('reject', 'stretch')
+""" tuple: Supported budget policies. """
+
+
+def frame_bits(dlc, extended=False):
+    """ Obtain the worst-case length of a CAN frame, including bit stuffing.
+
+        Args:
+            dlc (int): Data length (bytes).
+            extended (bool, optional): Extended (29-bit) identifier.
+
+        Returns:
+            int: Frame length (bits).
+    """
+
+    if extended:
+        return 8 * dlc + 67 + (54 + 8 * dlc - 1) // 4
+
+    return 8 * dlc + 47 + (34 + 8 * dlc - 1) // 4
+
+
+def sdo_bits(size):
+    """ Obtain the bus bits used by an SDO transfer.
+
+        Expedited transfers (up to 4 bytes) use a request and a response
+        frame, segmented ones add a request and response per 7 bytes.
+
+        Args:
+            size (int): Data size (bytes).
+
+        Returns:
+            int: Transfer length (bits).
+    """
+
+    frames = 2
+    if size > 4:
+        frames += 2 * -(-size // 7)
+
+    return frames * frame_bits(8)
+
+
+def poller_load(regs, period, baudrate):
+    """ Predict the bus load of a poller.
+
+        Args:
+            regs (list): Polled registers.
+            period (int, float): Polling period (s).
+            baudrate (int): Bus baudrate (bit/s).
+
+        Returns:
+            float: Bus load (0-1).
+    """
+
+    bits = sum(sdo_bits(DTYPE_SIZE.get(reg.dtype, 8)) for reg in regs)
+
+    return bits / (period * baudrate)
+
+
+class BusLoad(can.Listener):
+    """ CAN bus load estimator.
+
+        Counts the received and transmitted frames of a network and their
+        worst-case length, giving the bus utilization over a sliding window.
+        It also keeps the predicted load of the running pollers, which is
+        checked against an optional budget when a poller starts: depending
+        on the policy, the poller is rejected or its period stretched until
+        it fits.
+
+        Args:
+            baudrate (int): Bus baudrate (bit/s).
+            window (int, float, optional): Utilization window (s).
+            budget (float, optional): Bus load budget (0-1).
+            policy (str, optional): 'reject' or 'stretch'.
+    """
+
+    def __init__(self, baudrate, window=1., budget=None, policy='reject'):
+        super(BusLoad, self).__init__()
+
+        if policy not in BUDGET_POLICIES:
+            raise ValueError('Invalid budget policy')
+
+        self.__baudrate = baudrate
+        self.__window = window
+        self.__budget = budget
+        self.__policy = policy
+        self.__lock = threading.Lock()
+        self.__slot = window / 10.
+        self.__slots = [0] * 10
+        self.__slot_idx = int(time.monotonic() / self.__slot)
+        self.__frames = 0
+        self.__bits = 0
+        self.__reserved = {}
+
+    def attach(self, network):
+        """ Count the frames of a python-canopen network.
+
+            Must be called before connecting it, so that received frames are
+            also counted on reconnections.
+
+            Args:
+                network (canopen.Network): Network.
+        """
+
+        network.listeners.append(self)
+
+        send_message = network.send_message
+
+        def counted(can_id, data, remote=False):
+            send_message(can_id, data, remote)
+            self.count(len(data) if not remote else 0, can_id > 0x7FF)
+
+        network.send_message = counted
+
+    def on_message_received(self, msg):
+        self.count(msg.dlc, msg.is_extended_id)
+
+    def count(self, dlc, extended=False):
+        """ Count a frame.
+
+            Args:
+                dlc (int): Data length (bytes).
+                extended (bool, optional): Extended identifier.
+        """
+
+        bits = frame_bits(dlc, extended)
+        with self.__lock:
+            self.__advance()
+            self.__slots[self.__slot_idx % 10] += bits
+            self.__frames += 1
+            self.__bits += bits
+
+    def __advance(self):
+        idx = int(time.monotonic() / self.__slot)
+        for i in range(self.__slot_idx + 1, min(idx, self.__slot_idx + 10) + 1):
+            self.__slots[i % 10] = 0
+        self.__slot_idx = max(idx, self.__slot_idx)
+
+    @property
+    def utilization(self):
+        """ float: Bus utilization over the last window (0-1). """
+
+        with self.__lock:
+            self.__advance()
+            bits = sum(self.__slots)
+
+        return bits / (self.__window * self.__baudrate)
+
+    @property
+    def frames(self):
+        """ int: Total number of counted frames. """
+        return self.__frames
+
+    @property
+    def bits(self):
+        """ int: Total number of counted bits. """
+        return self.__bits
+
+    @property
+    def budget(self):
+        """ float: Bus load budget (0-1), None if not enforced. """
+        return self.__budget
+
+    @budget.setter
+    def budget(self, budget):
+        self.__budget = budget
+
+    @property
+    def policy(self):
+        """ str: Budget policy. """
+        return self.__policy
+
+    @policy.setter
+    def policy(self, policy):
+        if policy not in BUDGET_POLICIES:
+            raise ValueError('Invalid budget policy')
+        self.__policy = policy
+
+    @property
+    def predicted(self):
+        """ float: Predicted load of the running pollers (0-1). """
+
+        with self.__lock:
+            return sum(self.__reserved.values())
+
+    def admit(self, key, regs, period):
+        """ Admit a poller, checking it against the budget.
+
+            Args:
+                key: Poller key.
+                regs (list): Polled registers.
+                period (int, float): Polling period (s).
+
+            Returns:
+                float: Polling period (s), stretched if required.
+
+            Raises:
+                ILValueError: If the poller does not fit in the budget.
+        """
+
+        load = poller_load(regs, period, self.__baudrate)
+
+        with self.__lock:
+            self.__reserved.pop(key, None)
+            if self.__budget is not None:
+                available = self.__budget - sum(self.__reserved.values())
+                if load > available:
+                    if self.__policy == 'reject' or available <= 0:
+                        raise ILValueError('Bus load budget exceeded')
+                    period *= load / available
+                    load = available
+            self.__reserved[key] = load
+
+        return period
+
+    def release(self, key):
+        """ Release the load of a poller.
+
+            Args:
+                key: Poller key.
+        """
+
+        with self.__lock:
+            self.__reserved.pop(key, None)
+
+    @property
+    def stats(self):
+        """ dict: Frames, bits, utilization, predicted load and budget. """
+
+        return {'frames': self.__frames,
+                'bits': self.__bits,
+                'utilization': self.utilization,
+                'predicted': self.predicted,
+                'budget': self.__budget}
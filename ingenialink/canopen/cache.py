@@ -0,0 +1,86 @@
+import time
+from threading import RLock
+
+
+class RegisterCache(object):
+    """ Read-through register value cache.
+
+        Values are keyed by (subnode, identifier). Entries expire after the
+        time-to-live, if any, and are dropped whenever they are invalidated
+        (e.g. on writes).
+
+        Args:
+            ttl (int, float, optional): Time-to-live (s), None for entries
+                that only expire on invalidation.
+    """
+
+    def __init__(self, ttl=None):
+        self.__ttl = ttl
+        self.__entries = {}
+        self.__lock = RLock()
+        self.__hits = 0
+        self.__misses = 0
+
+    def get(self, key):
+        """ Obtain a cached value.
+
+            Args:
+                key (tuple): Entry key.
+
+            Returns:
+                tuple (bool, any): Hit flag and cached value.
+        """
+
+        with self.__lock:
+            entry = self.__entries.get(key)
+            if entry is not None:
+                value, stamp = entry
+                if self.__ttl is None or time.monotonic() - stamp < self.__ttl:
+                    self.__hits += 1
+                    return True, value
+                del self.__entries[key]
+
+            self.__misses += 1
+            return False, None
+
+    def put(self, key, value):
+        """ Store a value.
+
+            Args:
+                key (tuple): Entry key.
+                value (any): Value.
+        """
+
+        with self.__lock:
+            self.__entries[key] = (value, time.monotonic())
+
+    def invalidate(self, key=None):
+        """ Invalidate an entry, or all the entries if no key is given.
+
+            Args:
+                key (tuple, optional): Entry key.
+        """
+
+        with self.__lock:
+            if key is None:
+                self.__entries.clear()
+            else:
+                self.__entries.pop(key, None)
+
+    @property
+    def ttl(self):
+        """ float: Time-to-live (s). """
+        return self.__ttl
+
+    @property
+    def hits(self):
+        """ int: Number of cache hits. """
+        return self.__hits
+
+    @property
+    def misses(self):
+        """ int: Number of cache misses. """
+        return self.__misses
+
+    def __len__(self):
+        return len(self.__entries)
@@ -0,0 +1,709 @@
+import os
+import json
+import queue
+import socket
+import struct
+import threading
+from collections import deque
+
+from ..servo import SERVO_STATE
+from ..exceptions import ILError, ILTimeoutError
+
+import logging
+
+log = logging.getLogger(__name__)
+
+
+_HDR = struct.Struct('>I')
+""" Struct: Message header (payload length). """
+
+_CALLS = ('enable', 'disable', 'fault_reset', 'store_all', 'get_state')
+""" tuple: Servo methods that can be called remotely. """
+
+_ATTRS = ('info', 'name', 'subnodes', 'errors')
+""" tuple: Servo attributes that can be read remotely. """
+
+_SEND_QUEUE_SZ = 256
+""" int: Messages queued per client before it is disconnected. """
+
+
+def _send_msg(sock, lock, msg):
+    """ Send a message (4-byte length + JSON payload). """
+
+    payload = json.dumps(msg).encode('utf-8')
+    with lock:
+        sock.sendall(_HDR.pack(len(payload)) + payload)
+
+
+def _recv_exact(sock, n):
+    buf = bytearray()
+    while len(buf) < n:
+        chunk = sock.recv(n - len(buf))
+        if not chunk:
+            return None
+        buf += chunk
+
+    return bytes(buf)
+
+
+def _recv_msg(sock):
+    """ Receive a message, None if the connection was closed. """
+
+    hdr = _recv_exact(sock, _HDR.size)
+    if hdr is None:
+        return None
+
+    payload = _recv_exact(sock, _HDR.unpack(hdr)[0])
+    if payload is None:
+        return None
+
+    return json.loads(payload.decode('utf-8'))
+
+
+def _jsonable(value):
+    """ Convert servo results to JSON compatible values. """
+
+    if isinstance(value, SERVO_STATE):
+        return value.value
+    if isinstance(value, (list, tuple)):
+        return [_jsonable(v) for v in value]
+    if isinstance(value, dict):
+        return {str(k): _jsonable(v) for k, v in value.items()}
+    if isinstance(value, bytes):
+        return value.decode('utf-8', 'replace')
+
+    return value
+
+
+class _Session(object):
+    """ Daemon client session.
+
+        Messages are sent from a thread of the session, so that a client
+        that does not read its socket never blocks the bus worker: once its
+        send queue is full, the client is disconnected.
+    """
+
+    def __init__(self, sock):
+        self.sock = sock
+        self.lock = threading.Lock()
+        self.requests = deque()
+        self.state_events = False
+        self.pollers = {}
+        self.served = 0
+        self.alive = True
+
+        self.__queue = queue.Queue(_SEND_QUEUE_SZ)
+        self.__sender = threading.Thread(target=self.__send)
+        self.__sender.daemon = True
+        self.__sender.start()
+
+    def __send(self):
+        while True:
+            msg = self.__queue.get()
+            if msg is None:
+                break
+
+            try:
+                _send_msg(self.sock, self.lock, msg)
+            except OSError:
+                self.alive = False
+                break
+
+    def send(self, msg):
+        if not self.alive:
+            return
+
+        try:
+            self.__queue.put_nowait(msg)
+        except queue.Full:
+            log.warning('Client not reading, disconnecting it')
+            self.alive = False
+            try:
+                self.sock.shutdown(socket.SHUT_RDWR)
+            except OSError:
+                pass
+
+    def close(self):
+        """ Stop the sender thread. """
+
+        self.alive = False
+        while True:
+            try:
+                self.__queue.put_nowait(None)
+                break
+            except queue.Full:
+                try:
+                    self.__queue.get_nowait()
+                except queue.Empty:
+                    pass
+
+
+class BusDaemon(object):
+    """ Local bus multiplexing daemon.
+
+        Owns the CANopen servos of a network and serves them to any number of
+        local clients through a Unix-domain socket (see `DaemonClient`).
+        Bus transactions are executed by a single worker that takes one
+        request from each client in turn (round-robin), so a busy client
+        can not starve the others. A register read received while the same
+        read is on the bus joins it, unless the client still has earlier
+        requests queued, so every client observes its own requests in
+        order.
+
+        Args:
+            servos (Network, dict): CANopen network, or servos by node id.
+            path (str): Socket path.
+    """
+
+    def __init__(self, servos, path):
+        if hasattr(servos, 'servos'):
+            servos = {servo.node.id: servo for servo in servos.servos}
+
+        self.__servos = dict(servos)
+        self.__path = path
+        self.__sock = None
+        self.__sessions = []
+        self.__rr = 0
+        self.__inflight = {}
+        self.__cv = threading.Condition()
+        self.__running = False
+        self.__threads = []
+        self.__poller_id = 0
+        self.__stats = {'requests': 0, 'transactions': 0, 'deduplicated': 0}
+
+    def start(self):
+        """ Start serving. """
+
+        if os.path.exists(self.__path):
+            os.unlink(self.__path)
+
+        self.__sock = socket.socket(socket.AF_UNIX, socket.SOCK_STREAM)
+        self.__sock.bind(self.__path)
+        self.__sock.listen(16)
+        self.__running = True
+
+        for servo_id, servo in self.__servos.items():
+            servo.state_subscribe(self.__state_cb(servo_id))
+
+        for target in (self.__accept, self.__work):
+            thread = threading.Thread(target=target)
+            thread.daemon = True
+            thread.start()
+            self.__threads.append(thread)
+
+    def stop(self):
+        """ Stop serving and disconnect all the clients. """
+
+        with self.__cv:
+            self.__running = False
+            self.__cv.notify_all()
+
+        try:
+            self.__sock.shutdown(socket.SHUT_RDWR)
+        except OSError:
+            pass
+        self.__sock.close()
+
+        for session in list(self.__sessions):
+            self.__close_session(session)
+
+        for thread in self.__threads:
+            thread.join()
+        self.__threads = []
+
+        if os.path.exists(self.__path):
+            os.unlink(self.__path)
+
+    @property
+    def stats(self):
+        """ dict: Requests received, bus transactions, deduplicated reads and
+            requests served per client.
+        """
+
+        with self.__cv:
+            stats = dict(self.__stats)
+            stats['clients'] = [s.served for s in self.__sessions]
+
+        return stats
+
+    def __state_cb(self, servo_id):
+        def on_state(state, flags, subnode):
+            with self.__cv:
+                sessions = [s for s in self.__sessions if s.state_events]
+            for session in sessions:
+                session.send({'event': 'state', 'node': servo_id,
+                              'state': _jsonable(state), 'subnode': subnode})
+
+        return on_state
+
+    def __accept(self):
+        while self.__running:
+            try:
+                sock, _ = self.__sock.accept()
+            except OSError:
+                break
+
+            session = _Session(sock)
+            with self.__cv:
+                self.__sessions.append(session)
+
+            thread = threading.Thread(target=self.__serve, args=(session, ))
+            thread.daemon = True
+            thread.start()
+
+    def __close_session(self, session):
+        session.alive = False
+
+        for poller, _ in session.pollers.values():
+            poller.stop()
+        session.pollers = {}
+
+        with self.__cv:
+            if session in self.__sessions:
+                self.__sessions.remove(session)
+            session.requests.clear()
+
+        session.close()
+        try:
+            session.sock.shutdown(socket.SHUT_RDWR)
+        except OSError:
+            pass
+        session.sock.close()
+
+    def __serve(self, session):
+        """ Receive the requests of a client. """
+
+        while self.__running:
+            try:
+                msg = _recv_msg(session.sock)
+            except (OSError, ValueError):
+                msg = None
+
+            if msg is None:
+                break
+
+            with self.__cv:
+                self.__stats['requests'] += 1
+
+                # join the same read if it is on the bus, the earlier
+                # requests of the client (e.g. writes) must run first
+                if msg.get('op') == 'read' and not session.requests:
+                    key = (msg['node'], msg.get('subnode', 1), msg['reg'])
+                    waiters = self.__inflight.get(key)
+                    if waiters is not None:
+                        waiters.append((session, msg['id']))
+                        self.__stats['deduplicated'] += 1
+                        continue
+
+                session.requests.append(msg)
+                self.__cv.notify()
+
+        self.__close_session(session)
+
+    def __next_request(self):
+        """ Obtain the next request, taking clients in turn. """
+
+        with self.__cv:
+            while self.__running:
+                n = len(self.__sessions)
+                for i in range(n):
+                    session = self.__sessions[(self.__rr + i) % n]
+                    if session.requests:
+                        self.__rr = (self.__rr + i + 1) % n
+                        msg = session.requests.popleft()
+
+                        waiters = [(session, msg['id'])]
+                        if msg.get('op') == 'read':
+                            key = (msg['node'], msg.get('subnode', 1),
+                                   msg['reg'])
+                            self.__inflight[key] = waiters
+
+                        return msg, waiters
+
+                self.__cv.wait()
+
+        return None, None
+
+    def __work(self):
+        """ Execute the requests on the bus. """
+
+        while True:
+            msg, waiters = self.__next_request()
+            if msg is None:
+                break
+
+            try:
+                reply = {'result': _jsonable(self.__execute(waiters[0][0],
+                                                            msg))}
+            except Exception as e:
+                reply = {'error': str(e) or type(e).__name__}
+
+            with self.__cv:
+                self.__stats['transactions'] += 1
+                if msg.get('op') == 'read':
+                    self.__inflight.pop((msg['node'], msg.get('subnode', 1),
+                                         msg['reg']), None)
+
+            # each waiter gets its own reply, sessions serialize them later
+            for session, msg_id in waiters:
+                session.served += 1
+                session.send(dict(reply, id=msg_id))
+
+    def __servo(self, msg):
+        if msg['node'] not in self.__servos:
+            raise ILError('Unknown node: {}'.format(msg['node']))
+
+        return self.__servos[msg['node']]
+
+    def __execute(self, session, msg):
+        op = msg.get('op')
+
+        if op == 'servos':
+            return sorted(self.__servos)
+        elif op == 'read':
+            return self.__servo(msg).raw_read(msg['reg'],
+                                              subnode=msg.get('subnode', 1))
+        elif op == 'write':
+            return self.__servo(msg).raw_write(msg['reg'], msg['data'],
+                                               subnode=msg.get('subnode', 1))
+        elif op == 'call':
+            if msg['method'] not in _CALLS:
+                raise ILError('Invalid method: {}'.format(msg['method']))
+            method = getattr(self.__servo(msg), msg['method'])
+            return method(*msg.get('args', []), **msg.get('kwargs', {}))
+        elif op == 'attr':
+            if msg['attr'] not in _ATTRS:
+                raise ILError('Invalid attribute: {}'.format(msg['attr']))
+            return getattr(self.__servo(msg), msg['attr'])
+        elif op == 'subscribe_state':
+            session.state_events = True
+            return None
+        elif op == 'poller_start':
+            return self.__poller_start(session, msg)
+        elif op == 'poller_stop':
+            poller, _ = session.pollers.pop(msg['poller'])
+            poller.stop()
+            return None
+
+        raise ILError('Invalid operation: {}'.format(op))
+
+    def __poller_start(self, session, msg):
+        from .poller_node import Poller
+
+        regs = msg['regs']
+        poller = Poller(self.__servo(msg), len(regs))
+        poller.configure(msg['period'], msg.get('sz', 1000))
+        for ch, reg in enumerate(regs):
+            poller.ch_configure(ch, reg)
+
+        with self.__cv:
+            self.__poller_id += 1
+            poller_id = self.__poller_id
+
+        stop = threading.Event()
+
+        def forward():
+            interval = max(msg['period'] * msg.get('sz', 1000) / 2., 0.05)
+            while not stop.wait(interval) and session.alive:
+                t, d, lost = poller.data
+                if t:
+                    session.send({'event': 'poller', 'poller': poller_id,
+                                  't': t, 'd': d, 'lost': lost})
+
+        class _Handle(object):
+            def stop(self):
+                stop.set()
+                poller.stop()
+
+        handle = _Handle()
+        session.pollers[poller_id] = (handle, msg)
+
+        poller.start()
+        thread = threading.Thread(target=forward)
+        thread.daemon = True
+        thread.start()
+
+        return poller_id
+
+
+class DaemonClient(object):
+    """ Bus daemon client.
+
+        Args:
+            path (str): Daemon socket path.
+            timeout (int, float, optional): Request timeout (s).
+    """
+
+    def __init__(self, path, timeout=5.):
+        self.__sock = socket.socket(socket.AF_UNIX, socket.SOCK_STREAM)
+        self.__sock.connect(path)
+        self.__lock = threading.Lock()
+        self.__timeout = timeout
+        self.__pending = {}
+        self.__next_id = 0
+        self.__state_cbs = []
+        self.__poller_cbs = {}
+        self.__alive = True
+
+        self.__reader = threading.Thread(target=self.__read)
+        self.__reader.daemon = True
+        self.__reader.start()
+
+    def __read(self):
+        while True:
+            try:
+                msg = _recv_msg(self.__sock)
+            except (OSError, ValueError):
+                msg = None
+
+            if msg is None:
+                break
+
+            if 'event' in msg:
+                self.__on_event(msg)
+                continue
+
+            with self.__lock:
+                slot = self.__pending.pop(msg['id'], None)
+            if slot is not None:
+                slot[1] = msg
+                slot[0].set()
+
+        self.__alive = False
+        with self.__lock:
+            pending = list(self.__pending.values())
+            self.__pending = {}
+        for slot in pending:
+            slot[0].set()
+
+    def __on_event(self, msg):
+        try:
+            if msg['event'] == 'state':
+                for node, cb in list(self.__state_cbs):
+                    if node == msg['node']:
+                        cb(SERVO_STATE(msg['state']), None, msg['subnode'])
+            elif msg['event'] == 'poller':
+                cb = self.__poller_cbs.get(msg['poller'])
+                if cb is not None:
+                    cb(msg['t'], msg['d'], msg['lost'])
+        except Exception as e:
+            log.error(e)
+
+    def request(self, op, **args):
+        """ Send a request and wait for its result.
+
+            Args:
+                op (str): Operation.
+                **args: Operation arguments.
+
+            Returns:
+                any: Result.
+
+            Raises:
+                ILTimeoutError: If the daemon does not answer in time.
+                ILError: If the request failed.
+        """
+
+        if not self.__alive:
+            raise ILError('Daemon connection closed')
+
+        slot = [threading.Event(), None]
+        with self.__lock:
+            self.__next_id += 1
+            msg_id = self.__next_id
+            self.__pending[msg_id] = slot
+
+        args['op'] = op
+        args['id'] = msg_id
+        _send_msg(self.__sock, self.__lock, args)
+
+        if not slot[0].wait(self.__timeout):
+            with self.__lock:
+                self.__pending.pop(msg_id, None)
+            raise ILTimeoutError('Daemon request timed out')
+
+        reply = slot[1]
+        if reply is None:
+            raise ILError('Daemon connection closed')
+        if 'error' in reply:
+            raise ILError(reply['error'])
+
+        return reply['result']
+
+    def servos(self):
+        """ list: Node ids of the servos served by the daemon. """
+        return self.request('servos')
+
+    def servo(self, node):
+        """ Obtain a servo proxy.
+
+            Args:
+                node (int): Node id.
+
+            Returns:
+                ServoProxy: Servo proxy.
+        """
+
+        return ServoProxy(self, node)
+
+    def _state_subscribe(self, node, cb):
+        if not self.__state_cbs:
+            self.request('subscribe_state')
+        self.__state_cbs.append((node, cb))
+
+        return len(self.__state_cbs) - 1
+
+    def _poller_start(self, node, regs, period, sz, cb):
+        poller_id = self.request('poller_start', node=node, regs=regs,
+                                 period=period, sz=sz)
+        self.__poller_cbs[poller_id] = cb
+
+        return poller_id
+
+    def _poller_stop(self, poller_id):
+        self.request('poller_stop', poller=poller_id)
+        self.__poller_cbs.pop(poller_id, None)
+
+    def close(self):
+        """ Close the connection. """
+
+        try:
+            self.__sock.shutdown(socket.SHUT_RDWR)
+        except OSError:
+            pass
+        self.__sock.close()
+        self.__reader.join()
+
+
+class ServoProxy(object):
+    """ Servo served by a bus daemon.
+
+        Offers the CANopen `Servo` API; registers are given by identifier.
+
+        Args:
+            client (DaemonClient): Daemon client.
+            node (int): Node id.
+    """
+
+    def __init__(self, client, node):
+        self.__client = client
+        self.__node = node
+
+    def __call(self, method, *args, **kwargs):
+        return self.__client.request('call', node=self.__node, method=method,
+                                     args=list(args), kwargs=kwargs)
+
+    def raw_read(self, reg, subnode=1):
+        """ Raw read from servo.
+
+            Args:
+                reg (str): Register identifier.
+                subnode (int, optional): Subnode.
+
+            Returns:
+                int: Obtained value
+        """
+
+        return self.__client.request('read', node=self.__node, reg=reg,
+                                     subnode=subnode)
+
+    def read(self, reg, subnode=1):
+        """ Read from servo, see `raw_read`. """
+
+        return self.raw_read(reg, subnode=subnode)
+
+    def raw_write(self, reg, data, confirm=True, extended=0, subnode=1):
+        """ Raw write to servo.
+
+            Args:
+                reg (str): Register identifier.
+                data (int, float): Data.
+                subnode (int, optional): Subnode.
+        """
+
+        self.__client.request('write', node=self.__node, reg=reg, data=data,
+                              subnode=subnode)
+
+    def write(self, reg, data, confirm=True, extended=0, subnode=1):
+        """ Write to servo, see `raw_write`. """
+
+        return self.raw_write(reg, data, confirm, extended, subnode)
+
+    def enable(self, timeout=2000, subnode=1):
+        """ Enable PDS. """
+        return self.__call('enable', timeout=timeout, subnode=subnode)
+
+    def disable(self, subnode=1):
+        """ Disable PDS. """
+        return self.__call('disable', subnode=subnode)
+
+    def fault_reset(self, subnode=1):
+        """ Fault reset. """
+        return self.__call('fault_reset', subnode=subnode)
+
+    def store_all(self, subnode=1):
+        """ Store all servo current parameters to the NVM. """
+        return self.__call('store_all', subnode=subnode)
+
+    def get_state(self, subnode=1):
+        """ tuple: Servo state and state flags. """
+        state, flags = self.__call('get_state', subnode=subnode)
+        return SERVO_STATE(state), flags
+
+    def state_subscribe(self, cb):
+        """ Subscribe to state changes.
+
+            Args:
+                cb: Callback
+
+            Returns:
+                int: Assigned slot.
+        """
+
+        return self.__client._state_subscribe(self.__node, cb)
+
+    def poller_start(self, regs, period, sz, cb):
+        """ Start a poller on the daemon.
+
+            Args:
+                regs (list): Register identifier per channel.
+                period (int, float): Polling period (s).
+                sz (int): Poller buffer size.
+                cb: Callback receiving (time vector, data vectors, lost).
+
+            Returns:
+                int: Poller id.
+        """
+
+        return self.__client._poller_start(self.__node, regs, period, sz, cb)
+
+    def poller_stop(self, poller_id):
+        """ Stop a poller started with `poller_start`. """
+
+        self.__client._poller_stop(poller_id)
+
+    @property
+    def node(self):
+        """ int: Node id. """
+        return self.__node
+
+    @property
+    def info(self):
+        """ dict: Servo information. """
+        return self.__client.request('attr', node=self.__node, attr='info')
+
+    @property
+    def name(self):
+        """ str: Drive name. """
+        return self.__client.request('attr', node=self.__node, attr='name')
+
+    @property
+    def subnodes(self):
+        """ int: Number of subnodes. """
+        return self.__client.request('attr', node=self.__node,
+                                     attr='subnodes')
+
+    @property
+    def errors(self):
+        """ dict: Errors. """
+        return self.__client.request('attr', node=self.__node, attr='errors')
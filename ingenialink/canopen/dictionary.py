@@ -1,5 +1,13 @@
+import os
 import xml.etree.ElementTree as ET
-from .registers import Register, REG_ACCESS, REG_DTYPE, REG_PHY
+from threading import Lock
+
+from .registers import Register, REG_ACCESS, REG_DTYPE, REG_PHY, _ENUMS
+
+_PARSED = {}
+""" dict: Parsed dictionaries, { path : (stamp, parsed content) }. """
+
+_PARSED_LOCK = Lock()
 
 
 class Categories(object):
@@ -73,19 +81,55 @@ class Errors(object):
 
 
 class DictionaryCANOpen(object):
+    """ CANopen dictionary.
+
+        The registers, categories and errors of a dictionary file are parsed
+        once and shared by all the instances loading the same (unmodified)
+        file. Per-instance storage values are kept apart from the shared
+        registers.
+
+        Args:
+            dict (str): Dictionary file path.
+    """
+
     def __init__(self, dict):
         self.__dict = dict
         self.__version = '1'
         self._cats = None
         self.__subnodes = 2
         self.__regs = []
+        self.__storage = {}
+        self.__catalog = None
         self.read_dictionary()
 
     def read_dictionary(self):
+        path = os.path.realpath(self.__dict)
+        st = os.stat(path)
+        stamp = (st.st_mtime_ns, st.st_size)
+
+        with _PARSED_LOCK:
+            cached = _PARSED.get(path)
+            if cached is not None and cached[0] == stamp:
+                (self.__regs, self._cats, self._errors, self.__version,
+                 self.__subnodes) = cached[1]
+                return
+
+            self.parse_dictionary()
+            _PARSED[path] = (stamp, (self.__regs, self._cats, self._errors,
+                                     self.__version, self.__subnodes))
+
+    def parse_dictionary(self):
         with open(self.__dict, 'r', encoding='utf-8') as xml_file:
             tree = ET.parse(xml_file)
         root = tree.getroot()
 
+        # registers may be shared with other instances (see read_dictionary)
+        self.__regs = []
+        self.__catalog = None
+
+        # enumerations are only shared within a dictionary
+        _ENUMS.clear()
+
         # Subnodes
         if root.findall('./Body/Device/Axes/'):
             self.__subnodes = len(root.findall('./Body/Device/Axes/Axis'))
@@ -230,6 +274,39 @@ class DictionaryCANOpen(object):
     def get_regs(self, subnode):
         return self.__regs[subnode]
 
+    def storage(self, identifier, subnode=1):
+        """ Obtain the storage value of a register.
+
+            Args:
+                identifier (str): Register identifier.
+                subnode (int, optional): Subnode.
+
+            Returns:
+                any: Value stored for this instance if any, otherwise the
+                    register storage from the dictionary file.
+        """
+
+        key = (int(subnode), identifier)
+        if key in self.__storage:
+            return self.__storage[key]
+
+        return self.__regs[int(subnode)][identifier].default_storage
+
+    def set_storage(self, identifier, value, subnode=1):
+        """ Set the storage value of a register for this instance.
+
+            Args:
+                identifier (str): Register identifier.
+                value (any): Storage value.
+                subnode (int, optional): Subnode.
+        """
+
+        self.__storage[(int(subnode), identifier)] = value
+
+        if self.__catalog is not None:
+            reg = self.__regs[int(subnode)][identifier]
+            self.__catalog.update_storage(reg, value is not None)
+
     @property
     def dict(self):
         return self.__dict
@@ -249,6 +326,22 @@ class DictionaryCANOpen(object):
     @regs.setter
     def regs(self, value):
         self.__regs = value
+        self.__catalog = None
+
+    @property
+    def catalog(self):
+        """ RegisterCatalog: Columnar register catalog (built on first use).
+        """
+        if self.__catalog is None:
+            # NumPy is only required by the catalog, import it on use
+            from ..catalog import RegisterCatalog
+
+            self.__catalog = RegisterCatalog(self)
+            for (subnode, identifier), value in self.__storage.items():
+                self.__catalog.update_storage(
+                    self.__regs[subnode][identifier], value is not None)
+
+        return self.__catalog
 
     @property
     def cats(self):
@@ -0,0 +1,128 @@
+import time
+import threading
+
+
+NODE_IDS = range(1, 128)
+""" range: Valid CANopen node ids. """
+
+_SDO_REQ = b'\x40\x00\x10\x00\x00\x00\x00\x00'
+""" bytes: SDO upload request of the device type (0x1000). """
+
+
+class NodeDiscovery(object):
+    """ CANopen node discovery.
+
+        Sends an SDO request to every node id and collects the responses as
+        they arrive, instead of waiting a fixed time: the search ends as soon
+        as all the searched ids have answered, when no new node has answered
+        for the quiescence time (counted from the last response, or from the
+        requests while none answered, and never before the minimum listen
+        time), or at the deadline. Boot-up and heartbeat messages received
+        while searching also count as answers, so nodes booting during the
+        search are found. The response time of every node is reported.
+
+        Args:
+            network (canopen.Network): Network.
+            quiet (int, float, optional): Quiescence time (s).
+            deadline (int, float, optional): Maximum search time (s).
+            listen (int, float, optional): Minimum search time (s), to wait
+                longer for slow nodes (disabled by default).
+    """
+
+    def __init__(self, network, quiet=0.05, deadline=1., listen=0.):
+        self.__network = network
+        self.__quiet = quiet
+        self.__deadline = deadline
+        self.__listen = listen
+        self.__cv = threading.Condition()
+        self.__timings = {}
+        self.__start = None
+
+    def __on_response(self, can_id, data, timestamp):
+        # SDO response (0x580 + id) or boot-up/heartbeat (0x700 + id)
+        with self.__cv:
+            node_id = can_id & 0x7F
+            if node_id not in self.__timings:
+                self.__timings[node_id] = time.perf_counter() - self.__start
+                self.__cv.notify()
+
+    def search(self, ids=NODE_IDS):
+        """ Search nodes.
+
+            Args:
+                ids (iterable, optional): Node ids to search.
+
+            Returns:
+                list: Node ids found, in response order.
+        """
+
+        ids = list(ids)
+        with self.__cv:
+            self.__timings = {}
+            self.__start = time.perf_counter()
+
+        for node_id in ids:
+            self.__network.subscribe(0x580 + node_id, self.__on_response)
+            self.__network.subscribe(0x700 + node_id, self.__on_response)
+
+        try:
+            for node_id in ids:
+                self.__network.send_message(0x600 + node_id, _SDO_REQ)
+
+            deadline = self.__start + self.__deadline
+            listen_end = self.__start + self.__listen
+            with self.__cv:
+                last = self.__start
+                while len(self.__timings) < len(ids):
+                    now = time.perf_counter()
+                    quiet_end = max(last + self.__quiet, listen_end)
+                    if now >= deadline or now >= quiet_end:
+                        break
+
+                    found = len(self.__timings)
+                    self.__cv.wait(min(deadline, quiet_end) - now)
+                    if len(self.__timings) != found:
+                        last = time.perf_counter()
+        finally:
+            for node_id in ids:
+                self.__network.unsubscribe(0x580 + node_id, self.__on_response)
+                self.__network.unsubscribe(0x700 + node_id, self.__on_response)
+
+        with self.__cv:
+            return sorted(self.__timings, key=self.__timings.get)
+
+    @property
+    def timings(self):
+        """ dict: Response time (s) of every node found in the last search. """
+
+        with self.__cv:
+            return dict(self.__timings)
+
+
+def wait_bootup(network, node_id, timeout=2., reset=None):
+    """ Wait for the boot-up message of a node.
+
+        Args:
+            network (canopen.Network): Network.
+            node_id (int): Node id.
+            timeout (int, float, optional): Timeout (s).
+            reset (callable, optional): Called once listening, to reset the
+                node (so that its boot-up message can not be missed).
+
+        Returns:
+            bool: True if the node booted, False on timeout.
+    """
+
+    booted = threading.Event()
+
+    def on_heartbeat(can_id, data, timestamp):
+        if len(data) and data[0] == 0:
+            booted.set()
+
+    network.subscribe(0x700 + node_id, on_heartbeat)
+    try:
+        if reset is not None:
+            reset()
+        return booted.wait(timeout)
+    finally:
+        network.unsubscribe(0x700 + node_id, on_heartbeat)
@@ -1,10 +1,14 @@
 import time
+import weakref
 import canopen
 from enum import Enum
 from threading import Thread
 from time import sleep
 
 from .servo_node import Servo
+from .scheduler import TransactionScheduler
+from .busload import BusLoad
+from .discovery import NodeDiscovery, wait_bootup
 from ..net import NET_PROT, NET_STATE
 
 import logging
@@ -81,6 +85,11 @@ class HearbeatThread(Thread):
                     self.__parent.net_state = NET_STATE.CONNECTED
                     self.__state = NET_STATE.CONNECTED
                 self.__timestamp = self.__node.nmt.timestamp
+                if self.__parent.lost_nodes:
+                    try:
+                        self.__parent.search_lost_nodes()
+                    except Exception as e:
+                        log.warning(e)
             sleep(1.5)
 
     def activate_stop_flag(self):
@@ -96,9 +105,20 @@ class Network(object):
         self.__network = canopen.Network()
         self.__net_state = NET_STATE.DISCONNECTED
         self.__observers = []
+        self.__node_observers = []
         self.__eds = None
         self.__dict = None
         self.__heartbeat_thread = None
+        self.__scheduler = TransactionScheduler()
+        self.__bus_load = BusLoad(self.__baudrate)
+        self.__bus_load.attach(self.__network)
+        self.__discovery = NodeDiscovery(self.__network)
+        self.__od = None
+        self.__pollers = weakref.WeakSet()
+        self.__recovery = {'recoveries': 0, 'last_time': None, 'max_time': 0.,
+                           'samples_lost': 0, 'nodes_lost': [],
+                           'nodes_recovered': []}
+        self.__lost = set()
         if device is not None:
             try:
                 self.__network.connect(bustype=self.__device, channel=self.__channel, bitrate=self.__baudrate)
@@ -123,14 +143,12 @@ class Network(object):
             print('Exception: LSS Timeout. ', e)
 
         if bool_result:
+            # LSS services wait for the slave confirmation
             if new_baudrate:
                 self.__network.lss.configure_bit_timing(CAN_BIT_TIMMING[new_baudrate].value)
-                sleep(0.1)
             if new_node:
                 self.__network.lss.configure_node_id(new_node)
-                sleep(0.1)
             self.__network.lss.store_configuration()
-            sleep(0.1)
             print('Stored new configuration')
             self.__network.lss.send_switch_state_global(self.__network.lss.WAITING_STATE)
         else:
@@ -139,18 +157,16 @@ class Network(object):
         print('')
         print('Reseting node. Baudrate will be applied after power cycle')
         print('Set properly the baudrate of all the nodes before power cycling the devices')
-        self.__network.nodes[target_node].nmt.send_command(0x82)
-
-        # Wait until node is reset
-        sleep(0.5)
-
-        self.__network.scanner.reset()
-        self.__network.scanner.search()
-        sleep(0.5)
+        # Reset the node once listening for its boot-up
+        nmt = self.__network.nodes[target_node].nmt
+        if not wait_bootup(self.__network, new_node or target_node,
+                           reset=lambda: nmt.send_command(0x82)):
+            print('Node did not boot up after the reset')
+            return False
 
-        for node_id in self.__network.scanner.nodes:
+        for node_id in self.__discover():
             print('>> Node found: ', node_id)
-            node = self.__network.add_node(node_id, self.__eds)
+            node = self.__network.add_node(node_id, self.__object_dictionary(self.__eds))
 
         # Reset all nodes to default state
         self.__network.lss.send_switch_state_global(self.__network.lss.WAITING_STATE)
@@ -159,43 +175,155 @@ class Network(object):
         return True
 
     def reset_network(self):
-        try:
-            self.__network.disconnect()
-        except BaseException as e:
-            print("Could not reset: Disconnection", e)
+        """ Recover the network.
+
+            The bus is reconnected in place: the nodes (and the servos using
+            them) are kept, and only the known nodes missing from the
+            network are added again. Running pollers are suspended during
+            the recovery and resumed afterwards.
+
+            Nodes not found are searched again on every later recovery and
+            by the heartbeat thread, see `search_lost_nodes`. Node state
+            subscribers are notified of the nodes lost in this recovery and
+            of the previously lost nodes found again, see
+            `node_state_subscribe`.
+        """
+        start = time.perf_counter()
+
+        pollers = list(self.__pollers)
+        for poller in pollers:
+            poller.suspend()
 
         try:
             for node in self.__network.scanner.nodes:
-                self.__network.nodes[node].nmt.stop_node_guarding()
+                if node in self.__network.nodes:
+                    self.__network.nodes[node].nmt.stop_node_guarding()
             if self.__network.bus:
                 self.__network.bus.flush_tx_buffer()
                 print("Bus flushed")
         except Exception as e:
             print("Could not stop guarding: ", e)
 
+        try:
+            self.__network.disconnect()
+        except BaseException as e:
+            print("Could not reset: Disconnection", e)
+
+        lost = []
         try:
             self.__network.connect(bustype=self.__device, channel=self.__channel, bitrate=self.__baudrate)
-            for node_id in self.__network.scanner.nodes:
-                node = self.__network.add_node(node_id, self.__eds)
+            known = list(self.__network.scanner.nodes)
+            found = self.__discovery.search(known) if known else []
+            for node_id in known:
+                if node_id not in found:
+                    lost.append(node_id)
+                node = self.__network.nodes.get(node_id)
+                if node is None:
+                    node = self.__network.add_node(node_id, self.__object_dictionary(self.__eds))
                 node.nmt.start_node_guarding(1)
         except BaseException as e:
             log.warning(e)
             print("Could not reset: Connection", e)
 
-    def detect_nodes(self):
+        samples_lost = sum(poller.resume() for poller in pollers)
+
+        elapsed = time.perf_counter() - start
+        stats = self.__recovery
+        stats['recoveries'] += 1
+        stats['last_time'] = elapsed
+        stats['max_time'] = max(stats['max_time'], elapsed)
+        stats['samples_lost'] += samples_lost
+        stats['nodes_lost'] = lost
+        stats['nodes_recovered'] = self.__update_lost(set(lost))
+
+    def search_lost_nodes(self):
+        """ Search again the nodes lost in a recovery, without reconnecting
+            the bus. Called periodically by the heartbeat thread while there
+            are lost nodes.
+
+            Returns:
+                list: Lost nodes found again.
+        """
+        if not self.__lost:
+            return []
+
+        found = self.__discovery.search(sorted(self.__lost))
+        for node_id in found:
+            node = self.__network.nodes.get(node_id)
+            if node is None:
+                node = self.__network.add_node(node_id, self.__object_dictionary(self.__eds))
+            node.nmt.start_node_guarding(1)
+
+        return self.__update_lost(self.__lost - set(found))
+
+    def __update_lost(self, lost):
+        """ Update the lost nodes, notifying the node state subscribers.
+
+            Returns:
+                list: Previously lost nodes found again.
+        """
+        recovered = sorted(self.__lost - lost)
+        newly_lost = sorted(lost - self.__lost)
+        self.__lost = lost
+
+        for node_id in newly_lost:
+            log.warning('Node %d not found after the recovery', node_id)
+            self.__notify_node(node_id, NET_STATE.DISCONNECTED)
+        for node_id in recovered:
+            self.__notify_node(node_id, NET_STATE.CONNECTED)
+
+        return recovered
+
+    def __notify_node(self, node_id, state):
+        for callback in self.__node_observers:
+            try:
+                callback(node_id, state)
+            except Exception as e:
+                log.error(e)
+
+    def __object_dictionary(self, eds):
+        """ Obtain the object dictionary of an EDS file, parsed once. """
+        if self.__od is None or self.__od[0] != eds:
+            self.__od = (eds, canopen.import_od(eds))
+        return self.__od[1]
+
+    def register_poller(self, poller):
+        """ Register a running poller, so it is resumed after recoveries. """
+        self.__pollers.add(poller)
+
+    def unregister_poller(self, poller):
+        """ Unregister a poller. """
+        self.__pollers.discard(poller)
+
+    @property
+    def recovery_stats(self):
+        """ dict: Number of recoveries, last and maximum recovery time (s),
+            poller samples lost during recoveries, nodes not found in the
+            last recovery and previously lost nodes it found again.
+        """
+        return dict(self.__recovery)
+
+    def __discover(self, ids=None):
+        """ Search the nodes, see `NodeDiscovery`. """
         self.__network.scanner.reset()
-        self.__network.scanner.search()
-        time.sleep(0.05)
+        if ids is None:
+            nodes = self.__discovery.search()
+        else:
+            nodes = self.__discovery.search(ids)
+        for node_id in nodes:
+            if node_id not in self.__network.scanner.nodes:
+                self.__network.scanner.nodes.append(node_id)
+        return nodes
+
+    def detect_nodes(self):
+        self.__discover()
         return self.__network.scanner.nodes
 
     def scan(self, eds, dict, boot_mode=False, heartbeat=True):
         try:
-            self.__network.scanner.reset()
-            self.__network.scanner.search()
-            time.sleep(0.05)
-            for node_id in self.__network.scanner.nodes:
+            for node_id in self.__discover():
                 print("Found node %d!" % node_id)
-                node = self.__network.add_node(node_id, eds)
+                node = self.__network.add_node(node_id, self.__object_dictionary(eds))
 
                 node.nmt.start_node_guarding(1)
 
@@ -213,12 +341,8 @@ class Network(object):
 
     def connect_through_node(self, eds, dict, node_id, boot_mode=False, heartbeat=True):
         try:
-            self.__network.scanner.reset()
-            self.__network.scanner.search()
-            time.sleep(0.05)
-
-            if node_id in self.__network.scanner.nodes:
-                node = self.__network.add_node(node_id, eds)
+            if node_id in self.__discover([node_id]):
+                node = self.__network.add_node(node_id, self.__object_dictionary(eds))
 
                 node.nmt.start_node_guarding(1)
 
@@ -249,6 +373,28 @@ class Network(object):
         self.__observers.append(cb)
         return r
 
+    def node_state_subscribe(self, cb):
+        """ Subscribe to node state changes detected by network recoveries.
+
+            The callback receives the node id and NET_STATE.DISCONNECTED
+            when the node is not found by a recovery, or NET_STATE.CONNECTED
+            when a lost node is found again (see `search_lost_nodes`).
+
+            Args:
+                cb: Callback
+
+            Returns:
+                int: Assigned slot.
+        """
+        r = len(self.__node_observers)
+        self.__node_observers.append(cb)
+        return r
+
+    @property
+    def lost_nodes(self):
+        """ list: Nodes not found by the last recovery. """
+        return sorted(self.__lost)
+
     def stop_heartbeat(self):
         try:
             for node_id, node_obj in self.__network.nodes.items():
@@ -291,6 +437,23 @@ class Network(object):
     def network(self):
         return self.__network
 
+    @property
+    def scheduler(self):
+        """ TransactionScheduler: Bus transaction scheduler. """
+        return self.__scheduler
+
+    @property
+    def discovery(self):
+        """ NodeDiscovery: Node discovery, with the timings of the last
+            search.
+        """
+        return self.__discovery
+
+    @property
+    def bus_load(self):
+        """ BusLoad: Bus load estimator. """
+        return self.__bus_load
+
     @property
     def prot(self):
         """ NET_PROT: Obtain network protocol. """
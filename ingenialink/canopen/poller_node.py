@@ -1,25 +1,38 @@
 from .._utils import raise_null, raise_err, to_ms
+from ..exceptions import ILTimeoutError, ILAccessError
+from ..timebase import Timebase, now_ns
+from .scheduler import TX_CLASS
 from .constants import *
 
-from datetime import datetime
 from threading import Timer, Thread, Event, RLock
 
+import logging
+
+log = logging.getLogger(__name__)
+
+
+TRIGGER_BLOCK_SZ = 64
+""" int: Samples buffered before being evaluated by the software trigger. """
+
 
 class PollerTimer():
     def __init__(self, time, cb):
         self.cb = cb
         self.time = time
         self.thread = Timer(self.time, self.handle_function)
+        self.stopped = False
 
     def handle_function(self):
         self.cb()
-        self.thread = Timer(self.time, self.handle_function)
-        self.thread.start()
+        if not self.stopped:
+            self.thread = Timer(self.time, self.handle_function)
+            self.thread.start()
 
     def start(self):
         self.thread.start()
 
     def cancel(self):
+        self.stopped = True
         self.thread.cancel()
         if self.thread.is_alive():
             self.thread.join()
@@ -41,7 +54,12 @@ class Poller(object):
         self.__number_channels = number_channels
         self.__sz = 0
         self.__refresh_time = 0
-        self.__time_start = 0.0
+        self.__period = 0
+        self.__timebase = None
+        self.__suspended = None
+        self.__missed = 0
+        self.__errors = 0
+        self.__last_error = None
         self.__samples_count = 0
         self.__samples_lost = False
         self.__timer = None
@@ -49,6 +67,9 @@ class Poller(object):
         self.__mappings = []
         self.__mappings_enabled = []
         self.__lock = RLock()
+        self.__trigger = None
+        self.__trigger_t = []
+        self.__trigger_d = []
         self.reset_acq()
 
     def reset_acq(self):
@@ -58,83 +79,329 @@ class Poller(object):
         }
 
     def acquire_callback_poller_data(self):
-        time_diff = datetime.now()
-        delta = time_diff - self.__time_start
-
-        # Obtain current time
-        t = delta.total_seconds()
-
         self.__lock.acquire()
-        # Acquire all configured channels
-        if self.__samples_count >= self.__sz:
-            self.__samples_lost = True
-        else:
-            self.__acq['t'][self.__samples_count] = t
-
-            # Acquire enabled channels, comprehension list indexes obtained
-            enabled_channel_indexes = [
-                channel_idx for channel_idx, is_enabled in enumerate(self.__mappings_enabled) if is_enabled
-            ]
-
-            for channel in enabled_channel_indexes:
+        try:
+            if self.__trigger is not None:
+                self.__acquire_triggered()
+            # Acquire all configured channels
+            elif self.__samples_count >= self.__sz:
+                self.__samples_lost = True
+            else:
+                # Acquire enabled channels, comprehension list indexes obtained
+                enabled_channel_indexes = [
+                    channel_idx for channel_idx, is_enabled in enumerate(self.__mappings_enabled) if is_enabled
+                ]
+
+                before = now_ns()
+                for channel in enabled_channel_indexes:
+                    for register_identifier, subnode in self.__mappings[channel].items():
+                        self.__acq['d'][channel][self.__samples_count] = self.__servo.raw_read(register_identifier, subnode)
+                after = now_ns()
+
+                # Stamped at the reads, not when the timer fired
+                self.__acq['t'][self.__samples_count] = (before + after) // 2
+
+                # Increment samples count
+                self.__samples_count += 1
+        finally:
+            self.__lock.release()
+
+    def __acquire(self):
+        """ Acquire a sample as a monitoring transaction. """
+
+        try:
+            with self.__servo.priority(TX_CLASS.MONITORING):
+                self.acquire_callback_poller_data()
+        except (ILTimeoutError, ILAccessError) as e:
+            # SDO timeout or abort, keep polling, the sample is missed
+            self.__missed += 1
+            self.__last_error = e
+        except Exception as e:
+            # keep polling, but report it (see errors and last_error)
+            log.warning('Poller acquisition failed: %s', e)
+            self.__errors += 1
+            self.__last_error = e
+
+    def __acquire_triggered(self):
+        """ Acquire a sample and feed it to the software trigger. """
+
+        sample = [float('nan')] * self.__number_channels
+        before = now_ns()
+        for channel in range(0, self.__number_channels):
+            if self.__mappings_enabled[channel]:
                 for register_identifier, subnode in self.__mappings[channel].items():
-                    self.__acq['d'][channel][self.__samples_count] = self.__servo.raw_read(register_identifier, subnode)
+                    sample[channel] = self.__servo.raw_read(register_identifier, subnode)
+        after = now_ns()
 
-            # Increment samples count
-            self.__samples_count += 1
+        t = self.__timebase.to_seconds((before + after) // 2)
+        self.__trigger_t.append(t)
+        self.__trigger_d.append(sample)
+        if len(self.__trigger_t) >= TRIGGER_BLOCK_SZ:
+            self.__trigger_flush()
 
-        self.__lock.release()
+    def __trigger_flush(self):
+        """ Feed the buffered samples to the software trigger as a block. """
 
-    def start(self):
-        """ Start poller. """
+        if self.__trigger_t:
+            self.__trigger.push(self.__trigger_t, list(zip(*self.__trigger_d)))
+
+        self.__trigger_t = []
+        self.__trigger_d = []
+
+    def start(self, anchor=False):
+        """ Start poller.
+
+            Args:
+                anchor (bool, optional): Anchor the timebase to the
+                    wall-clock time.
+        """
 
         if self.__running:
             print("Poller already running")
             raise_err(IL_EALREADY)
 
+        # Check the bus load budget, the period may be stretched
+        self.__period = self.__refresh_time
+        bus_load = getattr(self.__servo.net, 'bus_load', None)
+        if bus_load is not None:
+            regs = [self.__servo.get_reg(identifier, subnode)
+                    for channel, enabled in enumerate(self.__mappings_enabled)
+                    if enabled
+                    for identifier, subnode in self.__mappings[channel].items()]
+            self.__period = bus_load.admit(self, regs, self.__refresh_time)
+
         # Activate timer
-        self.__timer = PollerTimer(self.__refresh_time, self.acquire_callback_poller_data)
+        self.__timebase = Timebase(anchor)
+        self.__timer = PollerTimer(self.__period, self.__acquire)
         self.__timer.start()
-        self.__time_start = datetime.now()
 
         self.__running = True
+        self.__suspended = None
+        self.__missed = 0
+        self.__errors = 0
+        self.__last_error = None
+
+        net = self.__servo.net
+        if hasattr(net, 'register_poller'):
+            net.register_poller(self)
 
         return 0
 
+    def suspend(self):
+        """ Suspend polling, keeping the acquisition (e.g. while the network
+            is being recovered).
+        """
+
+        if self.__running and self.__suspended is None:
+            self.__timer.cancel()
+            self.__suspended = now_ns()
+
+    def resume(self):
+        """ Resume a suspended poller.
+
+            Returns:
+                int: Number of samples missed while suspended.
+        """
+
+        if self.__suspended is None:
+            return 0
+
+        missed = int((now_ns() - self.__suspended) / 1e9 / self.__period)
+        self.__missed += missed
+        self.__suspended = None
+
+        self.__timer = PollerTimer(self.__period, self.__acquire)
+        self.__timer.start()
+
+        return missed
+
+    @property
+    def missed(self):
+        """ int: Samples missed since the start, due to SDO timeouts or
+            aborts, or to the poller being suspended.
+        """
+        return self.__missed
+
+    @property
+    def errors(self):
+        """ int: Acquisitions failed since the start due to other errors
+            (e.g. bus faults or scheduler errors), see `last_error`.
+        """
+        return self.__errors
+
+    @property
+    def last_error(self):
+        """ Exception: Last acquisition error, None if there was none. """
+        return self.__last_error
+
     def stop(self):
         """ Stop poller. """
 
         if self.__running:
             self.__timer.cancel()
 
+            if self.__trigger is not None:
+                self.__lock.acquire()
+                self.__trigger_flush()
+                self.__lock.release()
+
+            bus_load = getattr(self.__servo.net, 'bus_load', None)
+            if bus_load is not None:
+                bus_load.release(self)
+
+            net = self.__servo.net
+            if hasattr(net, 'unregister_poller'):
+                net.unregister_poller(self)
+
         self.__running = False
+        self.__suspended = None
 
-    @property
-    def data(self):
-        """ tuple (list, list, bool): Time vector, array of data vectors and a
-            flag indicating if data was lost.
-        """
+    def __read(self):
+        """ Obtain the acquired samples and reset the acquisition. """
 
-        t = list(self.__acq['t'][0:self.__samples_count])
+        self.__lock.acquire()
+        t_ns = self.__acq['t'][0:self.__samples_count].copy()
         d = []
 
-        # Acquire enabled channels, comprehension list indexes obtained
-        enabled_channel_indexes = [
-            channel_idx for channel_idx, is_enabled in enumerate(self.__mappings_enabled) if is_enabled
-        ]
-
         for channel in range(0, self.__number_channels):
             if self.__mappings_enabled[channel]:
                 d.append(list(self.__acq['d'][channel][0:self.__samples_count]))
             else:
-                d.append(list(None))
+                d.append(None)
 
-        self.__lock.acquire()
+        lost = self.__samples_lost
         self.__samples_count = 0
         self.__samples_lost = False
         self.__lock.release()
 
-        return t, d, self.__samples_lost
+        return t_ns, d, lost
+
+    @property
+    def data(self):
+        """ tuple (list, list, bool): Time vector (s since the start), array
+            of data vectors and a flag indicating if data was lost.
+        """
+
+        t_ns, d, lost = self.__read()
+
+        if self.__timebase is None:
+            return [], d, lost
+
+        return self.__timebase.to_seconds(t_ns).tolist(), d, lost
+
+    @property
+    def data_ns(self):
+        """ tuple (array, list, bool): Time vector (monotonic timestamps, ns,
+            int64), array of data vectors and a flag indicating if data was
+            lost.
+        """
+
+        return self.__read()
+
+    @property
+    def timebase(self):
+        """ Timebase: Timebase of the last acquisition. """
+        return self.__timebase
+
+    @property
+    def segments(self):
+        """ list: Segments captured by the software trigger, as (time vector,
+            data array) tuples. Reading the segments removes them from the
+            poller.
+        """
+
+        if self.__trigger is None:
+            return []
+
+        self.__lock.acquire()
+        self.__trigger_flush()
+        segments = self.__trigger.segments
+        self.__lock.release()
+
+        return segments
+
+    @property
+    def triggers(self):
+        """ int: Number of times the software trigger has fired. """
+
+        if self.__trigger is None:
+            return 0
+
+        self.__lock.acquire()
+        self.__trigger_flush()
+        triggers = self.__trigger.triggers
+        self.__lock.release()
+
+        return triggers
+
+    def trigger_configure(self, mode, channel=0, pre_samples=0,
+                          post_samples=1, th_pos=0., th_neg=0., din_msk=0,
+                          repetitions=1):
+        """ Configure the software trigger.
+
+            While a trigger is configured, only the samples belonging to a
+            triggered window are retained, see `segments`.
+
+            Args:
+                mode (MONITOR_TRIGGER): Trigger mode.
+                channel (int, optional): Trigger source channel.
+                pre_samples (int, optional): Samples kept before the trigger.
+                post_samples (int, optional): Samples kept after the trigger
+                    (the trigger sample included).
+                th_pos (int, float, optional): Positive threshold, used for
+                    MONITOR_TRIGGER.POS, MONITOR_TRIGGER.WINDOW
+                th_neg (int, float, optional): Negative threshold, used for
+                    MONITOR_TRIGGER.NEG, MONITOR_TRIGGER.WINDOW
+                din_msk (int, optional): Bit mask, used for
+                    MONITOR_TRIGGER.DIN
+                repetitions (int, optional): Number of segments to capture, 0
+                    to re-arm forever.
+        """
+
+        if self.__running:
+            print("Poller is running")
+            raise_err(IL_ESTATE)
+
+        if channel >= self.__number_channels:
+            print("Channel out of range")
+            raise_err(IL_EINVAL)
+
+        from ..trigger import SoftwareTrigger
+
+        self.__trigger_t = []
+        self.__trigger_d = []
+        self.__trigger = SoftwareTrigger(
+            self.__number_channels, mode, channel=channel,
+            pre_samples=pre_samples, post_samples=post_samples,
+            th_pos=th_pos, th_neg=th_neg, din_msk=din_msk,
+            repetitions=repetitions)
+
+        return 0
+
+    def trigger_disable(self):
+        """ Disable the software trigger (free-running capture). """
+
+        if self.__running:
+            print("Poller is running")
+            raise_err(IL_ESTATE)
+
+        self.__trigger = None
+        self.__trigger_t = []
+        self.__trigger_d = []
+
+        return 0
+
+    @property
+    def period(self):
+        """ float: Polling period in use (s), the configured one stretched if
+            the bus load budget required it.
+        """
+        return self.__period
+
+    @property
+    def configured_period(self):
+        """ float: Configured polling period (s). """
+        return self.__refresh_time
 
     def configure(self, t_s, sz):
         """ Configure.
@@ -147,11 +414,14 @@ class Poller(object):
             print("Poller is running")
             raise_err(IL_ESTATE)
 
+        import numpy as np
+
         # Configure data and sizes with empty data
         self.reset_acq()
         self.__sz = sz
         self.__refresh_time = t_s
-        self.__acq['t'] = [0] * sz
+        self.__period = t_s
+        self.__acq['t'] = np.zeros(sz, dtype=np.int64)
         for channel in range(0, self.__number_channels):
             data_channel = [0] * sz
             self.__acq['d'].append(data_channel)
@@ -1,3 +1,5 @@
+import sys
+import warnings
 from enum import Enum
 
 from .._ingenialink import lib
@@ -6,9 +8,26 @@ from .._utils import INT_SIZES
 from ..registers import REG_DTYPE, REG_ACCESS, REG_PHY
 # from .dict_labels import LabelsDictionary
 
+_ENUMS = {}
+""" dict: Enumerations lists shared by all the registers defining them. """
+
+
+def _intern(value):
+    """ Intern a register string attribute (None and non-str are kept). """
+
+    return sys.intern(value) if isinstance(value, str) else value
+
+
 class Register(object):
     """ Register.
 
+        Registers are immutable metadata: instances built from the same
+        dictionary file are shared by all the servos using it, so per-servo
+        state (e.g. storage values read from a drive) is kept by the
+        dictionary instance, see `DictionaryCANOpen.storage` and
+        `DictionaryCANOpen.set_storage`. The storage found in the
+        dictionary file is available as `default_storage`.
+
         Args:
             identifier (str): Identifier.
             units (str): Units.
@@ -28,6 +47,11 @@ class Register(object):
             TypeError: If any of the parameters has invalid type.
     """
 
+    __slots__ = ('__identifier', '__units', '__idx', '__subidx', '__subnode',
+                 '__cyclic', '__dtype', '__access', '__phy', '__internal_use',
+                 '__storage', '__storage_valid', '__range', '__labels',
+                 '__enums', '__enums_count', '__cat_id', '__scat_id')
+
     def __init__(self, identifier, units, cyclic, idx, subidx, dtype, access, phy=REG_PHY.NONE, subnode=1, storage=None,
                  range=(None, None), labels={}, enums=[], enums_count=0, cat_id=None, scat_id=None, internal_use=0):
         if not isinstance(dtype, REG_DTYPE):
@@ -39,13 +63,14 @@ class Register(object):
         if not isinstance(phy, REG_PHY):
             raise TypeError('Invalid physical units type')
 
-        # initialize register
-        self.__identifier = identifier
-        self.__units = units
-        self.__idx = idx
-        self.__subidx = subidx
+        # initialize register, strings are interned as most of them are
+        # repeated along the dictionary
+        self.__identifier = _intern(identifier)
+        self.__units = _intern(units)
+        self.__idx = _intern(idx)
+        self.__subidx = _intern(subidx)
         self.__subnode = subnode
-        self.__cyclic = cyclic
+        self.__cyclic = _intern(cyclic)
         self.__dtype = dtype.value
         self.__access = access.value
         self.__phy = phy.value
@@ -121,19 +146,18 @@ class Register(object):
             self.__storage_valid = 0
 
         self.__labels = labels
-        self.__enums = []
         self.__enums_count = enums_count
 
-        for enum in enums:
-            for key, value in enum.items():
-                dictionary = {
-                    'label': value,
-                    'value': int(key)
-                }
-                self.__enums.append(dictionary)
+        enums_key = tuple((int(key), _intern(value))
+                          for enum in enums for key, value in enum.items())
+        self.__enums = _ENUMS.get(enums_key)
+        if self.__enums is None:
+            self.__enums = [{'label': label, 'value': value}
+                            for value, label in enums_key]
+            _ENUMS[enums_key] = self.__enums
 
-        self.__cat_id = cat_id
-        self.__scat_id = scat_id
+        self.__cat_id = _intern(cat_id)
+        self.__scat_id = _intern(scat_id)
 
 
     @property
@@ -183,43 +207,55 @@ class Register(object):
         return REG_PHY(self.__phy)
 
     @property
-    def storage(self):
-        """ Register storage. """
+    def default_storage(self):
+        """ Register storage from the dictionary file. """
         if not self.__storage_valid:
             return None
 
-        if self.dtype == REG_DTYPE.S8:
-            return self.__storage
-        elif self.dtype == REG_DTYPE.U8:
-            return self.__storage
-        if self.dtype == REG_DTYPE.S16:
-            return self.__storage
-        elif self.dtype == REG_DTYPE.U16:
-            return self.__storage
-        if self.dtype == REG_DTYPE.S32:
-            return self.__storage
-        elif self.dtype == REG_DTYPE.U32:
-            return self.__storage
-        if self.dtype == REG_DTYPE.S64:
-            return self.__storage
-        elif self.dtype == REG_DTYPE.U64:
-            return self.__storage
-        elif self.dtype == REG_DTYPE.FLOAT:
-            return self.__storage
-        else:
-            return None
+        return self.__storage
+
+    @property
+    def default_storage_valid(self):
+        """ int: 1 if the dictionary file defines a storage value. """
+        return self.__storage_valid
+
+    @property
+    def storage(self):
+        """ Register storage from the dictionary file.
+
+            .. deprecated::
+                Registers are shared by all the dictionary instances, so
+                values read from a drive are not kept here. Use
+                `DictionaryCANOpen.storage` or `default_storage`.
+        """
+        warnings.warn('Register.storage is deprecated, use '
+                      'DictionaryCANOpen.storage() or default_storage',
+                      DeprecationWarning, stacklevel=2)
+        return self.default_storage
 
     @storage.setter
     def storage(self, value):
-        self.__storage = value
+        warnings.warn('Register.storage can no longer be set (the value is '
+                      'ignored), use DictionaryCANOpen.set_storage()',
+                      DeprecationWarning, stacklevel=2)
 
     @property
     def storage_valid(self):
-        return self.__storage_valid
+        """ int: 1 if the dictionary file defines a storage value.
+
+            .. deprecated::
+                See `storage`, use `default_storage_valid`.
+        """
+        warnings.warn('Register.storage_valid is deprecated, use '
+                      'DictionaryCANOpen.storage() or default_storage_valid',
+                      DeprecationWarning, stacklevel=2)
+        return self.default_storage_valid
 
     @storage_valid.setter
     def storage_valid(self, value):
-        self.__storage_valid = value
+        warnings.warn('Register.storage_valid can no longer be set (the '
+                      'value is ignored), use DictionaryCANOpen.set_storage()',
+                      DeprecationWarning, stacklevel=2)
 
     @property
     def range(self):
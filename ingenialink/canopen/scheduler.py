@@ -0,0 +1,179 @@
+import time
+import threading
+from enum import Enum
+from collections import deque
+from contextlib import contextmanager
+
+from ..exceptions import ILTimeoutError, ILMemoryError
+
+
+class TX_CLASS(Enum):
+    """ Transaction class, in priority order. """
+
+    SAFETY = 0
+    """ Safety (disable, fault reset). """
+    MOTION = 1
+    """ Motion (set-points, enable). """
+    CONFIG = 2
+    """ Configuration. """
+    MONITORING = 3
+    """ Monitoring (pollers, status). """
+
+
+class TransactionScheduler(object):
+    """ Priority-aware bus transaction scheduler.
+
+        Serializes the transactions of a network: a transaction is started
+        once the previous one has finished, taking the oldest pending one of
+        the highest priority class. Long operations made of several
+        transactions are thus preempted by higher priority traffic between
+        transactions. Each class has a bounded queue.
+
+        The scheduler is used like a lock (`acquire`/`release`, or the
+        `transaction` context manager), and it is reentrant: nested
+        transactions of the owner thread run immediately.
+
+        Args:
+            queue_sz (int, optional): Maximum pending transactions per class.
+    """
+
+    def __init__(self, queue_sz=64):
+        self.__queue_sz = queue_sz
+        self.__queues = {tx_class: deque() for tx_class in TX_CLASS}
+        self.__cv = threading.Condition()
+        self.__owner = None
+        self.__depth = 0
+        self.__local = threading.local()
+        self.__stats = {tx_class: {'executed': 0, 'rejected': 0,
+                                   'wait_last': 0., 'wait_max': 0.,
+                                   'wait_total': 0.}
+                        for tx_class in TX_CLASS}
+
+    def __next(self):
+        for tx_class in TX_CLASS:
+            if self.__queues[tx_class]:
+                return self.__queues[tx_class][0]
+
+        return None
+
+    def acquire(self, tx_class=TX_CLASS.CONFIG, timeout=None):
+        """ Wait for the bus.
+
+            The class given with `priority` by the calling thread, if any,
+            takes precedence.
+
+            Args:
+                tx_class (TX_CLASS, optional): Transaction class.
+                timeout (int, float, optional): Timeout (s).
+
+            Raises:
+                ILMemoryError: If the class queue is full.
+                ILTimeoutError: If the bus could not be obtained in time.
+        """
+
+        tx_class = getattr(self.__local, 'tx_class', None) or tx_class
+        me = threading.current_thread()
+
+        with self.__cv:
+            if self.__owner is me:
+                self.__depth += 1
+                return
+
+            stats = self.__stats[tx_class]
+            queue = self.__queues[tx_class]
+            if len(queue) >= self.__queue_sz:
+                stats['rejected'] += 1
+                raise ILMemoryError('Transaction queue full')
+
+            start = time.perf_counter()
+            ticket = (me, start)
+            queue.append(ticket)
+
+            deadline = None if timeout is None else start + timeout
+            while self.__owner is not None or self.__next() is not ticket:
+                remaining = None
+                if deadline is not None:
+                    remaining = deadline - time.perf_counter()
+                    if remaining <= 0:
+                        queue.remove(ticket)
+                        stats['rejected'] += 1
+                        self.__cv.notify_all()
+                        raise ILTimeoutError('Transaction timed out')
+                self.__cv.wait(remaining)
+
+            queue.popleft()
+            self.__owner = me
+            self.__depth = 1
+
+            wait = time.perf_counter() - start
+            stats['executed'] += 1
+            stats['wait_last'] = wait
+            stats['wait_max'] = max(stats['wait_max'], wait)
+            stats['wait_total'] += wait
+
+    def release(self):
+        """ Release the bus. """
+
+        with self.__cv:
+            if self.__owner is not threading.current_thread():
+                raise RuntimeError('Transaction not owned')
+
+            self.__depth -= 1
+            if not self.__depth:
+                self.__owner = None
+                self.__cv.notify_all()
+
+    @contextmanager
+    def transaction(self, tx_class=TX_CLASS.CONFIG, timeout=None):
+        """ Context manager running a transaction, see `acquire`. """
+
+        self.acquire(tx_class, timeout)
+        try:
+            yield
+        finally:
+            self.release()
+
+    @contextmanager
+    def priority(self, tx_class):
+        """ Context manager setting the class of the transactions issued by
+            the calling thread.
+
+            Args:
+                tx_class (TX_CLASS): Transaction class.
+        """
+
+        previous = getattr(self.__local, 'tx_class', None)
+        self.__local.tx_class = tx_class
+        try:
+            yield
+        finally:
+            self.__local.tx_class = previous
+
+    @property
+    def stats(self):
+        """ dict: Per class (by name) pending, executed and rejected
+            transactions, and queue wait time (s) last, maximum and mean.
+        """
+
+        stats = {}
+        with self.__cv:
+            for tx_class in TX_CLASS:
+                s = self.__stats[tx_class]
+                stats[tx_class.name] = {
+                    'pending': len(self.__queues[tx_class]),
+                    'executed': s['executed'],
+                    'rejected': s['rejected'],
+                    'wait_last': s['wait_last'],
+                    'wait_max': s['wait_max'],
+                    'wait_mean': (s['wait_total'] / s['executed']
+                                  if s['executed'] else None)}
+
+        return stats
+
+    def reset_stats(self):
+        """ Reset the statistics. """
+
+        with self.__cv:
+            for s in self.__stats.values():
+                s.update(executed=0, rejected=0, wait_last=0., wait_max=0.,
+                         wait_total=0.)
@@ -2,15 +2,26 @@ import time
 import threading
 import canopen
 import struct
+import contextlib
 import xml.etree.ElementTree as ET
 
 from .._utils import *
 from .constants import *
 from ..servo import SERVO_STATE
 from .._ingenialink import ffi, lib
+from ..exceptions import ILTimeoutError, ILAccessError
 from .dictionary import DictionaryCANOpen
+from .cache import RegisterCache
+from .scheduler import TX_CLASS
 from .registers import Register, REG_DTYPE, REG_ACCESS
 
+
+@contextlib.contextmanager
+def _no_priority():
+    """ No-op transaction class context, used without a scheduler. """
+    yield
+
+
 SERIAL_NUMBER = Register(
     identifier='', units='', subnode=1, idx="0x26E6", subidx="0x00", cyclic='CONFIG',
     dtype=REG_DTYPE.U32, access=REG_ACCESS.RO
@@ -115,6 +126,8 @@ class Servo(object):
         self.__units_acc = None
         self.__name = "Drive"
         self.__drive_status_thread = None
+        self.__cache = None
+        self.__scheduler = getattr(net, 'scheduler', None)
         if not boot_mode:
             self.init_info()
 
@@ -176,6 +189,8 @@ class Servo(object):
 
             Raises:
                 TypeError: If the register type is not valid.
+                ILTimeoutError: If the SDO transfer timed out.
+                ILAccessError: If the SDO transfer was aborted.
         """
         _reg = self.get_reg(reg, subnode)
 
@@ -183,9 +198,16 @@ class Servo(object):
         if access == REG_ACCESS.WO:
             raise TypeError('Register is Write-only')
 
+        cache_key = self.__cache_key(_reg, subnode)
+        if cache_key is not None:
+            hit, value = self.__cache.get(cache_key)
+            if hit:
+                return value
+
         value = None
         dtype = _reg.dtype
         error_raised = None
+        self.__tx_acquire(_reg, write=False)
         try:
             self.__lock.acquire()
             if dtype == REG_DTYPE.S8:
@@ -215,11 +237,23 @@ class Servo(object):
                     self.__node.sdo.upload(int(str(_reg.idx), 16), int(str(_reg.subidx), 16)),
                     "little"
                 )
+
+            # cached while locked, so that a concurrent write cannot be
+            # overtaken by the value read before it
+            if cache_key is not None:
+                self.__cache.put(cache_key, value)
+        except canopen.SdoAbortedError as e:
+            print(_reg.identifier + " : " + str(e))
+            error_raised = ILAccessError("Read error: " + str(e))
+        except canopen.SdoCommunicationError as e:
+            print(_reg.identifier + " : " + str(e))
+            error_raised = ILTimeoutError("Read error: " + str(e))
         except Exception as e:
             print(_reg.identifier + " : " + str(e))
             error_raised = Exception("Read error")
         finally:
             self.__lock.release()
+            self.__tx_release()
 
         if error_raised is not None:
             raise error_raised
@@ -274,6 +308,7 @@ class Servo(object):
             data = int(data)
 
         error_raised = None
+        self.__tx_acquire(_reg, write=True)
         try:
             self.__lock.acquire()
             if _reg.dtype == REG_DTYPE.FLOAT:
@@ -306,11 +341,100 @@ class Servo(object):
             print(_reg.identifier + " : " + str(e))
             error_raised = Exception("Write error")
         finally:
+            # invalidated while locked, before any other read can run
+            if self.__cache is not None:
+                self.__cache.invalidate((int(subnode), _reg.identifier))
             self.__lock.release()
+            self.__tx_release()
 
         if error_raised is not None:
             raise error_raised
 
+    def __tx_acquire(self, reg, write):
+        """ Wait for the bus, if the network schedules transactions.
+
+            Writes of cyclic RX registers are motion transactions, reads of
+            cyclic TX registers monitoring ones, and the rest configuration
+            ones (unless set with `priority`).
+        """
+        if self.__scheduler is None:
+            return
+
+        if write and reg.cyclic == 'CYCLIC_RX':
+            tx_class = TX_CLASS.MOTION
+        elif not write and reg.cyclic == 'CYCLIC_TX':
+            tx_class = TX_CLASS.MONITORING
+        else:
+            tx_class = TX_CLASS.CONFIG
+
+        self.__scheduler.acquire(tx_class)
+
+    def __tx_release(self):
+        if self.__scheduler is not None:
+            self.__scheduler.release()
+
+    def priority(self, tx_class):
+        """ Context manager setting the class of the transactions issued by
+            the calling thread.
+
+            Args:
+                tx_class (TX_CLASS): Transaction class.
+        """
+        if self.__scheduler is None:
+            return _no_priority()
+        return self.__scheduler.priority(tx_class)
+
+    def __cache_key(self, reg, subnode):
+        """ Obtain the cache key of a register, None if not cacheable. """
+
+        if self.__cache is None or reg.cyclic != 'CONFIG' or not reg.identifier:
+            return None
+
+        return int(subnode), reg.identifier
+
+    def cache_enable(self, ttl=None):
+        """ Enable the CONFIG registers value cache.
+
+            Reads of CONFIG registers are served from the cache until the
+            entry expires or the register is written. CYCLIC registers are
+            always read from the drive.
+
+            Args:
+                ttl (int, float, optional): Time-to-live (s), None for
+                    entries that only expire on writes or refresh().
+        """
+
+        self.__cache = RegisterCache(ttl)
+
+    def cache_disable(self):
+        """ Disable the registers value cache. """
+
+        self.__cache = None
+
+    def refresh(self, reg=None, subnode=1):
+        """ Refresh cached register values.
+
+            Args:
+                reg (str, Register, optional): Register to be re-read, all
+                    the cached registers are invalidated if not given.
+                subnode (int, optional): Subnode.
+
+            Returns:
+                any: Register value if a register is given.
+        """
+
+        if self.__cache is None:
+            return self.raw_read(reg, subnode=subnode) if reg else None
+
+        if reg is None:
+            self.__cache.invalidate()
+            return None
+
+        _reg = self.get_reg(reg, subnode)
+        self.__cache.invalidate((int(subnode), _reg.identifier))
+
+        return self.raw_read(_reg, subnode=subnode)
+
     def get_all_registers(self):
         for obj in self.__node.object_dictionary.values():
             print('0x%X: %s' % (obj.index, obj.name))
@@ -341,10 +465,9 @@ class Servo(object):
                     storage = self.raw_read(element.attrib['id'], subnode=subnode)
                     element.set('storage', str(storage))
 
-                    # Update register object
-                    reg = self.__dict.regs[subnode][element.attrib['id']]
-                    reg.storage = storage
-                    reg.storage_valid = 1
+                    # Update dictionary storage
+                    self.__dict.set_storage(element.attrib['id'], storage,
+                                            subnode=subnode)
             except BaseException as e:
                 print("Exception during dict_storage_read, register " + element.attrib['id'] + ": ", str(e))
 
@@ -449,6 +572,10 @@ class Servo(object):
         return r
 
     def fault_reset(self, subnode=1):
+        with self.priority(TX_CLASS.SAFETY):
+            return self.__fault_reset(subnode)
+
+    def __fault_reset(self, subnode):
         r = 0
         retries = 0
         status_word = self.raw_read(STATUS_WORD_REGISTERS[subnode], subnode=subnode)
@@ -471,6 +598,10 @@ class Servo(object):
 
     def enable(self, timeout=2000, subnode=1):
         """ Enable PDS. """
+        with self.priority(TX_CLASS.MOTION):
+            return self.__enable(timeout, subnode)
+
+    def __enable(self, timeout, subnode):
         r = 0
 
         status_word = self.raw_read(STATUS_WORD_REGISTERS[subnode], subnode=subnode)
@@ -514,6 +645,10 @@ class Servo(object):
 
     def disable(self, subnode=1):
         """ Disable PDS. """
+        with self.priority(TX_CLASS.SAFETY):
+            return self.__disable(subnode)
+
+    def __disable(self, subnode):
         r = 0
 
         status_word = self.raw_read(STATUS_WORD_REGISTERS[subnode], subnode=subnode)
@@ -562,6 +697,11 @@ class Servo(object):
         """ Dictionary: Dictionary. """
         return self.__dict
 
+    @property
+    def net(self):
+        """ Network: Network of the servo. """
+        return self.__net
+
     @property
     def node(self):
         """ int: Node. """
@@ -625,4 +765,15 @@ class Servo(object):
     @property
     def subnodes(self):
         """ SUBNODES: Number of subnodes. """
-        return self.__dict.subnodes
\ No newline at end of file
+        return self.__dict.subnodes
+
+    @property
+    def stats(self):
+        """ dict: Servo statistics. """
+        cache = self.__cache
+        return {
+            'cache_enabled': cache is not None,
+            'cache_hits': cache.hits if cache is not None else 0,
+            'cache_misses': cache.misses if cache is not None else 0,
+            'cache_entries': len(cache) if cache is not None else 0
+        }
\ No newline at end of file
@@ -0,0 +1,269 @@
+import threading
+import time
+
+import numpy as np
+
+
+SYNC_COB_ID = 0x80
+""" int: SYNC COB-ID. """
+
+_VAR_DTYPES = {0x01: np.bool_,
+               0x02: np.int8, 0x03: np.int16, 0x04: np.int32,
+               0x05: np.uint8, 0x06: np.uint16, 0x07: np.uint32,
+               0x08: np.float32, 0x15: np.int64, 0x1B: np.uint64,
+               0x11: np.float64}
+""" dict: NumPy data type of the CANopen object dictionary data types. """
+
+
+class SyncAcquisition(object):
+    """ SYNC driven multi-node acquisition.
+
+        TPDOs of any number of nodes, transmitted on SYNC, are aligned by
+        SYNC cycle: a row is opened on every SYNC and the TPDOs received
+        until the next one are stored in it. Frames are kept raw while
+        acquiring and decoded in one step per PDO when the data is read, so
+        the result is a sample matrix with a column per PDO field, plus a
+        mask of the PDOs received in each cycle. Cycles missing a PDO are
+        reported (NaN in its columns), as are SYNC counter gaps.
+
+        SYNC is either produced by the acquisition (with counter) or by
+        another device on the bus. In both cases cycles are timestamped with
+        the monotonic clock when SYNC is sent or received (CAN frame
+        timestamps are not used, as their clock depends on the interface).
+
+        Args:
+            network (Network, canopen.Network): Network.
+            sz (int, optional): Buffer size (cycles).
+            sync_overflow (int, optional): SYNC counter overflow value.
+    """
+
+    def __init__(self, network, sz=10000, sync_overflow=240):
+        self.__network = getattr(network, 'network', network)
+        self.__sz = sz
+        self.__overflow = sync_overflow
+
+        self.__pdos = []
+        self.__pdo_cbs = []
+        self.__fields = []
+        self.__lock = threading.Lock()
+        self.__running = False
+        self.__thread = None
+        self.__stop = threading.Event()
+
+        self.__raw = None
+        self.__mask = None
+        self.__t = None
+        self.__counter = None
+        self.__cnt = 0
+        self.__cycle = None
+        self.__last_counter = None
+
+        self.__missing = []
+        self.__sync_lost = 0
+        self.__cycles_lost = 0
+
+    def add_pdo(self, cob_id, fields):
+        """ Add a TPDO.
+
+            Args:
+                cob_id (int): TPDO COB-ID.
+                fields (list): (name, byte offset, NumPy data type) tuples.
+        """
+
+        if self.__running:
+            raise RuntimeError('Acquisition running')
+
+        dtype = np.dtype({'names': [f[0] for f in fields],
+                          'formats': [np.dtype(f[2]).newbyteorder('<')
+                                      for f in fields],
+                          'offsets': [f[1] for f in fields],
+                          'itemsize': 8})
+
+        self.__pdos.append((cob_id, dtype))
+        self.__fields.extend(f[0] for f in fields)
+
+    def add_map(self, pdo_map, prefix=''):
+        """ Add a TPDO from a python-canopen PDO map.
+
+            Args:
+                pdo_map (canopen.pdo.Map): TPDO map.
+                prefix (str, optional): Field names prefix.
+        """
+
+        fields = []
+        for var in pdo_map:
+            if var.offset % 8 or var.od.data_type not in _VAR_DTYPES:
+                raise ValueError('Unsupported PDO variable: ' + var.name)
+            fields.append((prefix + var.name, var.offset // 8,
+                           _VAR_DTYPES[var.od.data_type]))
+
+        self.add_pdo(pdo_map.cob_id, fields)
+
+    @property
+    def fields(self):
+        """ list: Field names (data columns). """
+        return list(self.__fields)
+
+    def start(self, period=None):
+        """ Start the acquisition.
+
+            Args:
+                period (int, float, optional): SYNC period (s), to produce
+                    SYNC. If not given, SYNC is expected from another device.
+        """
+
+        if self.__running:
+            raise RuntimeError('Acquisition already running')
+
+        self.__raw = np.zeros((self.__sz, len(self.__pdos), 8), dtype=np.uint8)
+        self.__mask = np.zeros((self.__sz, len(self.__pdos)), dtype=np.bool_)
+        self.__t = np.zeros(self.__sz, dtype=np.float64)
+        self.__counter = np.zeros(self.__sz, dtype=np.int64)
+        self.__cnt = 0
+        self.__cycle = None
+        self.__last_counter = None
+        self.__missing = [0] * len(self.__pdos)
+        self.__sync_lost = 0
+        self.__cycles_lost = 0
+
+        self.__pdo_cbs = [self.__on_pdo(i) for i in range(len(self.__pdos))]
+        for (cob_id, _), cb in zip(self.__pdos, self.__pdo_cbs):
+            self.__network.subscribe(cob_id, cb)
+
+        self.__running = True
+
+        if period is None:
+            self.__network.subscribe(SYNC_COB_ID, self.__on_sync)
+        else:
+            self.__stop.clear()
+            self.__thread = threading.Thread(target=self.__produce,
+                                             args=(period, ))
+            self.__thread.daemon = True
+            self.__thread.start()
+
+    def stop(self):
+        """ Stop the acquisition. """
+
+        if not self.__running:
+            return
+
+        if self.__thread is not None:
+            self.__stop.set()
+            self.__thread.join()
+            self.__thread = None
+        else:
+            self.__network.unsubscribe(SYNC_COB_ID, self.__on_sync)
+
+        for (cob_id, _), cb in zip(self.__pdos, self.__pdo_cbs):
+            self.__network.unsubscribe(cob_id, cb)
+        self.__pdo_cbs = []
+
+        with self.__lock:
+            self.__close_cycle()
+            self.__running = False
+
+    def __produce(self, period):
+        counter = 1
+        deadline = time.monotonic()
+        while True:
+            deadline += period
+            with self.__lock:
+                self.__sync(time.monotonic(), counter)
+            self.__network.sync.transmit(counter)
+            counter = counter % self.__overflow + 1
+
+            if self.__stop.wait(max(deadline - time.monotonic(), 0)):
+                break
+
+    def __on_sync(self, can_id, data, timestamp):
+        with self.__lock:
+            self.__sync(time.monotonic(), data[0] if len(data) else None)
+
+    def __on_pdo(self, i):
+        def on_pdo(can_id, data, timestamp):
+            with self.__lock:
+                if self.__cycle is not None:
+                    self.__raw[self.__cycle, i, :len(data)] = data
+                    self.__mask[self.__cycle, i] = True
+
+        return on_pdo
+
+    def __close_cycle(self):
+        if self.__cycle is None:
+            return
+
+        for i, received in enumerate(self.__mask[self.__cycle]):
+            if not received:
+                self.__missing[i] += 1
+
+        self.__cnt += 1
+        self.__cycle = None
+
+    def __sync(self, timestamp, counter):
+        """ Close the current cycle and open a new one. """
+
+        self.__close_cycle()
+
+        if counter is not None and self.__last_counter is not None:
+            # SYNC counter runs from 1 to its overflow value
+            expected = self.__last_counter % self.__overflow + 1
+            self.__sync_lost += (counter - expected) % self.__overflow
+        self.__last_counter = counter
+
+        if self.__cnt >= self.__sz:
+            self.__cycles_lost += 1
+            return
+
+        row = self.__cnt
+        self.__t[row] = timestamp
+        self.__counter[row] = -1 if counter is None else counter
+        self.__mask[row] = False
+        self.__raw[row] = 0
+        self.__cycle = row
+
+    @property
+    def data(self):
+        """ tuple (array, array, array, array): SYNC timestamps (monotonic
+            clock, s), SYNC counters (-1 if SYNC has no counter), data
+            (cycle x field) and received mask (cycle x PDO) of the completed
+            cycles.
+        """
+
+        with self.__lock:
+            n = self.__cnt
+            raw = self.__raw[:n].copy()
+            mask = self.__mask[:n].copy()
+            t = self.__t[:n].copy()
+            counter = self.__counter[:n].copy()
+
+            # keep the cycle in progress
+            if self.__cycle is not None:
+                self.__raw[0] = self.__raw[self.__cycle]
+                self.__mask[0] = self.__mask[self.__cycle]
+                self.__t[0] = self.__t[self.__cycle]
+                self.__counter[0] = self.__counter[self.__cycle]
+                self.__cycle = 0
+            self.__cnt = 0
+
+        d = np.empty((n, len(self.__fields)), dtype=np.float64)
+        col = 0
+        for i, (_, dtype) in enumerate(self.__pdos):
+            values = raw[:, i, :].copy().view(dtype).reshape(n)
+            for name in dtype.names:
+                d[:, col] = values[name]
+                d[~mask[:, i], col] = np.nan
+                col += 1
+
+        return t, counter, d, mask
+
+    @property
+    def stats(self):
+        """ dict: Missing frames per PDO (COB-ID), lost SYNC frames (from the
+            counter) and cycles lost due to a full buffer.
+        """
+
+        with self.__lock:
+            return {'missing': {cob_id: missing for (cob_id, _), missing
+                                in zip(self.__pdos, self.__missing)},
+                    'sync_lost': self.__sync_lost,
+                    'cycles_lost': self.__cycles_lost}
@@ -0,0 +1,280 @@
+import os
+import json
+
+import numpy as np
+
+from .registers import REG_DTYPE
+
+
+HEADER = 'capture.json'
+""" str: Capture header file name. """
+
+REG_DTYPE_NP = {REG_DTYPE.U8: np.uint8,
+                REG_DTYPE.S8: np.int8,
+                REG_DTYPE.U16: np.uint16,
+                REG_DTYPE.S16: np.int16,
+                REG_DTYPE.U32: np.uint32,
+                REG_DTYPE.S32: np.int32,
+                REG_DTYPE.U64: np.uint64,
+                REG_DTYPE.S64: np.int64,
+                REG_DTYPE.FLOAT: np.float32}
+""" dict: NumPy data type of each register data type. """
+
+
+def _channel_meta(channel):
+    """ Obtain the metadata of a capture channel.
+
+        Args:
+            channel (Register, tuple): Register, or (name, dtype) tuple.
+
+        Returns:
+            dict: Channel metadata.
+    """
+
+    if isinstance(channel, tuple):
+        name, dtype = channel
+        return {'name': name, 'dtype': np.dtype(dtype).str}
+
+    if channel.dtype not in REG_DTYPE_NP:
+        raise ValueError('Unsupported register data type')
+
+    meta = {'name': channel.identifier,
+            'identifier': channel.identifier,
+            'units': channel.units,
+            'subnode': int(channel.subnode),
+            'reg_dtype': channel.dtype.name,
+            'dtype': np.dtype(REG_DTYPE_NP[channel.dtype]).str}
+
+    # CANopen registers are addressed by index/subindex
+    for attr in ('address', 'idx', 'subidx'):
+        if hasattr(channel, attr):
+            meta[attr] = getattr(channel, attr)
+
+    return meta
+
+
+class CaptureWriter(object):
+    """ Capture writer.
+
+        A capture is a directory with one raw file per column (time and
+        channels) of fixed-size typed items, a sparse time index (one entry
+        every `index_stride` samples) and a JSON header describing the
+        channels. Blocks as returned by `Poller.data` or `Monitor.data` can
+        be appended directly.
+
+        Args:
+            path (str): Capture directory (created if needed).
+            channels (list): Registers, or (name, dtype) tuples.
+            t_dtype (numpy.dtype, optional): Time column data type.
+            index_stride (int, optional): Samples between index entries.
+    """
+
+    def __init__(self, path, channels, t_dtype=np.float64, index_stride=1024):
+        if index_stride < 1:
+            raise ValueError('Invalid index stride')
+
+        self._path = path
+        self._meta = [_channel_meta(ch) for ch in channels]
+        self._t_dtype = np.dtype(t_dtype)
+        self._dtypes = [np.dtype(m['dtype']) for m in self._meta]
+        self._stride = index_stride
+        self._samples = 0
+
+        os.makedirs(path, exist_ok=True)
+        self._write_header()
+
+        self._f_t = open(os.path.join(path, 't.bin'), 'wb')
+        self._f_d = [open(os.path.join(path, '{}.bin'.format(i)), 'wb')
+                     for i in range(len(self._meta))]
+        self._f_idx = open(os.path.join(path, 'index.bin'), 'wb')
+
+    def _write_header(self):
+        header = {'version': 1,
+                  't_dtype': self._t_dtype.str,
+                  'index_stride': self._stride,
+                  'samples': self._samples,
+                  'channels': self._meta}
+
+        fpath = os.path.join(self._path, HEADER)
+        with open(fpath + '.tmp', 'w') as f:
+            json.dump(header, f, indent=1)
+        os.replace(fpath + '.tmp', fpath)
+
+    def append(self, t, d):
+        """ Append a block of samples.
+
+            Args:
+                t (list, array): Time vector.
+                d (list): Data vectors, one per channel (None for disabled
+                    channels).
+        """
+
+        t = np.asarray(t, dtype=self._t_dtype)
+        n = len(t)
+        if not n:
+            return
+
+        self._f_t.write(t.tobytes())
+        for f, dtype, data in zip(self._f_d, self._dtypes, d):
+            if data is None:
+                data = np.full(n, np.nan if dtype.kind == 'f' else 0, dtype)
+            f.write(np.asarray(data, dtype=dtype).tobytes())
+
+        # index entries for the strides starting within this block
+        first = -(-self._samples // self._stride) * self._stride
+        offsets = np.arange(first, self._samples + n, self._stride)
+        if len(offsets):
+            entries = np.empty(len(offsets), dtype=[('t', self._t_dtype),
+                                                    ('offset', '<i8')])
+            entries['t'] = t[offsets - self._samples]
+            entries['offset'] = offsets
+            self._f_idx.write(entries.tobytes())
+
+        self._samples += n
+
+    def flush(self):
+        """ Flush the written data and update the header. """
+
+        for f in [self._f_t, self._f_idx] + self._f_d:
+            f.flush()
+
+        self._write_header()
+
+    def close(self):
+        """ Close the capture. """
+
+        self.flush()
+        for f in [self._f_t, self._f_idx] + self._f_d:
+            f.close()
+
+    @property
+    def samples(self):
+        """ int: Number of written samples. """
+        return self._samples
+
+
+class CaptureReader(object):
+    """ Capture reader.
+
+        Columns are memory-mapped. Time range queries only touch the sparse
+        index and the pages of the columns within the requested range.
+
+        Args:
+            path (str): Capture directory.
+    """
+
+    def __init__(self, path):
+        self._path = path
+
+        with open(os.path.join(path, HEADER), 'r') as f:
+            self._header = json.load(f)
+
+        self._t_dtype = np.dtype(self._header['t_dtype'])
+        self._stride = self._header['index_stride']
+
+        # sample count from the column sizes, so that data flushed after
+        # the last header update is also available
+        sizes = [self._size('t.bin', self._t_dtype)]
+        for i, meta in enumerate(self._header['channels']):
+            sizes.append(self._size('{}.bin'.format(i),
+                                    np.dtype(meta['dtype'])))
+        self._samples = min(sizes)
+
+        self._t = self._map('t.bin', self._t_dtype, self._samples)
+        self._d = [self._map('{}.bin'.format(i), np.dtype(meta['dtype']),
+                             self._samples)
+                   for i, meta in enumerate(self._header['channels'])]
+
+        idx_dtype = np.dtype([('t', self._t_dtype), ('offset', '<i8')])
+        n_idx = self._size('index.bin', idx_dtype)
+        n_idx = min(n_idx, -(-self._samples // self._stride))
+        self._index = self._map('index.bin', idx_dtype, n_idx)
+
+    def _size(self, fname, dtype):
+        return os.path.getsize(os.path.join(self._path, fname)) // dtype.itemsize
+
+    def _map(self, fname, dtype, n):
+        if not n:
+            return np.empty(0, dtype=dtype)
+
+        return np.memmap(os.path.join(self._path, fname), dtype=dtype,
+                         mode='r', shape=(n, ))
+
+    @property
+    def channels(self):
+        """ list: Channels metadata. """
+        return self._header['channels']
+
+    @property
+    def samples(self):
+        """ int: Number of samples. """
+        return self._samples
+
+    def _channel_idx(self, channel):
+        if isinstance(channel, int):
+            return channel
+
+        for i, meta in enumerate(self._header['channels']):
+            if meta['name'] == channel:
+                return i
+
+        raise KeyError('Unknown channel: {}'.format(channel))
+
+    def offset(self, t, side='left'):
+        """ Obtain the sample offset of a timestamp.
+
+            Args:
+                t (int, float): Timestamp.
+                side (str, optional): 'left' for the first sample at or after
+                    t, 'right' for the first sample after t.
+
+            Returns:
+                int: Sample offset.
+        """
+
+        # locate the stride in the sparse index, then search within it
+        i = np.searchsorted(self._index['t'], t, side=side)
+        lo = int(self._index['offset'][i - 1]) if i > 0 else 0
+        hi = (int(self._index['offset'][i]) if i < len(self._index)
+              else self._samples)
+
+        return lo + int(np.searchsorted(self._t[lo:hi], t, side=side))
+
+    def range(self, start, stop, channels=None):
+        """ Obtain a sample range.
+
+            Args:
+                start (int): First sample (included).
+                stop (int): Last sample (excluded).
+                channels (list, optional): Channel names or indexes, all if
+                    not given.
+
+            Returns:
+                tuple (array, list): Time vector and data vectors
+                    (memory-mapped views).
+        """
+
+        if channels is None:
+            channels = range(len(self._d))
+
+        sl = slice(max(start, 0), min(stop, self._samples))
+
+        return (self._t[sl],
+                [self._d[self._channel_idx(ch)][sl] for ch in channels])
+
+    def window(self, t_start, t_stop, channels=None):
+        """ Obtain the samples within a time window.
+
+            Args:
+                t_start (int, float): Window start (included).
+                t_stop (int, float): Window stop (included).
+                channels (list, optional): Channel names or indexes, all if
+                    not given.
+
+            Returns:
+                tuple (array, list): Time vector and data vectors
+                    (memory-mapped views).
+        """
+
+        return self.range(self.offset(t_start, 'left'),
+                          self.offset(t_stop, 'right'), channels)
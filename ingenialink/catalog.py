@@ -0,0 +1,373 @@
+import sys
+from enum import Enum
+
+import numpy as np
+
+
+CATALOG_DTYPE = np.dtype([('identifier', 'i4'), ('subnode', 'u1'),
+                          ('address', 'u4'), ('idx', 'u2'), ('subidx', 'u1'),
+                          ('dtype', 'i2'), ('access', 'i2'), ('phy', 'i2'),
+                          ('cyclic', 'i4'), ('cat_id', 'i4'),
+                          ('scat_id', 'i4'), ('units', 'i4'),
+                          ('storage', '?'), ('internal_use', '?')])
+""" numpy.dtype: Catalog record. String fields hold codes of the catalog
+    string table (-1 if undefined).
+"""
+
+_STR_FIELDS = ('identifier', 'cyclic', 'cat_id', 'scat_id', 'units')
+""" tuple: Catalog fields holding string codes. """
+
+
+def _hex(value):
+    """ Convert a CANopen index/subindex (hex str or int) to int. """
+
+    if isinstance(value, str):
+        return int(value, 16)
+
+    return int(value)
+
+
+class CatalogView(object):
+    """ Register catalog selection.
+
+        Selections only keep the selected rows of the catalog, so that
+        queries do not copy or create any register.
+
+        Args:
+            catalog (RegisterCatalog): Catalog.
+            rows (array): Selected rows.
+    """
+
+    def __init__(self, catalog, rows):
+        self._catalog = catalog
+        self._rows = rows
+
+    def __len__(self):
+        return len(self._rows)
+
+    def __iter__(self):
+        return iter(self.registers)
+
+    def __getitem__(self, field):
+        """ Obtain a field of the selected registers.
+
+            Args:
+                field (str): Field name (see `CATALOG_DTYPE`).
+
+            Returns:
+                array: Field values.
+        """
+
+        return self._catalog.table[field][self._rows]
+
+    @property
+    def rows(self):
+        """ array: Selected catalog rows. """
+        return self._rows
+
+    @property
+    def table(self):
+        """ array: Records of the selected registers. """
+        return self._catalog.table[self._rows]
+
+    @property
+    def registers(self):
+        """ list: Selected registers. """
+        return self._catalog.registers(self._rows)
+
+    @property
+    def identifiers(self):
+        """ list: Identifiers of the selected registers. """
+        return [self._catalog.string(code) for code in self['identifier']]
+
+    def query(self, **criteria):
+        """ Refine the selection (see `RegisterCatalog.mask`).
+
+            Returns:
+                CatalogView: Selection.
+        """
+
+        mask = self._catalog.mask(**criteria)[self._rows]
+        return CatalogView(self._catalog, self._rows[mask])
+
+
+class RegisterCatalog(object):
+    """ Columnar register catalog.
+
+        The registers of a dictionary (either `Dictionary` or
+        `DictionaryCANOpen`) are collected once in a NumPy structured
+        array, one record per register, so that queries over the whole
+        dictionary (e.g. all the read/write registers of a subnode in a
+        category with storage) are evaluated as vectorized masks instead of
+        iterating the registers. Strings (identifiers, cyclic types,
+        categories, units) are interned in a table and stored as codes.
+
+        Reverse indexes map addresses and CANopen (index, subindex) pairs
+        to registers, e.g. to decode monitoring mappings or PDO frames.
+
+        Args:
+            dict_ (Dictionary, DictionaryCANOpen): Dictionary.
+    """
+
+    def __init__(self, dict_):
+        self._strings = []
+        self._codes = {}
+        self._regs = []
+        self._by_identifier = {}
+
+        records = []
+        for subnode in range(dict_.subnodes):
+            regs = dict_.get_regs(subnode)
+            if regs is None:
+                continue
+
+            for identifier in regs:
+                reg = regs[identifier]
+                self._by_identifier[(int(reg.subnode), identifier)] = len(
+                    self._regs)
+                self._regs.append(reg)
+                records.append(self._record(reg))
+
+        self._table = np.array(records, dtype=CATALOG_DTYPE)
+        self._table.flags.writeable = False
+
+        self._by_address = {}
+        self._by_index = {}
+        for row, rec in enumerate(self._table.tolist()):
+            _, subnode, address, idx, subidx = rec[:5]
+            self._by_address.setdefault((subnode, address), row)
+            self._by_index.setdefault((idx, subidx), row)
+
+        # sorted (subnode, address) keys for vectorized lookups
+        keys = (self._table['subnode'].astype(np.uint64) << 32 |
+                self._table['address'])
+        self._addr_order = np.argsort(keys, kind='stable')
+        self._addr_keys = keys[self._addr_order]
+
+    def _intern(self, value):
+        """ Obtain the code of a string, adding it to the table. """
+
+        if value is None:
+            return -1
+
+        code = self._codes.get(value)
+        if code is None:
+            code = len(self._strings)
+            self._strings.append(sys.intern(value))
+            self._codes[value] = code
+
+        return code
+
+    def _record(self, reg):
+        """ Build the catalog record of a register. """
+
+        if hasattr(reg, 'idx'):
+            idx = _hex(reg.idx)
+            subidx = _hex(reg.subidx)
+            address = idx << 8 | subidx
+            storage = bool(reg.default_storage_valid)
+        else:
+            address = reg.address
+            idx = subidx = 0
+            storage = reg.storage is not None
+
+        return (self._intern(reg.identifier), int(reg.subnode), address,
+                idx, subidx, reg.dtype.value, reg.access.value,
+                reg.phy.value, self._intern(reg.cyclic),
+                self._intern(reg.cat_id), self._intern(reg.scat_id),
+                self._intern(reg.units), storage, bool(int(reg.internal_use)))
+
+    def __len__(self):
+        return len(self._regs)
+
+    @property
+    def table(self):
+        """ array: Catalog records (read-only, see `CATALOG_DTYPE`). """
+        return self._table
+
+    @property
+    def strings(self):
+        """ list: String table. """
+        return list(self._strings)
+
+    def code(self, value):
+        """ Obtain the code of a string.
+
+            Args:
+                value (str): String.
+
+            Returns:
+                int: Code, -1 if not in the catalog.
+        """
+
+        if value is None:
+            return -1
+
+        return self._codes.get(value, -1)
+
+    def string(self, code):
+        """ Obtain the string of a code.
+
+            Args:
+                code (int): Code.
+
+            Returns:
+                str: String, None if undefined.
+        """
+
+        return self._strings[code] if code >= 0 else None
+
+    def register(self, row):
+        """ Obtain the register of a catalog row.
+
+            Args:
+                row (int): Row.
+
+            Returns:
+                Register: Register.
+        """
+
+        return self._regs[row]
+
+    def registers(self, rows):
+        """ Obtain the registers of a set of catalog rows.
+
+            Args:
+                rows (array, list): Rows, or boolean mask.
+
+            Returns:
+                list: Registers.
+        """
+
+        rows = np.asarray(rows)
+        if rows.dtype == np.bool_:
+            rows = np.flatnonzero(rows)
+
+        return [self._regs[row] for row in rows.tolist()]
+
+    def __codes(self, field, value):
+        """ Convert a criterion value to catalog codes. """
+
+        if not isinstance(value, (list, tuple, set, frozenset)):
+            value = (value, )
+
+        codes = []
+        for v in value:
+            if isinstance(v, Enum):
+                v = v.value
+            elif field in _STR_FIELDS and (v is None or isinstance(v, str)):
+                v = self.code(v) if v is not None else -1
+            codes.append(v)
+
+        return codes
+
+    def mask(self, **criteria):
+        """ Evaluate a query.
+
+            Criteria are given as field=value (see `CATALOG_DTYPE`), where
+            the value can be a list of accepted values. Enumerations
+            (REG_ACCESS, REG_DTYPE, REG_PHY) and strings (identifier,
+            cyclic, cat_id, scat_id, units) are accepted as is.
+
+            Returns:
+                array: Boolean mask of the matching catalog rows.
+
+            Raises:
+                KeyError: If a field is not valid.
+        """
+
+        mask = np.ones(len(self._table), dtype=bool)
+        for field, value in criteria.items():
+            if field not in CATALOG_DTYPE.names:
+                raise KeyError('Invalid catalog field: {}'.format(field))
+
+            codes = self.__codes(field, value)
+            column = self._table[field]
+            if len(codes) == 1:
+                mask &= column == codes[0]
+            else:
+                mask &= np.isin(column, codes)
+
+        return mask
+
+    def query(self, **criteria):
+        """ Select the registers matching a query (see `mask`).
+
+            Examples:
+                >>> catalog.query(subnode=1, access=REG_ACCESS.RW,
+                ...               cat_id='MOTION', storage=True)
+
+            Returns:
+                CatalogView: Selection.
+        """
+
+        return CatalogView(self, np.flatnonzero(self.mask(**criteria)))
+
+    def update_storage(self, reg, storage):
+        """ Update the storage flag of a register, e.g. once its storage
+            value has been updated in the dictionary.
+
+            Args:
+                reg (Register): Register.
+                storage (bool): True if the register has a storage value.
+        """
+
+        row = self._by_identifier.get((int(reg.subnode), reg.identifier))
+        if row is None:
+            return
+
+        self._table.flags.writeable = True
+        try:
+            self._table['storage'][row] = bool(storage)
+        finally:
+            self._table.flags.writeable = False
+
+    def by_address(self, address, subnode=1):
+        """ Obtain the register at an address.
+
+            Args:
+                address (int): Register address.
+                subnode (int, optional): Subnode.
+
+            Returns:
+                Register: Register, None if not found.
+        """
+
+        row = self._by_address.get((subnode, address))
+        return self._regs[row] if row is not None else None
+
+    def by_index(self, idx, subidx=0):
+        """ Obtain the register at a CANopen index and subindex.
+
+            Args:
+                idx (int, str): Index.
+                subidx (int, str, optional): Subindex.
+
+            Returns:
+                Register: Register, None if not found.
+        """
+
+        row = self._by_index.get((_hex(idx), _hex(subidx)))
+        return self._regs[row] if row is not None else None
+
+    def rows_by_address(self, addresses, subnode=1):
+        """ Obtain the catalog rows of a set of addresses.
+
+            Args:
+                addresses (array, list): Register addresses.
+                subnode (int, array, optional): Subnode(s).
+
+            Returns:
+                array: Rows (-1 if not found).
+        """
+
+        addresses = np.asarray(addresses, dtype=np.uint64)
+        keys = np.asarray(subnode, dtype=np.uint64) << 32 | addresses
+
+        if not len(self._addr_keys):
+            return np.full(keys.shape, -1, dtype=np.intp)
+
+        pos = np.searchsorted(self._addr_keys, keys)
+        pos = np.minimum(pos, len(self._addr_keys) - 1)
+        found = self._addr_keys[pos] == keys
+        return np.where(found, self._addr_order[pos], -1)
@@ -0,0 +1,298 @@
+import numpy as np
+
+
+class Decimator(object):
+    """ Streaming min/max/mean level-of-detail decimator.
+
+        Samples are appended in blocks (e.g. the data returned by
+        ``Poller.data`` or ``Monitor.data``) and folded into a pyramid of
+        min/max/sum levels, each level reducing the previous one by
+        ``factor``. Any window can then be obtained as at most ``n``
+        buckets by reading a single pyramid level, so the query cost does
+        not depend on the capture length.
+
+        Args:
+            n_ch (int): Number of channels.
+            factor (int, optional): Reduction factor between levels.
+            capacity (int, optional): Initial capacity (samples).
+
+        Raises:
+            ValueError: If the number of channels or the factor are not
+                valid.
+    """
+
+    def __init__(self, n_ch, factor=4, capacity=4096):
+        if n_ch < 1:
+            raise ValueError('Invalid number of channels')
+
+        if factor < 2:
+            raise ValueError('Invalid reduction factor')
+
+        self._n_ch = n_ch
+        self._factor = factor
+        self._capacity = max(int(capacity), factor)
+
+        self.reset()
+
+    def reset(self):
+        """ Drop all the stored samples. """
+
+        self._t = np.empty(self._capacity, dtype=np.float64)
+        self._d = np.empty((self._n_ch, self._capacity), dtype=np.float64)
+        self._cnt = [0]
+        self._levels = [None]
+
+    def _grow(self, arr, size):
+        """ Grow an array (along its last axis) to hold at least size. """
+
+        cap = arr.shape[-1]
+        if size <= cap:
+            return arr
+
+        while cap < size:
+            cap *= 2
+
+        new = np.empty(arr.shape[:-1] + (cap, ), dtype=arr.dtype)
+        new[..., :arr.shape[-1]] = arr
+
+        return new
+
+    def _level(self, level):
+        """ Obtain the (min, max, sum) arrays of a level. """
+
+        if level == 0:
+            return self._d, self._d, self._d
+
+        return self._levels[level]
+
+    def _fold(self):
+        """ Fold all complete groups of each level into the next one. """
+
+        f = self._factor
+        level = 0
+
+        while self._cnt[level] // f > (self._cnt[level + 1]
+                                       if level + 1 < len(self._cnt) else 0):
+            if level + 1 == len(self._cnt):
+                shape = (self._n_ch, max(self._capacity // f, 1))
+                self._cnt.append(0)
+                self._levels.append((np.empty(shape), np.empty(shape),
+                                     np.empty(shape)))
+
+            mn, mx, sm = self._level(level)
+            lo = self._cnt[level + 1]
+            hi = self._cnt[level] // f
+
+            blk = (self._n_ch, hi - lo, f)
+            mn = mn[:, lo * f:hi * f].reshape(blk).min(axis=2)
+            mx = mx[:, lo * f:hi * f].reshape(blk).max(axis=2)
+            sm = sm[:, lo * f:hi * f].reshape(blk).sum(axis=2)
+
+            dst = [self._grow(arr, hi) for arr in self._levels[level + 1]]
+            dst[0][:, lo:hi] = mn
+            dst[1][:, lo:hi] = mx
+            dst[2][:, lo:hi] = sm
+
+            self._levels[level + 1] = tuple(dst)
+            self._cnt[level + 1] = hi
+
+            level += 1
+
+    def push(self, t, d):
+        """ Append a block of samples.
+
+            Args:
+                t (list, array): Time vector.
+                d (list): Data vectors, one per channel. Disabled channels
+                    (None) are stored as NaN.
+        """
+
+        t = np.asarray(t, dtype=np.float64)
+        n = len(t)
+        if not n:
+            return
+
+        if len(d) != self._n_ch:
+            raise ValueError('Unexpected number of channels')
+
+        lo = self._cnt[0]
+        hi = lo + n
+
+        self._t = self._grow(self._t, hi)
+        self._d = self._grow(self._d, hi)
+
+        self._t[lo:hi] = t
+        for ch, data in enumerate(d):
+            self._d[ch, lo:hi] = data if data is not None else np.nan
+
+        self._cnt[0] = hi
+        self._fold()
+
+    def _reduce(self, lo, hi):
+        """ Reduce the sample range [lo, hi) to (min, max, sum) per channel.
+
+            The range is decomposed in at most ``factor`` bins per level on
+            each side, as in a segment tree.
+        """
+
+        f = self._factor
+        parts = []
+        level = 0
+        unit = 1
+
+        while lo < hi:
+            nxt = unit * f
+            if level + 1 < len(self._cnt):
+                a = min(-(-lo // nxt) * nxt, hi)
+                b = max(min(hi // nxt, self._cnt[level + 1]) * nxt, a)
+                if a < b:
+                    parts.append((level, lo // unit, a // unit))
+                    parts.append((level, b // unit, hi // unit))
+                    lo, hi = a, b
+                    level += 1
+                    unit = nxt
+                    continue
+
+            parts.append((level, lo // unit, hi // unit))
+            break
+
+        mn = np.full(self._n_ch, np.inf)
+        mx = np.full(self._n_ch, -np.inf)
+        sm = np.zeros(self._n_ch)
+        for level, a, b in parts:
+            if a < b:
+                l_mn, l_mx, l_sm = self._level(level)
+                mn = np.minimum(mn, l_mn[:, a:b].min(axis=1))
+                mx = np.maximum(mx, l_mx[:, a:b].max(axis=1))
+                sm += l_sm[:, a:b].sum(axis=1)
+
+        return mn, mx, sm
+
+    def window_idx(self, start, stop, n):
+        """ Obtain a decimated window given by sample indexes.
+
+            Bucket edges are aligned to the grid of the pyramid level used to
+            answer the query, so the first bucket may start up to one bucket
+            before ``start``.
+
+            Args:
+                start (int): First sample index (included).
+                stop (int): Last sample index (excluded).
+                n (int): Maximum number of buckets.
+
+            Returns:
+                tuple (array, array, array, array): Bucket start time, and
+                    minimum, maximum and mean per channel and bucket.
+        """
+
+        if n < 1:
+            raise ValueError('Invalid number of buckets')
+
+        start = max(int(start), 0)
+        stop = min(int(stop), self._cnt[0])
+        if stop <= start:
+            empty = np.empty((self._n_ch, 0))
+            return np.empty(0), empty, empty, empty
+
+        f = self._factor
+        w = stop - start
+
+        # highest level still providing at least n bins for the window
+        level = 0
+        unit = 1
+        while (level + 1 < len(self._cnt) and w // (unit * f) >= n):
+            level += 1
+            unit *= f
+
+        lo = start // unit
+        # only whole bins before stop, the partial tail is reduced apart
+        hi = min(stop // unit, self._cnt[level])
+        k = max(1, -(-(hi - lo) // max(n - 1, 1)))
+        n_full = (hi - lo) // k if n > 1 else 0
+
+        blk = (self._n_ch, n_full, k)
+        l_mn, l_mx, l_sm = self._level(level)
+        mn = l_mn[:, lo:lo + n_full * k].reshape(blk).min(axis=2)
+        mx = l_mx[:, lo:lo + n_full * k].reshape(blk).max(axis=2)
+        mean = l_sm[:, lo:lo + n_full * k].reshape(blk).sum(axis=2)
+        mean /= k * unit
+
+        t_idx = (lo + np.arange(n_full) * k) * unit
+
+        # remaining bins and incomplete tail in a last bucket
+        tail = (lo + n_full * k) * unit
+        if tail < stop:
+            r_mn, r_mx, r_sm = self._reduce(tail, stop)
+            mn = np.hstack((mn, r_mn[:, None]))
+            mx = np.hstack((mx, r_mx[:, None]))
+            mean = np.hstack((mean, r_sm[:, None] / (stop - tail)))
+            t_idx = np.append(t_idx, tail)
+
+        return self._t[t_idx], mn, mx, mean
+
+    def window(self, t_start, t_stop, n):
+        """ Obtain a decimated window given by time.
+
+            Args:
+                t_start (float): Window start time.
+                t_stop (float): Window stop time.
+                n (int): Maximum number of buckets.
+
+            Returns:
+                tuple (array, array, array, array): See ``window_idx``.
+        """
+
+        t = self._t[:self._cnt[0]]
+        start = np.searchsorted(t, t_start, side='left')
+        stop = np.searchsorted(t, t_stop, side='right')
+
+        return self.window_idx(start, stop, n)
+
+    def last(self, n_samples, n):
+        """ Obtain a decimated window with the latest samples.
+
+            Args:
+                n_samples (int): Number of samples of the window.
+                n (int): Maximum number of buckets.
+
+            Returns:
+                tuple (array, array, array, array): See ``window_idx``.
+        """
+
+        return self.window_idx(self._cnt[0] - n_samples, self._cnt[0], n)
+
+    def trim(self, n_samples):
+        """ Keep only the latest samples, dropping the older ones.
+
+            The pyramid is rebuilt from the kept samples, so trimming costs
+            as much as pushing them again.
+
+            Args:
+                n_samples (int): Number of samples to keep.
+        """
+
+        cnt = self._cnt[0]
+        if cnt <= n_samples:
+            return
+
+        lo = cnt - max(int(n_samples), 0)
+        t = self._t[lo:cnt].copy()
+        d = self._d[:, lo:cnt].copy()
+
+        self.reset()
+        self.push(t, d)
+
+    @property
+    def n_ch(self):
+        """ int: Number of channels. """
+        return self._n_ch
+
+    @property
+    def samples(self):
+        """ int: Number of stored samples. """
+        return self._cnt[0]
+
+    @property
+    def levels(self):
+        """ int: Number of pyramid levels (including raw samples). """
+        return len(self._cnt)
@@ -167,6 +167,7 @@ class Dictionary(object):
             rdict = RegistersDictionary(self._dict, subnode)
             self._rdicts.append(rdict)
         self._cats = Categories(self._dict)
+        self._catalog = None
 
     @classmethod
     def _from_dict(cls, dict_):
@@ -183,6 +184,7 @@ class Dictionary(object):
             rdict = RegistersDictionary(inst._dict, subnode)
             inst._rdicts.append(rdict)
         inst._cats = Categories(inst._dict)
+        inst._catalog = None
 
         return inst
 
@@ -243,6 +245,9 @@ class Dictionary(object):
         r = lib.il_dict_reg_storage_update(cstr(id_), value_)
         raise_err(r)
 
+        if self._catalog is not None:
+            self._catalog.update_storage(reg, True)
+
     @property
     def cats(self):
         """Categories: Categories."""
@@ -257,3 +262,14 @@ class Dictionary(object):
     def subnodes(self):
         """Subnodes: Subnodes."""
         return self._subnodes
+
+    @property
+    def catalog(self):
+        """RegisterCatalog: Columnar register catalog (built on first use)."""
+        if self._catalog is None:
+            # NumPy is only required by the catalog, import it on use
+            from .catalog import RegisterCatalog
+
+            self._catalog = RegisterCatalog(self)
+
+        return self._catalog
@@ -0,0 +1,249 @@
+import threading
+from concurrent.futures import ThreadPoolExecutor, as_completed
+
+from .net import Network, NET_PROT, NET_DEV_EVT, devices
+from .servo import servo_is_connected
+
+import logging
+
+log = logging.getLogger(__name__)
+
+
+ETH_SERVO_ID = 1
+""" int: Servo id reported for an Ethernet address that answers. Probing
+    does not connect to the drive, so its id is not read: an address is
+    reached as a single servo, as done by `lucky`.
+"""
+
+
+class NetworkPool(object):
+    """ Network pool.
+
+        Keeps one network per (protocol, port), so that scanning a port
+        again, or using it once found, does not open it again.
+    """
+
+    def __init__(self):
+        self.__nets = {}
+        self.__lock = threading.Lock()
+
+    def get(self, prot, port, **kwargs):
+        """ Obtain the network of a port, created if needed.
+
+            Args:
+                prot (NET_PROT): Protocol.
+                port (str): Network device port.
+                **kwargs: Network creation arguments.
+
+            Returns:
+                Network: Network.
+        """
+
+        with self.__lock:
+            net = self.__nets.get((prot, port))
+            if net is None:
+                net = Network(prot, port, **kwargs)
+                self.__nets[(prot, port)] = net
+
+            return net
+
+    def release(self, prot, port):
+        """ Disconnect and remove the network of a port.
+
+            Args:
+                prot (NET_PROT): Protocol.
+                port (str): Network device port.
+        """
+
+        with self.__lock:
+            net = self.__nets.pop((prot, port), None)
+
+        if net is not None:
+            try:
+                net.disconnect()
+            except Exception as e:
+                log.warning(e)
+
+    def close(self):
+        """ Release all the networks. """
+
+        for prot, port in self.keys():
+            self.release(prot, port)
+
+    def keys(self):
+        """ list: (protocol, port) of the pooled networks. """
+
+        with self.__lock:
+            return list(self.__nets)
+
+    def __contains__(self, key):
+        return key in self.__nets
+
+
+class DiscoveryService(object):
+    """ Device discovery service.
+
+        Scans the ports of the given protocols, and the given IP addresses,
+        probing them in parallel with a bounded number of workers. Found
+        devices are reported incrementally through a callback: an ADDED
+        event as soon as a port answers with servos (or a new servo
+        appears), and a REMOVED event when a port, or a servo, disappears.
+        Networks are kept in a `NetworkPool`.
+
+        IP addresses are probed on every scan without using the pool, so an
+        address that stops answering is reported as REMOVED. Addresses
+        that answer are reported with a single servo, `ETH_SERVO_ID`.
+
+        Args:
+            protocols (list, optional): Protocols of the ports to scan.
+            addresses (list, optional): IP addresses to probe.
+            port_ip (int, optional): IP port.
+            protocol (int, optional): IP transport protocol (1: TCP, 2: UDP).
+            workers (int, optional): Maximum concurrent probes.
+            on_evt (callback, optional): Event callback, receiving the event
+                (NET_DEV_EVT), protocol, port and servo ids.
+            pool (NetworkPool, optional): Network pool, a new one if not
+                given.
+            rescan (bool, optional): Probe again the ports with servos
+                found. Otherwise they are only removed when the port
+                disappears, so networks in use are not disturbed. IP
+                addresses are always probed again.
+    """
+
+    def __init__(self, protocols=(NET_PROT.MCB, ), addresses=(),
+                 port_ip=1061, protocol=1, workers=4, on_evt=None,
+                 pool=None, rescan=False):
+        self.__protocols = list(protocols)
+        self.__addresses = list(addresses)
+        self.__port_ip = port_ip
+        self.__protocol = protocol
+        self.__workers = workers
+        self.__on_evt = on_evt
+        self.__pool = pool if pool is not None else NetworkPool()
+        self.__rescan = rescan
+
+        self.__found = {}
+        self.__lock = threading.Lock()
+        self.__thread = None
+        self.__stop = threading.Event()
+
+    @property
+    def pool(self):
+        """ NetworkPool: Network pool. """
+        return self.__pool
+
+    @property
+    def found(self):
+        """ dict: Servo ids found per (protocol, port). """
+
+        with self.__lock:
+            return {key: list(ids) for key, ids in self.__found.items()}
+
+    def __candidates(self):
+        candidates = []
+        for prot in self.__protocols:
+            try:
+                candidates.extend((prot, port) for port in devices(prot))
+            except Exception as e:
+                log.warning(e)
+        candidates.extend((NET_PROT.ETH, address)
+                          for address in self.__addresses)
+
+        return candidates
+
+    def __probe(self, prot, port):
+        """ Obtain the servos of a port, empty if none answers. """
+
+        try:
+            if prot == NET_PROT.ETH:
+                if servo_is_connected(port, self.__port_ip,
+                                      self.__protocol) > 0:
+                    return [ETH_SERVO_ID]
+                return []
+
+            return self.__pool.get(prot, port).servos()
+        except Exception as e:
+            log.debug(e)
+            return []
+
+    def __update(self, key, ids):
+        with self.__lock:
+            previous = self.__found.get(key, [])
+            if ids:
+                self.__found[key] = ids
+            else:
+                self.__found.pop(key, None)
+
+        added = [i for i in ids if i not in previous]
+        removed = [i for i in previous if i not in ids]
+
+        if removed:
+            self.__notify(NET_DEV_EVT.REMOVED, key, removed)
+        if added:
+            self.__notify(NET_DEV_EVT.ADDED, key, added)
+
+        if not ids and key[0] != NET_PROT.ETH:
+            self.__pool.release(*key)
+
+    def __notify(self, evt, key, ids):
+        if self.__on_evt is not None:
+            try:
+                self.__on_evt(evt, key[0], key[1], ids)
+            except Exception as e:
+                log.error(e)
+
+    def scan(self):
+        """ Scan all the ports once.
+
+            Returns:
+                dict: Servo ids found per (protocol, port).
+        """
+
+        candidates = self.__candidates()
+        found = self.found
+        # IP addresses never disappear from the candidates, and probing
+        # them does not use the pooled networks
+        probe = [key for key in candidates
+                 if self.__rescan or key[0] == NET_PROT.ETH
+                 or key not in found]
+
+        with ThreadPoolExecutor(max_workers=self.__workers) as executor:
+            futures = {executor.submit(self.__probe, *key): key
+                       for key in probe}
+            for future in as_completed(futures):
+                self.__update(futures[future], future.result())
+
+        # ports no longer listed
+        for key in set(found) - set(candidates):
+            self.__update(key, [])
+
+        return self.found
+
+    def start(self, period=1.):
+        """ Scan periodically from a background thread.
+
+            Args:
+                period (int, float, optional): Scan period (s).
+        """
+
+        if self.__thread is not None:
+            raise RuntimeError('Discovery already started')
+
+        def run():
+            while True:
+                self.scan()
+                if self.__stop.wait(period):
+                    break
+
+        self.__stop.clear()
+        self.__thread = threading.Thread(target=run)
+        self.__thread.daemon = True
+        self.__thread.start()
+
+    def stop(self):
+        """ Stop scanning. """
+
+        self.__stop.set()
+        if self.__thread is not None:
+            self.__thread.join()
+            self.__thread = None
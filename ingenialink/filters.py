@@ -0,0 +1,330 @@
+import math
+
+import numpy as np
+
+
+class Boxcar(object):
+    """ Boxcar average decimator: one mean per group of samples.
+
+        Args:
+            factor (int): Decimation factor.
+
+        Raises:
+            ValueError: If the factor is not valid (not an integer, or less
+                than the outputs per group).
+    """
+
+    outputs = 1
+    """ int: Output samples per group. """
+
+    def __init__(self, factor):
+        # every group must hold at least one sample per output
+        if int(factor) != factor or factor < max(self.outputs, 1):
+            raise ValueError('Invalid decimation factor')
+
+        self.factor = int(factor)
+
+    def reset(self):
+        """ Reset the filter state. """
+        pass
+
+    def process(self, x):
+        """ Filter and decimate whole groups of samples.
+
+            Args:
+                x (array): Samples (a multiple of the factor).
+
+            Returns:
+                array: Output samples.
+        """
+
+        return x.reshape(-1, self.factor).mean(axis=1)
+
+
+class MinMax(Boxcar):
+    """ Min/max preserving decimator: the minimum and maximum of every group
+        of samples, in order of occurrence, so peaks are never lost.
+
+        Args:
+            factor (int): Decimation factor.
+
+        Raises:
+            ValueError: If the factor is not valid.
+    """
+
+    outputs = 2
+    """ int: Output samples per group. """
+
+    def process(self, x):
+        g = x.reshape(-1, self.factor)
+        i_min = g.argmin(axis=1)
+        i_max = g.argmax(axis=1)
+        rows = np.arange(len(g))
+
+        mn = g[rows, i_min]
+        mx = g[rows, i_max]
+        first = i_min <= i_max
+
+        y = np.empty((len(g), 2))
+        y[:, 0] = np.where(first, mn, mx)
+        y[:, 1] = np.where(first, mx, mn)
+
+        return y.ravel()
+
+
+class CIC(Boxcar):
+    """ CIC-style integer decimator.
+
+        Equivalent to ``order`` cascaded moving averages of ``factor``
+        samples followed by decimation (unity gain). It is evaluated as a
+        single FIR convolution carrying the history between blocks, which,
+        unlike integrator/comb arithmetic, does not accumulate rounding
+        errors with floating point samples.
+
+        Args:
+            factor (int): Decimation factor.
+            order (int, optional): Number of stages.
+
+        Raises:
+            ValueError: If the factor or the order are not valid.
+    """
+
+    def __init__(self, factor, order=3):
+        super(CIC, self).__init__(factor)
+
+        if int(order) != order or order < 1:
+            raise ValueError('Invalid CIC order')
+
+        self.order = int(order)
+
+        kernel = np.ones(1)
+        for _ in range(self.order):
+            kernel = np.convolve(kernel, np.ones(self.factor))
+        self._kernel = kernel / kernel.sum()
+
+        self.reset()
+
+    def reset(self):
+        self._hist = np.zeros(len(self._kernel) - 1)
+
+    def process(self, x):
+        full = np.concatenate((self._hist, x))
+        y = np.convolve(full, self._kernel, mode='valid')
+        self._hist = full[len(full) - len(self._hist):]
+
+        return y[self.factor - 1::self.factor]
+
+
+class LowPass(Boxcar):
+    """ First-order low-pass filter, optionally decimated (the last filtered
+        sample of every group is kept).
+
+        y[n] = y[n - 1] + alpha * (x[n] - y[n - 1])
+
+        Args:
+            alpha (float, optional): Smoothing factor (0, 1].
+            fc (float, optional): Cut-off frequency (Hz), instead of alpha.
+            fs (float, optional): Sampling frequency (Hz), required with fc.
+            factor (int, optional): Decimation factor.
+
+        Raises:
+            ValueError: If the parameters are not valid.
+    """
+
+    _CHUNK_RANGE = 30.
+    """ float: Maximum exponent of the decay weights within a chunk. """
+
+    def __init__(self, alpha=None, fc=None, fs=None, factor=1):
+        super(LowPass, self).__init__(factor)
+
+        if alpha is None:
+            if fc is None or not fs:
+                raise ValueError('Either alpha or fc and fs are required')
+            alpha = 1. - math.exp(-2. * math.pi * fc / fs)
+
+        if not 0. < alpha <= 1.:
+            raise ValueError('Invalid smoothing factor')
+
+        self.alpha = alpha
+
+        # weights decay as (1 - alpha)^n, evaluated in chunks short enough
+        # for them to stay in range
+        decay = -math.log(1. - alpha) if alpha < 1. else math.inf
+        self._chunk = max(1, int(self._CHUNK_RANGE / decay))
+
+        self.reset()
+
+    def reset(self):
+        self._y = None
+
+    def process(self, x):
+        if not len(x):
+            return x
+
+        if self._y is None:
+            self._y = x[0]
+
+        a = self.alpha
+        b = 1. - a
+        y = np.empty(len(x))
+        for lo in range(0, len(x), self._chunk):
+            xc = x[lo:lo + self._chunk]
+            if b == 0.:
+                y[lo:lo + len(xc)] = xc
+            else:
+                n = np.arange(len(xc))
+                w = b ** -n
+                y[lo:lo + len(xc)] = b ** (n + 1) * (
+                    self._y + a * np.cumsum(xc * w) / b)
+            self._y = y[lo + len(xc) - 1]
+
+        return y[self.factor - 1::self.factor]
+
+
+class FilterStage(object):
+    """ Acquisition decimation and filtering stage.
+
+        Applies a filter (`Boxcar`, `MinMax`, `CIC`, `LowPass`) to every
+        channel of the acquisition blocks, so that buffers, recorders and
+        aggregators downstream receive the output rate rather than the
+        sampling rate. Incomplete groups are kept until the next block.
+        Output samples are timestamped with the last sample of their group
+        (or group half, for `MinMax`). Groups with missing (NaN) samples
+        give NaN outputs and are not fed to the filter, so that its state is
+        kept; disabled channels are not filtered.
+
+        The stage can be used as a source, wrapping another one (e.g.
+        ``recorder.attach(FilterStage(filters, source=poller), period)``),
+        or as a sink, forwarding blocks pushed to it.
+
+        Args:
+            filters (list): Filter of every channel, all with the same
+                factor and outputs per group.
+            source (optional): Object with a `data` property returning a
+                (time, data, ...) tuple, as `Poller` or `Monitor`.
+            sink (optional): Object with a `push(t, d)` method, as
+                `Recorder`, `Decimator` or `StreamStats`.
+
+        Raises:
+            ValueError: If the filters are not compatible.
+    """
+
+    def __init__(self, filters, source=None, sink=None):
+        if not filters:
+            raise ValueError('No filters given')
+
+        rates = set((f.factor, f.outputs) for f in filters)
+        if len(rates) != 1:
+            raise ValueError('Filters with different output rates')
+
+        self._filters = list(filters)
+        self._factor, self._outputs = rates.pop()
+        self._source = source
+        self._sink = sink
+
+        # output offsets within a group
+        k = self._factor
+        self._offsets = np.array([(j + 1) * k // self._outputs - 1
+                                  for j in range(self._outputs)])
+
+        self.reset()
+
+    def reset(self):
+        """ Drop the pending samples and reset the filters. """
+
+        self._t = np.empty(0)
+        self._d = [np.empty(0) for _ in self._filters]
+        for f in self._filters:
+            f.reset()
+
+    @property
+    def factor(self):
+        """ int: Decimation factor. """
+        return self._factor
+
+    @property
+    def outputs(self):
+        """ int: Output samples per group. """
+        return self._outputs
+
+    def process(self, t, d):
+        """ Filter and decimate an acquisition block.
+
+            Args:
+                t (list, array): Time vector.
+                d (list): Data vectors, one per channel (None if disabled).
+
+            Returns:
+                tuple (array, list): Output time vector and data vectors.
+
+            Raises:
+                ValueError: If the number of channels is not valid.
+        """
+
+        if len(d) != len(self._filters):
+            raise ValueError('Unexpected number of channels')
+
+        t = np.concatenate((self._t, np.asarray(t, dtype=np.float64)))
+        n = len(t) // self._factor * self._factor
+
+        groups = np.arange(0, n, self._factor)
+        t_out = t[(groups[:, None] + self._offsets).ravel()]
+        self._t = t[n:]
+
+        d_out = []
+        for ch, data in enumerate(d):
+            if data is None:
+                # kept aligned, missing if the channel is enabled again
+                x = np.full(len(t) - len(self._d[ch]), np.nan)
+            else:
+                x = np.asarray(data, dtype=np.float64)
+            x = np.concatenate((self._d[ch], x))
+            self._d[ch] = x[n:]
+
+            if data is None:
+                d_out.append(None)
+            else:
+                d_out.append(self._filter(ch, x[:n]))
+
+        return t_out, d_out
+
+    def _filter(self, ch, x):
+        """ Filter whole groups of a channel, skipping groups with NaN. """
+
+        if not len(x):
+            return x
+
+        g = x.reshape(-1, self._factor)
+        missing = np.isnan(g).any(axis=1)
+        if not missing.any():
+            return self._filters[ch].process(x)
+
+        y = np.full((len(g), self._outputs), np.nan)
+        if not missing.all():
+            y[~missing] = self._filters[ch].process(
+                g[~missing].ravel()).reshape(-1, self._outputs)
+
+        return y.ravel()
+
+    def push(self, t, d):
+        """ Filter an acquisition block and forward it to the sink.
+
+            Args:
+                t (list, array): Time vector.
+                d (list): Data vectors, one per channel.
+        """
+
+        t, d = self.process(t, d)
+        if len(t) and self._sink is not None:
+            self._sink.push(t, d)
+
+    @property
+    def data(self):
+        """ tuple: Filtered data of the source, as returned by it (time
+            vector, data vectors and any other fields).
+        """
+
+        data = self._source.data
+        t, d = self.process(data[0], data[1])
+
+        return (t, d) + tuple(data[2:])
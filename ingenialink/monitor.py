@@ -2,7 +2,8 @@ from enum import Enum
 
 from ._ingenialink import ffi, lib
 from ._utils import raise_null, raise_err, to_ms
-from .registers import _get_reg_id
+from .registers import _get_reg_id, _units_reg
+from .timebase import Timebase
 
 
 class MONITOR_TRIGGER(Enum):
@@ -38,14 +39,31 @@ class Monitor(object):
 
         self._monitor = ffi.gc(monitor, lib.il_monitor_destroy)
 
+        self._servo = servo
         self._acq = ffi.new('il_monitor_acq_t **')
+        self._timebase = None
+        self._units = {}
 
-    def start(self):
-        """ Start the monitor. """
+    def start(self, anchor=False):
+        """ Start the monitor.
 
+            The acquisition time vector is relative to the start, use
+            `timebase` to convert it to monotonic timestamps.
+
+            Args:
+                anchor (bool, optional): Anchor the timebase to the
+                    wall-clock time.
+        """
+
+        self._timebase = Timebase(anchor)
         r = lib.il_monitor_start(self._monitor)
         raise_err(r)
 
+    @property
+    def timebase(self):
+        """ Timebase: Timebase of the last acquisition. """
+        return self._timebase
+
     def stop(self):
         """ Stop the monitor. """
 
@@ -64,7 +82,9 @@ class Monitor(object):
 
     @property
     def data(self):
-        """ tuple: Current acquisition time and data for all channels. """
+        """ tuple: Current acquisition time and data for all channels.
+            Channels configured with units are converted to the servo units.
+        """
 
         lib.il_monitor_data_get(self._monitor, self._acq)
         acq = ffi.cast('il_monitor_acq_t *', self._acq[0])
@@ -73,10 +93,13 @@ class Monitor(object):
 
         d = []
         for ch in range(lib.IL_MONITOR_CH_NUM):
-            if acq.d[ch] != ffi.NULL:
-                d.append(list(acq.d[ch][0:acq.cnt]))
-            else:
+            if acq.d[ch] == ffi.NULL:
                 d.append(None)
+            elif ch in self._units:
+                d.append(self._servo.units_convert(
+                    self._units[ch], acq.d[ch][0:acq.cnt]).tolist())
+            else:
+                d.append(list(acq.d[ch][0:acq.cnt]))
 
         return t, d
 
@@ -93,30 +116,41 @@ class Monitor(object):
                                      delay_samples, max_samples)
         raise_err(r)
 
-    def ch_configure(self, ch, reg):
+    def ch_configure(self, ch, reg, units=False):
         """ Configure a channel mapping.
 
             Args:
                 ch (int): Channel.
                 reg (str, Register): Register to be mapped to the channel.
+                units (bool, optional): Convert the channel data to the servo
+                    units.
         """
 
         _reg, _id = _get_reg_id(reg)
         r = lib.il_monitor_ch_configure(self._monitor, ch, _reg, _id)
         raise_err(r)
 
+        if units:
+            self._units[ch] = _units_reg(self._servo, reg)
+        else:
+            self._units.pop(ch, None)
+
     def ch_disable(self, ch):
         """ Disable a channel. """
 
         r = lib.il_monitor_ch_disable(self._monitor, ch)
         raise_err(r)
 
+        self._units.pop(ch, None)
+
     def ch_disable_all(self):
         """ Disable all channels. """
 
         r = lib.il_monitor_ch_disable_all(self._monitor)
         raise_err(r)
 
+        self._units.clear()
+
     def trigger_configure(self, mode, delay_samples=0, source=None, th_pos=0.,
                           th_neg=0., din_msk=0):
         """ Configure the trigger.
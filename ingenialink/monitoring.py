@@ -0,0 +1,491 @@
+import queue
+import threading
+from collections import namedtuple
+
+import numpy as np
+
+from .registers import Register, REG_DTYPE
+from .exceptions import ILValueError
+from .timebase import now_ns
+
+import logging
+
+log = logging.getLogger(__name__)
+
+
+MONITORING_DTYPES = {REG_DTYPE.U8: '<u1',
+                     REG_DTYPE.S8: '<i1',
+                     REG_DTYPE.U16: '<u2',
+                     REG_DTYPE.S16: '<i2',
+                     REG_DTYPE.U32: '<u4',
+                     REG_DTYPE.S32: '<i4',
+                     REG_DTYPE.U64: '<u8',
+                     REG_DTYPE.S64: '<i8',
+                     REG_DTYPE.FLOAT: '<f4'}
+""" dict: Sample format of each register data type in a monitoring block. """
+
+MonitoringBlock = namedtuple('MonitoringBlock', ['t_ns', 'seq', 'data'])
+""" namedtuple: Decoded monitoring data: monotonic read time (ns), sequence
+    number and samples (structured array, one ``ch<n>`` field per channel).
+"""
+
+
+def mapping_dtype(mapping):
+    """ Obtain the monitoring block sample format of a channel mapping.
+
+        Channel samples are interleaved in channel order, packed, as
+        little-endian values.
+
+        Args:
+            mapping (dict): Data type (REG_DTYPE) of each channel, or
+                (address, REG_DTYPE) as given by
+                `Network.monitoring_mapping`.
+
+        Returns:
+            numpy.dtype: Structured data type, one field (``ch<n>``) per
+                channel.
+
+        Raises:
+            ILValueError: If a data type can not be monitored.
+    """
+
+    fields = []
+    for channel in sorted(mapping):
+        dtype = mapping[channel]
+        if isinstance(dtype, tuple):
+            dtype = dtype[1]
+        if not isinstance(dtype, REG_DTYPE):
+            dtype = REG_DTYPE(dtype)
+
+        if dtype not in MONITORING_DTYPES:
+            raise ILValueError(
+                'Unsupported monitoring data type: {}'.format(dtype.name))
+
+        fields.append(('ch{}'.format(channel), MONITORING_DTYPES[dtype]))
+
+    return np.dtype(fields)
+
+
+class MonitoringDecoder(object):
+    """ Monitoring block decoder.
+
+        Decodes the raw monitoring data (blocks of interleaved samples of
+        all the mapped channels, possibly of mixed data types) in a single
+        vectorized step, by viewing it as a structured array, and appends
+        the samples to per-channel buffers.
+
+        Args:
+            mapping (dict): Mapped channels, as given by
+                `Network.monitoring_mapping` (see `mapping_dtype`).
+            capacity (int, optional): Initial buffer capacity (samples).
+            bytes_per_block (int, optional): Block size reported by the
+                network (`Network.monitoring_get_bytes_per_block`), checked
+                against the mapping.
+
+        Raises:
+            ILValueError: If the mapping is empty, has unsupported data
+                types or does not match the block size.
+    """
+
+    def __init__(self, mapping, capacity=4096, bytes_per_block=None):
+        if not mapping:
+            raise ILValueError('No monitoring channels mapped')
+
+        self._mapping = dict(mapping)
+        self._dtype = mapping_dtype(self._mapping)
+        if (bytes_per_block is not None and
+                int(bytes_per_block) != self._dtype.itemsize):
+            raise ILValueError(
+                'Monitoring block size mismatch: {} bytes mapped, {} '
+                'reported'.format(self._dtype.itemsize, bytes_per_block))
+        self._channels = sorted(self._mapping)
+        self._capacity = max(int(capacity), 1)
+
+        self.reset()
+
+    def reset(self):
+        """ Drop all the decoded samples. """
+
+        self._cnt = 0
+        self._d = [np.empty(self._capacity, dtype=self._dtype[i])
+                   for i in range(len(self._channels))]
+
+    @property
+    def dtype(self):
+        """ numpy.dtype: Block sample format. """
+        return self._dtype
+
+    @property
+    def channels(self):
+        """ list: Mapped channels, in block order. """
+        return list(self._channels)
+
+    @property
+    def bytes_per_block(self):
+        """ int: Bytes of a block (one sample of every channel). """
+        return self._dtype.itemsize
+
+    def decode(self, raw):
+        """ Decode raw monitoring data.
+
+            Trailing bytes not forming a whole block are ignored.
+
+            Args:
+                raw (bytes, bytearray, memoryview): Raw monitoring data.
+
+            Returns:
+                numpy.ndarray: Structured array (a view of the raw data),
+                    one record per block.
+        """
+
+        n = len(raw) // self._dtype.itemsize
+
+        return np.frombuffer(raw, dtype=self._dtype, count=n)
+
+    def append(self, raw):
+        """ Decode raw monitoring data and append it to the channel buffers.
+
+            Args:
+                raw (bytes, bytearray, memoryview): Raw monitoring data.
+
+            Returns:
+                int: Number of samples appended.
+        """
+
+        blocks = self.decode(raw)
+        n = len(blocks)
+        if not n:
+            return 0
+
+        size = self._cnt + n
+        if size > len(self._d[0]):
+            cap = len(self._d[0])
+            while cap < size:
+                cap *= 2
+
+            for i, d in enumerate(self._d):
+                new = np.empty(cap, dtype=d.dtype)
+                new[:self._cnt] = d[:self._cnt]
+                self._d[i] = new
+
+        for i, name in enumerate(self._dtype.names):
+            self._d[i][self._cnt:size] = blocks[name]
+
+        self._cnt = size
+
+        return n
+
+    def read(self, net):
+        """ Read the monitoring data of a network and decode it.
+
+            Args:
+                net (Network): Network.
+
+            Returns:
+                int: Number of samples appended.
+        """
+
+        net.monitoring_read_data()
+
+        return self.append(net.monitoring_raw_data)
+
+    def __len__(self):
+        return self._cnt
+
+    @property
+    def data(self):
+        """ list: Samples of each channel (views of the buffers). """
+        return [d[:self._cnt] for d in self._d]
+
+    def channel_data(self, channel):
+        """ Obtain the samples of a channel.
+
+            Args:
+                channel (int): Channel.
+
+            Returns:
+                numpy.ndarray: Samples (view of the buffer).
+        """
+
+        return self._d[self._channels.index(channel)][:self._cnt]
+
+
+class MonitoringSession(object):
+    """ Continuous monitoring acquisition.
+
+        Configures the monitoring (start/end of capture, window and mapped
+        channels) and reads it from a background thread. Every read is
+        decoded at once (see `MonitoringDecoder`) and delivered as a
+        `MonitoringBlock`, either to a callback or to a bounded queue. When
+        the queue is full the reader waits for the consumer up to
+        `put_timeout` (backpressure) and then drops the block. Monitoring is
+        always disabled when the session ends, even on errors.
+
+        Args:
+            servo (Servo): Servo.
+            channels (list): Registers (str, Register) to map, one per
+                channel.
+            window (int, optional): Window samples.
+            soc_type (int, optional): Start of capture type.
+            eoc_type (int, optional): End of capture type.
+            trigger_delay (int, optional): Trigger delay samples.
+            repetitions (int, optional): Trigger repetitions.
+            on_block (callback, optional): Block callback, receiving a
+                `MonitoringBlock`. Blocks are queued if not given.
+            queue_sz (int, optional): Block queue size.
+            put_timeout (int, float, optional): Maximum wait for queue space
+                (s).
+            period (int, float, optional): Polling period while no data is
+                available (s).
+            subnode (int, optional): Subnode of the channel registers.
+
+        Raises:
+            ILValueError: If no channels are given.
+    """
+
+    def __init__(self, servo, channels, window=1000, soc_type=0, eoc_type=3,
+                 trigger_delay=1, repetitions=1, on_block=None, queue_sz=64,
+                 put_timeout=0.1, period=0.01, subnode=1):
+        if not channels:
+            raise ILValueError('No monitoring channels given')
+
+        self._servo = servo
+        self._net = servo.net
+        self._channels = list(channels)
+        self._config = (('MONITOR_TRIGGER_REPETITIONS', repetitions),
+                        ('MONITOR_SOC_TYPE', soc_type),
+                        ('MONITOR_EOC_TYPE', eoc_type),
+                        ('MONITOR_TRIGGER_DELAY_SAMPLES', trigger_delay),
+                        ('MONITOR_WINDOW_SAMPLES', window))
+        self._on_block = on_block
+        self._sinks = []
+        self._queue = queue.Queue(queue_sz)
+        self._put_timeout = put_timeout
+        self._period = period
+        self._subnode = subnode
+
+        self._decoder = None
+        self._lock = threading.Lock()
+        self._enabled = False
+        self._thread = None
+        self._stop = threading.Event()
+        self._reset_stats()
+
+    def _reset_stats(self):
+        self._blocks = 0
+        self._samples = 0
+        self._bytes = 0
+        self._dropped = 0
+        self._errors = 0
+        self._start_ns = None
+        self._stop_ns = None
+
+    def _reg(self, reg):
+        """ Obtain a channel register. """
+
+        if isinstance(reg, Register):
+            return reg
+
+        _dict = self._servo.dict
+        if not _dict:
+            raise ValueError('No dictionary loaded')
+
+        return _dict.get_regs(self._subnode)[reg]
+
+    def configure(self):
+        """ Configure the monitoring parameters and map the channels. """
+
+        for reg, value in self._config:
+            self._servo.write(reg, value, subnode=self._subnode)
+
+        self._net.monitoring_remove_all_mapped_registers()
+        for channel, reg in enumerate(self._channels):
+            reg = self._reg(reg)
+            self._net.monitoring_set_mapped_register(channel, reg.address,
+                                                     reg.dtype)
+
+        self._decoder = MonitoringDecoder(
+            self._net.monitoring_mapping,
+            bytes_per_block=self._net.monitoring_get_bytes_per_block())
+
+    def _disable(self):
+        """ Disable the monitoring (once). """
+
+        with self._lock:
+            if not self._enabled:
+                return
+            self._enabled = False
+
+        try:
+            self._net.monitoring_disable()
+        except Exception as e:
+            log.error(e)
+
+    def add_sink(self, sink):
+        """ Add a block sink, called with every block read (besides the
+            callback or queue).
+
+            Args:
+                sink (callback): Sink, receiving a `MonitoringBlock`.
+        """
+
+        self._sinks = self._sinks + [sink]
+
+    def remove_sink(self, sink):
+        """ Remove a block sink.
+
+            Args:
+                sink (callback): Sink.
+        """
+
+        self._sinks = [s for s in self._sinks if s != sink]
+
+    def _deliver(self, block):
+        for sink in self._sinks:
+            try:
+                sink(block)
+            except Exception as e:
+                log.error(e)
+
+        if self._on_block is not None:
+            try:
+                self._on_block(block)
+            except Exception as e:
+                log.error(e)
+            return
+
+        try:
+            self._queue.put(block, timeout=self._put_timeout)
+        except queue.Full:
+            self._dropped += 1
+
+    def _run(self):
+        seq = 0
+        try:
+            while not self._stop.is_set():
+                try:
+                    available = self._servo.raw_read('MONITOR_NUMBER_CYCLES',
+                                                     subnode=self._subnode)
+                    if available <= 0:
+                        self._stop.wait(self._period)
+                        continue
+
+                    self._net.monitoring_read_data()
+                    raw = self._net.monitoring_raw_data
+                    t_ns = now_ns()
+                except Exception as e:
+                    log.warning(e)
+                    self._errors += 1
+                    self._stop.wait(self._period)
+                    continue
+
+                data = self._decoder.decode(raw)
+                if not len(data):
+                    self._stop.wait(self._period)
+                    continue
+
+                self._blocks += 1
+                self._samples += len(data)
+                self._bytes += data.nbytes
+                self._deliver(MonitoringBlock(t_ns, seq, data))
+                seq += 1
+        finally:
+            self._disable()
+            self._stop_ns = now_ns()
+
+    def start(self):
+        """ Configure and enable the monitoring, and start reading it.
+
+            Raises:
+                RuntimeError: If the session is already running.
+        """
+
+        if self._thread is not None:
+            raise RuntimeError('Monitoring session already started')
+
+        self.configure()
+
+        self._reset_stats()
+        self._stop.clear()
+        with self._lock:
+            self._enabled = True
+        try:
+            self._net.monitoring_enable()
+        except Exception:
+            self._disable()
+            raise
+
+        self._start_ns = now_ns()
+        self._thread = threading.Thread(target=self._run)
+        self._thread.daemon = True
+        self._thread.start()
+
+    def stop(self):
+        """ Stop reading and disable the monitoring. """
+
+        self._stop.set()
+        if self._thread is not None:
+            self._thread.join()
+            self._thread = None
+
+        self._disable()
+
+    def __enter__(self):
+        self.start()
+        return self
+
+    def __exit__(self, exc_type, exc_value, traceback):
+        self.stop()
+
+    @property
+    def running(self):
+        """ bool: True if the session is reading. """
+        return self._thread is not None and self._thread.is_alive()
+
+    @property
+    def dtype(self):
+        """ numpy.dtype: Block sample format (once configured). """
+        return self._decoder.dtype if self._decoder is not None else None
+
+    def get(self, timeout=None):
+        """ Obtain the next block.
+
+            Args:
+                timeout (int, float, optional): Timeout (s).
+
+            Returns:
+                MonitoringBlock: Block, None on timeout.
+        """
+
+        try:
+            return self._queue.get(timeout=timeout)
+        except queue.Empty:
+            return None
+
+    @property
+    def dropped(self):
+        """ int: Blocks dropped due to a full queue. """
+        return self._dropped
+
+    @property
+    def stats(self):
+        """ dict: Session statistics: blocks, samples and bytes read, blocks
+            dropped, read errors, elapsed time (s) and sustained throughput
+            (samples/s, bytes/s).
+        """
+
+        elapsed = 0.
+        if self._start_ns is not None:
+            end = self._stop_ns if self._stop_ns is not None else now_ns()
+            elapsed = (end - self._start_ns) / 1e9
+
+        return {
+            'blocks': self._blocks,
+            'samples': self._samples,
+            'bytes': self._bytes,
+            'dropped': self._dropped,
+            'errors': self._errors,
+            'elapsed': elapsed,
+            'samples_per_s': self._samples / elapsed if elapsed else 0.,
+            'bytes_per_s': self._bytes / elapsed if elapsed else 0.
+        }
@@ -1,9 +1,7 @@
 from enum import Enum
-from time import sleep
 
 from ._ingenialink import lib, ffi
 from ._utils import cstr, pstr, raise_null, raise_err, to_ms
-import numpy as np
 from .registers import REG_DTYPE
 
 
@@ -160,6 +158,9 @@ class Network(object):
         if not isinstance(prot, NET_PROT):
             raise TypeError('Invalid protocol')
 
+        self._status_mon = None
+        self._mon_mapping = {}
+
         if prot != NET_PROT.ECAT:
 
             port_ = ffi.new('char []', cstr(port))
@@ -180,6 +181,8 @@ class Network(object):
 
         inst = cls.__new__(cls)
         inst._net = ffi.gc(net, lib.il_net_fake_destroy)
+        inst._status_mon = None
+        inst._mon_mapping = {}
 
         return inst
 
@@ -215,10 +218,19 @@ class Network(object):
         return ret_arr
 
     def monitoring_remove_all_mapped_registers(self):
+        self._mon_mapping = {}
         return lib.il_net_remove_all_mapped_registers(self._net)
 
     def monitoring_set_mapped_register(self, channel, reg_idx, dtype):
-        return lib.il_net_set_mapped_register(self._net, channel, reg_idx, dtype)
+        if not isinstance(dtype, REG_DTYPE):
+            dtype = REG_DTYPE(dtype)
+
+        r = lib.il_net_set_mapped_register(self._net, channel, reg_idx,
+                                           dtype.value)
+        if r >= 0:
+            self._mon_mapping[channel] = (reg_idx, dtype)
+
+        return r
 
     def monitoring_get_num_mapped_registers(self):
         return lib.il_net_num_mapped_registers_get(self._net)
@@ -297,6 +309,25 @@ class Network(object):
             ret_arr.append(monitoring_data[i])
         return ret_arr
 
+    @property
+    def monitoring_raw_data(self):
+        """ bytes: Obtain the raw monitoring data (blocks of interleaved
+            channel samples).
+        """
+        size = int(self.monitoring_data_size)
+        if size <= 0:
+            return b''
+
+        monitoring_data = lib.il_net_monitornig_data_get(self._net)
+        return bytes(ffi.buffer(monitoring_data, size))
+
+    @property
+    def monitoring_mapping(self):
+        """ dict: Mapped monitoring registers, (address, REG_DTYPE) per
+            channel.
+        """
+        return dict(self._mon_mapping)
+
     @property
     def monitoring_data_size(self):
         """ int: Obtain monitoring data size """
@@ -313,6 +344,9 @@ class Network(object):
 
     @disturbance_data.setter
     def disturbance_data(self, value):
+        # NumPy is only required here, import it on use
+        import numpy as np
+
         disturbance_arr = value
         disturbance_arr = np.pad(disturbance_arr, (0, int(self.disturbance_data_size / 2) - len(value)), 'constant')
         lib.il_net_disturbance_data_set(self._net, disturbance_arr.tolist())
@@ -374,19 +408,28 @@ class Network(object):
         return found
 
     def net_mon_status(self, on_evt):
+        """ Watch the network status (Ethernet, EtherCAT) until
+            `net_mon_stop` is called.
+
+            Args:
+                on_evt (callback): Callback receiving the NET_DEV_EVT.
+        """
+
+        from .netmon import StatusMonitor
+
         if self.prot == NET_PROT.ETH or self.prot == NET_PROT.ECAT:
-            status = self.status
-            while True:
-                if status != self.status:
-                    if self.status == 0:
-                        on_evt(NET_DEV_EVT.ADDED)
-                    elif self.status == 1:
-                        on_evt(NET_DEV_EVT.REMOVED)
-                    status = self.status
-                sleep(1)
+            self.net_mon_stop()
+            self._status_mon = StatusMonitor(
+                on_evt=lambda event: on_evt(event.evt))
+            self._status_mon.add(self)
+            self._status_mon.start()
 
     def net_mon_stop(self):
-        lib.il_net_mon_stop(self._net)
+        if self._status_mon is not None:
+            self._status_mon.stop()
+            self._status_mon = None
+
+        return lib.il_net_mon_stop(self._net)
 
     def destroy_network(self):
         lib.il_net_destroy(self._net)
@@ -0,0 +1,226 @@
+import heapq
+import queue
+import threading
+from collections import namedtuple
+
+from .net import NetworkMonitor, NET_PROT, NET_DEV_EVT
+from .timebase import now_ns
+
+import logging
+
+log = logging.getLogger(__name__)
+
+
+NetEvent = namedtuple('NetEvent', ['t_ns', 'source', 'evt', 'port'])
+""" namedtuple: Network event: monotonic timestamp (ns), source (network or
+    protocol), event (NET_DEV_EVT) and port (if known).
+"""
+
+_STATUS_EVT = {0: NET_DEV_EVT.ADDED, 1: NET_DEV_EVT.REMOVED}
+""" dict: Device event of each network status. """
+
+
+class StatusMonitor(object):
+    """ Network status monitor.
+
+        Watches any number of networks and device protocols from a single
+        thread, delivering timestamped events through a queue (or a
+        callback). Protocols are watched with the device monitor callbacks
+        (`NetworkMonitor`). Network status (Ethernet, EtherCAT) has no
+        notification, so it is polled with an adaptive period: it starts at
+        `min_period` and doubles, up to `max_period`, while the status does
+        not change.
+
+        Args:
+            on_evt (callback, optional): Event callback, receiving a
+                `NetEvent`. Events are queued if not given.
+            min_period (int, float, optional): Minimum polling period (s).
+            max_period (int, float, optional): Maximum polling period (s).
+            queue_sz (int, optional): Event queue size (oldest events are
+                dropped when full).
+    """
+
+    def __init__(self, on_evt=None, min_period=0.05, max_period=0.2,
+                 queue_sz=256):
+        self.__on_evt = on_evt
+        self.__min_period = min_period
+        self.__max_period = max_period
+        self.__queue = queue.Queue(queue_sz)
+        self.__dropped = 0
+
+        self.__cv = threading.Condition()
+        self.__polled = {}
+        self.__heap = []
+        self.__gen = 0
+        self.__monitors = {}
+        self.__thread = None
+        self.__stop = False
+
+    def add(self, source):
+        """ Watch a network or a device protocol.
+
+            Args:
+                source (Network, NET_PROT): Network (status polled), or
+                    protocol (device monitor callbacks).
+        """
+
+        if isinstance(source, NET_PROT):
+            if source in self.__monitors:
+                return
+
+            mon = NetworkMonitor(source)
+            mon.start(lambda evt, port: self.__emit(source, evt, port))
+            self.__monitors[source] = mon
+            return
+
+        with self.__cv:
+            if id(source) in self.__polled:
+                return
+
+            # scheduled items of a previous registration are discarded
+            self.__gen += 1
+            self.__polled[id(source)] = [source, source.status,
+                                         self.__min_period, self.__gen]
+            heapq.heappush(self.__heap, (now_ns(), id(source), self.__gen))
+            self.__cv.notify()
+
+    def remove(self, source):
+        """ Stop watching a network or a device protocol.
+
+            Args:
+                source (Network, NET_PROT): Network or protocol.
+        """
+
+        if isinstance(source, NET_PROT):
+            mon = self.__monitors.pop(source, None)
+            if mon is not None:
+                mon.stop()
+            return
+
+        with self.__cv:
+            self.__polled.pop(id(source), None)
+
+    def __emit(self, source, evt, port=None):
+        event = NetEvent(now_ns(), source, evt, port)
+
+        if self.__on_evt is not None:
+            try:
+                self.__on_evt(event)
+            except Exception as e:
+                log.error(e)
+            return
+
+        while True:
+            try:
+                self.__queue.put_nowait(event)
+                break
+            except queue.Full:
+                try:
+                    self.__queue.get_nowait()
+                    self.__dropped += 1
+                except queue.Empty:
+                    pass
+
+    def __run(self):
+        while True:
+            with self.__cv:
+                while not self.__stop:
+                    if self.__heap:
+                        wait = (self.__heap[0][0] - now_ns()) / 1e9
+                        if wait <= 0:
+                            break
+                        self.__cv.wait(wait)
+                    else:
+                        self.__cv.wait()
+
+                if self.__stop:
+                    break
+
+                _, key, gen = heapq.heappop(self.__heap)
+                entry = self.__polled.get(key)
+
+            # removed networks are dropped from the schedule
+            if entry is None or entry[3] != gen:
+                continue
+
+            net, last, period, _ = entry
+            try:
+                status = net.status
+            except Exception as e:
+                log.warning(e)
+                status = last
+
+            if status != last:
+                period = self.__min_period
+                if status in _STATUS_EVT:
+                    self.__emit(net, _STATUS_EVT[status])
+            else:
+                period = min(period * 2, self.__max_period)
+
+            with self.__cv:
+                if self.__polled.get(key) is entry:
+                    entry[1:3] = [status, period]
+                    heapq.heappush(self.__heap,
+                                   (now_ns() + int(period * 1e9), key, gen))
+
+    def start(self):
+        """ Start monitoring. """
+
+        if self.__thread is not None:
+            raise RuntimeError('Monitor already started')
+
+        self.__stop = False
+        self.__thread = threading.Thread(target=self.__run)
+        self.__thread.daemon = True
+        self.__thread.start()
+
+    def stop(self):
+        """ Stop monitoring (device monitors included). """
+
+        for prot in list(self.__monitors):
+            self.remove(prot)
+
+        with self.__cv:
+            self.__stop = True
+            self.__cv.notify()
+
+        if self.__thread is not None:
+            self.__thread.join()
+            self.__thread = None
+
+    def wait(self, timeout=None):
+        """ Wait until the monitor is stopped.
+
+            Args:
+                timeout (int, float, optional): Timeout (s).
+
+            Returns:
+                bool: True if stopped, False on timeout.
+        """
+
+        thread = self.__thread
+        if thread is not None:
+            thread.join(timeout)
+            return not thread.is_alive()
+
+        return True
+
+    def get(self, timeout=None):
+        """ Obtain the next event.
+
+            Args:
+                timeout (int, float, optional): Timeout (s).
+
+            Returns:
+                NetEvent: Event, None on timeout.
+        """
+
+        try:
+            return self.__queue.get(timeout=timeout)
+        except queue.Empty:
+            return None
+
+    @property
+    def dropped(self):
+        """ int: Events dropped due to a full queue. """
+        return self.__dropped
@@ -1,6 +1,7 @@
 from ._ingenialink import ffi, lib
 from ._utils import raise_null, raise_err, to_ms
-from .registers import _get_reg_id
+from .registers import _get_reg_id, _units_reg
+from .timebase import Timebase
 
 
 class Poller(object):
@@ -20,15 +21,32 @@ class Poller(object):
 
         self._poller = ffi.gc(poller, lib.il_poller_destroy)
 
+        self._servo = servo
         self._n_ch = n_ch
         self._acq = ffi.new('il_poller_acq_t **')
+        self._timebase = None
+        self._units = {}
 
-    def start(self):
-        """ Start poller. """
+    def start(self, anchor=False):
+        """ Start poller.
 
+            The acquisition time vector is relative to the start, use
+            `timebase` to convert it to monotonic timestamps.
+
+            Args:
+                anchor (bool, optional): Anchor the timebase to the
+                    wall-clock time.
+        """
+
+        self._timebase = Timebase(anchor)
         r = lib.il_poller_start(self._poller)
         raise_err(r)
 
+    @property
+    def timebase(self):
+        """ Timebase: Timebase of the last acquisition. """
+        return self._timebase
+
     def stop(self):
         """ Stop poller. """
 
@@ -37,7 +55,8 @@ class Poller(object):
     @property
     def data(self):
         """ tuple (list, list, bool): Time vector, array of data vectors and a
-            flag indicating if data was lost.
+            flag indicating if data was lost. Channels configured with units
+            are converted to the servo units.
         """
 
         lib.il_poller_data_get(self._poller, self._acq)
@@ -47,10 +66,13 @@ class Poller(object):
 
         d = []
         for ch in range(self._n_ch):
-            if acq.d[ch] != ffi.NULL:
-                d.append(list(acq.d[ch][0:acq.cnt]))
-            else:
+            if acq.d[ch] == ffi.NULL:
                 d.append(None)
+            elif ch in self._units:
+                d.append(self._servo.units_convert(
+                    self._units[ch], acq.d[ch][0:acq.cnt]).tolist())
+            else:
+                d.append(list(acq.d[ch][0:acq.cnt]))
 
         return t, d, bool(acq.lost)
 
@@ -65,12 +87,14 @@ class Poller(object):
         r = lib.il_poller_configure(self._poller, to_ms(t_s), sz)
         raise_err(r)
 
-    def ch_configure(self, ch, reg):
+    def ch_configure(self, ch, reg, units=False):
         """ Configure a poller channel mapping.
 
             Args:
                 ch (int): Channel to be configured.
                 reg (Register): Register to associate to the given channel.
+                units (bool, optional): Convert the channel data to the servo
+                    units.
 
             Raises:
                 TypeError: If the register is not valid.
@@ -80,6 +104,11 @@ class Poller(object):
         r = lib.il_poller_ch_configure(self._poller, ch, _reg, _id)
         raise_err(r)
 
+        if units:
+            self._units[ch] = _units_reg(self._servo, reg)
+        else:
+            self._units.pop(ch, None)
+
     def ch_disable(self, ch):
         """ Disable a channel.
 
@@ -90,8 +119,12 @@ class Poller(object):
         r = lib.il_poller_ch_disable(self._poller, ch)
         raise_err(r)
 
+        self._units.pop(ch, None)
+
     def ch_disable_all(self):
         """ Disable all channels. """
 
         r = lib.il_poller_ch_disable_all(self._poller)
         raise_err(r)
+
+        self._units.clear()
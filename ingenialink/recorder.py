@@ -0,0 +1,420 @@
+import os
+import json
+import time
+import queue
+from threading import Thread, Event
+
+import numpy as np
+
+from .exceptions import ILIOError
+
+
+MANIFEST = 'manifest.json'
+""" str: Recording manifest file name. """
+
+CHUNKS = 'chunks.jsonl'
+""" str: Recording chunks index file name (one JSON record per line,
+    appended on every chunk rotation).
+"""
+
+TIME_COLUMN = 't'
+""" str: Time column name. """
+
+FSYNC_POLICIES = ('never', 'chunk')
+""" tuple: Supported fsync policies. """
+
+_PUT_POLL = 0.1
+""" float: Period (s) to check the writer while waiting for queue space. """
+
+
+def _fsync_file(path):
+    """ Flush a file to disk. """
+
+    fd = os.open(path, os.O_RDONLY)
+    try:
+        os.fsync(fd)
+    finally:
+        os.close(fd)
+
+
+class Recorder(object):
+    """ Continuous capture recorder.
+
+        Acquisition blocks are queued and written from a background thread
+        into chunks of typed columns (one ``.npy`` file per column and
+        chunk), described by a JSON manifest and an index of chunks where
+        a record is appended on every rotation. Chunks are rotated when they
+        reach ``chunk_samples`` samples or span ``chunk_time`` seconds of
+        wall time. Memory is bounded by the queue size and one chunk.
+
+        Args:
+            path (str): Recording directory (created if needed).
+            channels (list): Channel names (unique, 't' is reserved for the
+                time column).
+            dtypes (list, optional): Channel NumPy data types, float64 if not
+                given.
+            chunk_samples (int, optional): Samples per chunk.
+            chunk_time (int, float, optional): Maximum chunk duration (s).
+            fsync (str, optional): 'never' or 'chunk' (flush every chunk and
+                manifest update to disk).
+            queue_sz (int, optional): Maximum number of queued blocks.
+
+        Raises:
+            ValueError: If the parameters are not valid.
+    """
+
+    def __init__(self, path, channels, dtypes=None, chunk_samples=65536,
+                 chunk_time=None, fsync='chunk', queue_sz=64):
+        if dtypes is None:
+            dtypes = [np.float64] * len(channels)
+
+        if len(dtypes) != len(channels):
+            raise ValueError('Channels and data types size mismatch')
+
+        if (TIME_COLUMN in channels or
+                len(set(channels)) != len(channels)):
+            raise ValueError('Invalid channel names')
+
+        if fsync not in FSYNC_POLICIES:
+            raise ValueError('Invalid fsync policy')
+
+        if chunk_samples < 1:
+            raise ValueError('Invalid chunk size')
+
+        self._path = path
+        self._channels = list(channels)
+        self._dtypes = [np.dtype(dtype) for dtype in dtypes]
+        self._chunk_samples = chunk_samples
+        self._chunk_time = chunk_time
+        self._fsync = fsync
+
+        self._queue = queue.Queue(queue_sz)
+        self._thread = None
+        self._sources = []
+        self._stop = Event()
+
+        self._chunks = 0
+        self._buf_t = np.empty(chunk_samples, dtype=np.float64)
+        self._buf_d = [np.empty(chunk_samples, dtype=dtype)
+                       for dtype in self._dtypes]
+        self._cnt = 0
+        self._chunk_started = None
+
+        self._samples = 0
+        self._dropped = 0
+        self._error = None
+
+    def start(self):
+        """ Start recording. """
+
+        if self._thread is not None:
+            raise RuntimeError('Recorder already started')
+
+        os.makedirs(self._path, exist_ok=True)
+        self._write_manifest()
+
+        self._stop.clear()
+        self._thread = Thread(target=self._run)
+        self._thread.daemon = True
+        self._thread.start()
+
+    def stop(self):
+        """ Stop recording, writing all the queued data. """
+
+        self._stop.set()
+        for source in self._sources:
+            source.join()
+        self._sources = []
+
+        if self._thread is not None:
+            try:
+                self._put(None)
+            except queue.Full:
+                pass
+            self._thread.join()
+            self._thread = None
+
+    def _put(self, item):
+        """ Queue an item, waiting for space while the writer runs.
+
+            Raises:
+                queue.Full: If the writer is not running and the queue is
+                    full.
+        """
+
+        while True:
+            try:
+                self._queue.put(item, timeout=_PUT_POLL)
+                return
+            except queue.Full:
+                if self._thread is None or not self._thread.is_alive():
+                    raise
+
+    def push(self, t, d, block=False):
+        """ Queue an acquisition block.
+
+            Args:
+                t (list, array): Time vector.
+                d (list): Data vectors, one per channel.
+                block (bool, optional): Wait for space in the queue instead
+                    of dropping the block (while the writer is running).
+
+            Returns:
+                bool: False if the block was dropped (queue full).
+
+            Raises:
+                ILIOError: If the writer failed (see `stats`).
+        """
+
+        if self._error is not None:
+            raise ILIOError('Recorder writer failed: {}'.format(self._error))
+
+        if not len(t):
+            return True
+
+        try:
+            if block:
+                self._put((t, d))
+            else:
+                self._queue.put_nowait((t, d))
+        except queue.Full:
+            self._dropped += 1
+            return False
+
+        return True
+
+    def attach(self, source, period):
+        """ Periodically read an acquisition source from a thread.
+
+            Args:
+                source: Object with a `data` property returning a (time,
+                    data, ...) tuple, as `Poller` or `Monitor`, or a callable
+                    returning such tuple.
+                period (int, float): Read period (s).
+        """
+
+        def read():
+            return source() if callable(source) else source.data
+
+        def run():
+            try:
+                while not self._stop.wait(period):
+                    data = read()
+                    self.push(data[0], data[1])
+                data = read()
+                self.push(data[0], data[1], block=True)
+            except ILIOError:
+                # writer failed, stop reading the source
+                pass
+
+        thread = Thread(target=run)
+        thread.daemon = True
+        thread.start()
+        self._sources.append(thread)
+
+    def _run(self):
+        try:
+            while True:
+                try:
+                    item = self._queue.get(timeout=self._chunk_time)
+                except queue.Empty:
+                    item = False
+
+                if item is None:
+                    break
+
+                if item:
+                    self._append(*item)
+
+                if (self._cnt and self._chunk_time is not None and
+                        time.monotonic() - self._chunk_started >=
+                        self._chunk_time):
+                    self._rotate()
+
+            if self._cnt:
+                self._rotate()
+        except Exception as e:
+            self._error = e
+
+            # keep draining, so producers and stop() never block
+            while self._queue.get() is not None:
+                pass
+
+    def _append(self, t, d):
+        t = np.asarray(t, dtype=np.float64)
+        pos = 0
+
+        while pos < len(t):
+            if not self._cnt:
+                self._chunk_started = time.monotonic()
+
+            n = min(len(t) - pos, self._chunk_samples - self._cnt)
+            end = self._cnt + n
+
+            self._buf_t[self._cnt:end] = t[pos:pos + n]
+            for ch, buf in enumerate(self._buf_d):
+                data = d[ch] if ch < len(d) else None
+                if data is None:
+                    buf[self._cnt:end] = np.nan if buf.dtype.kind == 'f' else 0
+                else:
+                    buf[self._cnt:end] = np.asarray(data)[pos:pos + n]
+
+            self._cnt = end
+            self._samples += n
+            pos += n
+
+            if self._cnt == self._chunk_samples:
+                self._rotate()
+
+    def _rotate(self):
+        """ Write the current chunk and update the manifest. """
+
+        index = self._chunks
+        files = {}
+
+        columns = ([(TIME_COLUMN, self._buf_t)] +
+                   list(zip(self._channels, self._buf_d)))
+        for i, (name, buf) in enumerate(columns):
+            fname = '{:08d}.{}.npy'.format(index, 't' if not i else i - 1)
+            fpath = os.path.join(self._path, fname)
+            np.save(fpath, buf[:self._cnt])
+            if self._fsync == 'chunk':
+                _fsync_file(fpath)
+            files[name] = fname
+
+        chunk = {'index': index,
+                 'samples': self._cnt,
+                 't_start': float(self._buf_t[0]),
+                 't_stop': float(self._buf_t[self._cnt - 1]),
+                 'files': files}
+        self._chunks += 1
+        self._cnt = 0
+
+        with open(os.path.join(self._path, CHUNKS), 'a') as f:
+            f.write(json.dumps(chunk) + '\n')
+            if self._fsync == 'chunk':
+                f.flush()
+                os.fsync(f.fileno())
+
+    def _write_manifest(self):
+        """ Write the manifest and start an empty chunks index. """
+
+        manifest = {'version': 2,
+                    'channels': [{'name': name, 'dtype': dtype.str}
+                                 for name, dtype in zip(self._channels,
+                                                        self._dtypes)],
+                    'chunks': CHUNKS}
+
+        fpath = os.path.join(self._path, MANIFEST)
+        with open(fpath + '.tmp', 'w') as f:
+            json.dump(manifest, f, indent=1)
+            if self._fsync == 'chunk':
+                f.flush()
+                os.fsync(f.fileno())
+        os.replace(fpath + '.tmp', fpath)
+
+        open(os.path.join(self._path, CHUNKS), 'w').close()
+
+    @property
+    def stats(self):
+        """ dict: Recorded samples and chunks, dropped blocks, queued blocks
+            and last writer error.
+        """
+
+        return {'samples': self._samples,
+                'chunks': self._chunks,
+                'dropped': self._dropped,
+                'queued': self._queue.qsize(),
+                'error': self._error}
+
+
+class RecordingReader(object):
+    """ Recording reader.
+
+        Chunks are memory-mapped, so only the accessed data is read from
+        disk. A truncated last record of the chunks index (e.g. after a
+        crash) is ignored.
+
+        Args:
+            path (str): Recording directory.
+    """
+
+    def __init__(self, path):
+        self._path = path
+
+        with open(os.path.join(path, MANIFEST), 'r') as f:
+            self._manifest = json.load(f)
+
+        chunks = self._manifest['chunks']
+        if isinstance(chunks, str):
+            chunks = self._read_chunks(os.path.join(path, chunks))
+        self._chunks = chunks
+        self._offsets = np.cumsum([0] + [c['samples'] for c in self._chunks])
+
+    @staticmethod
+    def _read_chunks(fpath):
+        """ Read a chunks index, up to the last complete record. """
+
+        chunks = []
+        with open(fpath, 'r') as f:
+            for line in f:
+                if not line.endswith('\n'):
+                    break
+                chunks.append(json.loads(line))
+
+        return chunks
+
+    @property
+    def channels(self):
+        """ list: Channel names. """
+        return [ch['name'] for ch in self._manifest['channels']]
+
+    @property
+    def samples(self):
+        """ int: Number of recorded samples. """
+        return int(self._offsets[-1])
+
+    def _column(self, chunk, name):
+        fname = chunk['files'][name]
+        return np.load(os.path.join(self._path, fname), mmap_mode='r')
+
+    def chunks(self):
+        """ Iterate over the recorded chunks.
+
+            Yields:
+                tuple (array, dict): Time vector and data vector per channel
+                    name, all memory-mapped.
+        """
+
+        for chunk in self._chunks:
+            yield (self._column(chunk, TIME_COLUMN),
+                   {name: self._column(chunk, name) for name in self.channels})
+
+    def read(self, name, start=0, stop=None):
+        """ Read a sample range of a column.
+
+            Args:
+                name (str): Channel name, or 't' for the time vector.
+                start (int, optional): First sample (included).
+                stop (int, optional): Last sample (excluded).
+
+            Returns:
+                array: Column data.
+        """
+
+        stop = self.samples if stop is None else min(stop, self.samples)
+        start = max(start, 0)
+
+        first = max(np.searchsorted(self._offsets, start, side='right') - 1, 0)
+        parts = []
+        for i in range(first, len(self._chunks)):
+            lo = self._offsets[i]
+            if lo >= stop:
+                break
+            col = self._column(self._chunks[i], name)
+            parts.append(col[max(start - lo, 0):stop - lo])
+
+        if not parts:
+            return np.empty(0)
+
+        return parts[0] if len(parts) == 1 else np.concatenate(parts)
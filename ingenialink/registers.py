@@ -81,6 +81,27 @@ def _get_reg_id(reg, subnode=1):
     raise TypeError('Unexpected register type')
 
 
+def _units_reg(servo, reg, subnode=1):
+    """ Obtain the Register used for the units conversion of a channel.
+
+        Args:
+            servo (Servo): Servo.
+            reg (str, Register): Register.
+            subnode (int, optional): Subnode.
+    """
+
+    if isinstance(reg, Register):
+        return reg
+    elif isinstance(reg, str):
+        _dict = servo.dict
+        if not _dict:
+            raise ValueError('No dictionary loaded')
+
+        return _dict.get_regs(subnode)[reg]
+
+    raise TypeError('Unexpected register type')
+
+
 class Register(object):
     """ Register.
 
@@ -2,7 +2,7 @@ from enum import Enum
 
 from ._ingenialink import ffi, lib
 from ._utils import cstr, pstr, raise_null, raise_err, to_ms
-from .registers import Register, REG_DTYPE, _get_reg_id, REG_ACCESS
+from .registers import Register, REG_DTYPE, _get_reg_id, REG_ACCESS, REG_PHY
 from .net import Network, NET_PROT
 from .dict_ import Dictionary
 
@@ -297,6 +297,7 @@ class Servo(object):
 
         self._state_cb = {}
         self._emcy_cb = {}
+        self._units_factors = {}
         if not hasattr(self, '_errors') or not self._errors:
             self._errors = self._get_all_errors(self.dict_f)
 
@@ -309,6 +310,7 @@ class Servo(object):
 
         inst._state_cb = {}
         inst._emcy_cb = {}
+        inst._units_factors = {}
         if not hasattr(inst, '_errors') or not inst._errors:
             inst._errors = inst._get_all_errors(dict_f)
 
@@ -685,17 +687,58 @@ class Servo(object):
         r = lib.il_servo_units_update(self._servo)
         raise_err(r)
 
+        self._units_factors.clear()
+
     def units_factor(self, reg):
         """ Obtain units scale factor for the given register.
 
+            Factors are cached until the units (or the scaling parameters,
+            see `units_update`) change.
+
             Args:
-                reg (Register): Register.
+                reg (Register, REG_PHY): Register, or physical units.
 
             Returns:
                 float: Scale factor for the given register.
         """
 
-        return lib.il_servo_units_factor(self._servo, reg._reg)
+        if isinstance(reg, REG_PHY):
+            key = reg
+        else:
+            key = (reg.subnode, reg.address, reg.phy)
+
+        factor = self._units_factors.get(key)
+        if factor is None:
+            if isinstance(reg, REG_PHY):
+                reg = Register(identifier='', units='', cyclic='CONFIG',
+                               address=0, dtype=REG_DTYPE.FLOAT,
+                               access=REG_ACCESS.RO, phy=reg)
+
+            factor = lib.il_servo_units_factor(self._servo, reg._reg)
+            self._units_factors[key] = factor
+
+        return factor
+
+    def units_convert(self, reg, data, inverse=False):
+        """ Convert an array of raw values to the configured units.
+
+            Args:
+                reg (Register, REG_PHY): Register, or physical units.
+                data (list, array): Raw values.
+                inverse (bool, optional): Convert from units to raw values
+                    instead.
+
+            Returns:
+                array: Converted values.
+        """
+
+        # NumPy is only required here, import it on use
+        import numpy as np
+
+        factor = self.units_factor(reg)
+        data = np.asarray(data, dtype=np.float64)
+
+        return data / factor if inverse else data * factor
 
     @property
     def units_torque(self):
@@ -705,6 +748,7 @@ class Servo(object):
     @units_torque.setter
     def units_torque(self, units):
         lib.il_servo_units_torque_set(self._servo, units.value)
+        self._units_factors.clear()
 
     @property
     def units_pos(self):
@@ -714,6 +758,7 @@ class Servo(object):
     @units_pos.setter
     def units_pos(self, units):
         lib.il_servo_units_pos_set(self._servo, units.value)
+        self._units_factors.clear()
 
     @property
     def units_vel(self):
@@ -723,6 +768,7 @@ class Servo(object):
     @units_vel.setter
     def units_vel(self, units):
         lib.il_servo_units_vel_set(self._servo, units.value)
+        self._units_factors.clear()
 
     @property
     def units_acc(self):
@@ -732,6 +778,7 @@ class Servo(object):
     @units_acc.setter
     def units_acc(self, units):
         lib.il_servo_units_acc_set(self._servo, units.value)
+        self._units_factors.clear()
 
     def disable(self, subnode=1):
         """ Disable PDS. """
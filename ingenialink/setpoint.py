@@ -0,0 +1,216 @@
+import time
+from collections import deque
+from threading import Thread, Condition
+
+
+class SetpointStream(object):
+    """ Non-blocking set-point channel.
+
+        Set-points are handed to a background thread which calls the servo
+        `position`, `velocity` and `torque` setters, so the caller never
+        waits for the bus or the set-point acknowledge. Immediate set-points
+        follow a latest-value-wins policy: if a new one arrives before the
+        previous one was sent, the previous one is discarded (coalesced).
+        Buffered profile points (immediate=False) go through a bounded FIFO
+        and are never coalesced. When both are pending, the thread
+        alternates between latest values and buffered points.
+
+        Args:
+            servo (Servo): Servo instance.
+            fifo_sz (int, optional): Size of the buffered points FIFO, 0 to
+                disable buffered points.
+    """
+
+    _KINDS = ('position', 'velocity', 'torque')
+    """ tuple: Supported set-point kinds (servo setter names). """
+
+    def __init__(self, servo, fifo_sz=0):
+        self._servo = servo
+        self._fifo_sz = fifo_sz
+
+        self._cv = Condition()
+        self._latest = {}
+        self._fifo = deque()
+        self._fifo_turn = False
+        self._thread = None
+        self._running = False
+
+        self.reset_stats()
+
+    def reset_stats(self):
+        """ Reset the statistics. """
+
+        with self._cv:
+            self._stats = {'submitted': 0,
+                           'sent': 0,
+                           'coalesced': 0,
+                           'dropped': 0,
+                           'errors': 0,
+                           'last_error': None,
+                           'ack_latency_last': None,
+                           'ack_latency_min': None,
+                           'ack_latency_max': None,
+                           'ack_latency_sum': 0.}
+
+    def start(self):
+        """ Start the set-point thread. """
+
+        if self._running:
+            return
+
+        self._running = True
+        self._thread = Thread(target=self._run)
+        self._thread.daemon = True
+        self._thread.start()
+
+    def stop(self, flush=False, timeout=None):
+        """ Stop the set-point thread.
+
+            Args:
+                flush (bool, optional): Send pending set-points before
+                    stopping, otherwise they are discarded.
+                timeout (int, float, optional): Join timeout (s).
+        """
+
+        with self._cv:
+            if not flush:
+                self._latest.clear()
+                self._fifo.clear()
+            self._running = False
+            self._cv.notify()
+
+        if self._thread is not None:
+            self._thread.join(timeout)
+            self._thread = None
+
+    def _submit(self, kind, value, immediate=True, **opts):
+        with self._cv:
+            self._stats['submitted'] += 1
+
+            if immediate:
+                if kind in self._latest:
+                    self._stats['coalesced'] += 1
+                self._latest[kind] = value
+            else:
+                if len(self._fifo) >= self._fifo_sz:
+                    self._stats['dropped'] += 1
+                    return False
+                opts['immediate'] = False
+                self._fifo.append((kind, value, opts))
+
+            self._cv.notify()
+
+        return True
+
+    def position(self, pos, immediate=True, relative=False, sp_timeout=None):
+        """ Queue a target position.
+
+            Args:
+                pos (int, float): Position.
+                immediate (bool, optional): If False, the point is pushed to
+                    the buffered points FIFO.
+                relative (bool, optional): Relative position.
+                sp_timeout (int, float, optional): Set-point acknowledge
+                    timeout (s).
+
+            Returns:
+                bool: False if the point was dropped (FIFO full).
+        """
+
+        opts = {'relative': relative}
+        if sp_timeout is not None:
+            opts['sp_timeout'] = sp_timeout
+
+        if immediate:
+            return self._submit('position', (pos, opts))
+
+        return self._submit('position', pos, immediate=False, **opts)
+
+    def velocity(self, vel):
+        """ Queue a target velocity (latest value wins).
+
+            Args:
+                vel (int, float): Velocity.
+        """
+
+        return self._submit('velocity', vel)
+
+    def torque(self, torque):
+        """ Queue a target torque (latest value wins).
+
+            Args:
+                torque (int, float): Torque.
+        """
+
+        return self._submit('torque', torque)
+
+    def _next(self):
+        """ Obtain the next set-point to send, None when stopping. """
+
+        with self._cv:
+            while not self._latest and not self._fifo:
+                if not self._running:
+                    return None
+                self._cv.wait()
+
+            # alternate between both queues, so a producer updating a
+            # latest-value kind does not starve the buffered points
+            if self._fifo and (self._fifo_turn or not self._latest):
+                self._fifo_turn = False
+                kind, value, opts = self._fifo.popleft()
+
+                return kind, (value, opts)
+
+            self._fifo_turn = True
+            for kind in self._KINDS:
+                if kind in self._latest:
+                    return kind, self._latest.pop(kind)
+
+    def _run(self):
+        while True:
+            sp = self._next()
+            if sp is None:
+                break
+
+            kind, value = sp
+            t0 = time.perf_counter()
+            try:
+                setattr(self._servo, kind, value)
+            except Exception as e:
+                with self._cv:
+                    self._stats['errors'] += 1
+                    self._stats['last_error'] = e
+                continue
+            latency = time.perf_counter() - t0
+
+            with self._cv:
+                st = self._stats
+                st['sent'] += 1
+                st['ack_latency_last'] = latency
+                st['ack_latency_sum'] += latency
+                if st['ack_latency_min'] is None or latency < st['ack_latency_min']:
+                    st['ack_latency_min'] = latency
+                if st['ack_latency_max'] is None or latency > st['ack_latency_max']:
+                    st['ack_latency_max'] = latency
+
+    @property
+    def pending(self):
+        """ int: Number of set-points waiting to be sent. """
+
+        with self._cv:
+            return len(self._latest) + len(self._fifo)
+
+    @property
+    def stats(self):
+        """ dict: Set-point statistics (counters and acknowledge latency in
+            seconds).
+        """
+
+        with self._cv:
+            stats = dict(self._stats)
+
+        total = stats.pop('ack_latency_sum')
+        stats['ack_latency_mean'] = (total / stats['sent'] if stats['sent']
+                                     else None)
+
+        return stats
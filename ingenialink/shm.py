@@ -0,0 +1,313 @@
+import os
+from threading import Thread, Event, Lock
+
+try:
+    from multiprocessing import shared_memory, resource_tracker
+except ImportError:
+    # Python < 3.8
+    shared_memory = resource_tracker = None
+
+import numpy as np
+
+
+_OWNED = set()
+""" set: Names of the blocks created by publishers of this process. """
+
+_OWNED_LOCK = Lock()
+
+_MAGIC = 0x494c4b53
+""" int: Ring buffer magic number. """
+
+(_HDR_MAGIC, _HDR_CAPACITY, _HDR_N_CH, _HDR_SEQ, _HDR_WSEQ,
+ _HDR_SZ) = range(6)
+""" int: Header fields (int64 words). """
+
+
+def _layout(buf, capacity, n_ch):
+    """ Obtain the header, time and data views of a ring buffer. """
+
+    hdr = np.ndarray((_HDR_SZ, ), dtype=np.int64, buffer=buf)
+    t = np.ndarray((capacity, ), dtype=np.float64, buffer=buf,
+                   offset=hdr.nbytes)
+    d = np.ndarray((n_ch, capacity), dtype=np.float64, buffer=buf,
+                   offset=hdr.nbytes + t.nbytes)
+
+    return hdr, t, d
+
+
+def _check_shm():
+    """ Check that shared memory is available.
+
+        Raises:
+            RuntimeError: If Python does not provide shared memory
+                (Python < 3.8).
+    """
+
+    if shared_memory is None:
+        raise RuntimeError(
+            'Shared memory fan-out requires Python 3.8 or newer')
+
+
+class ShmPublisher(object):
+    """ Shared memory acquisition publisher.
+
+        Samples are written into a ring buffer in shared memory together with
+        a sequence counter (total number of samples written), so any number
+        of `ShmSubscriber` in other processes can read them without copies.
+        The publisher never waits for the subscribers: slow subscribers
+        detect the overrun instead. As in a seqlock, a write sequence
+        (samples written once the write in progress completes) is
+        published before copying, so that readers can tell whether the
+        samples they read were being overwritten.
+
+        Args:
+            n_ch (int): Number of channels.
+            capacity (int, optional): Ring buffer capacity (samples).
+            name (str, optional): Shared memory block name, a random one is
+                used if not given.
+
+        Raises:
+            RuntimeError: If shared memory is not available
+                (Python < 3.8).
+    """
+
+    def __init__(self, n_ch, capacity=65536, name=None):
+        _check_shm()
+
+        size = (_HDR_SZ + capacity * (n_ch + 1)) * 8
+        self._shm = shared_memory.SharedMemory(name=name, create=True,
+                                               size=size)
+        with _OWNED_LOCK:
+            _OWNED.add(self._shm._name)
+
+        self._n_ch = n_ch
+        self._capacity = capacity
+        self._hdr, self._t, self._d = _layout(self._shm.buf, capacity, n_ch)
+
+        self._hdr[_HDR_CAPACITY] = capacity
+        self._hdr[_HDR_N_CH] = n_ch
+        self._hdr[_HDR_SEQ] = 0
+        self._hdr[_HDR_WSEQ] = 0
+        self._hdr[_HDR_MAGIC] = _MAGIC
+
+        self._stop = Event()
+        self._thread = None
+
+    @property
+    def name(self):
+        """ str: Shared memory block name (used by subscribers). """
+        return self._shm.name
+
+    @property
+    def seq(self):
+        """ int: Number of published samples. """
+        return int(self._hdr[_HDR_SEQ])
+
+    def publish(self, t, d):
+        """ Publish a block of samples.
+
+            Args:
+                t (list, array): Time vector.
+                d (list): Data vectors, one per channel (None for disabled
+                    channels).
+        """
+
+        t = np.asarray(t, dtype=np.float64)
+        n = len(t)
+        if not n:
+            return
+
+        # only the latest capacity samples can be kept
+        skip = max(n - self._capacity, 0)
+        seq = int(self._hdr[_HDR_SEQ]) + skip
+        n -= skip
+
+        pos = seq % self._capacity
+        first = min(n, self._capacity - pos)
+
+        # announce the write, samples before seq + n - capacity are stale
+        self._hdr[_HDR_WSEQ] = seq + n
+
+        self._t[pos:pos + first] = t[skip:skip + first]
+        self._t[:n - first] = t[skip + first:]
+        for ch in range(self._n_ch):
+            data = d[ch] if d[ch] is not None else np.full(n + skip, np.nan)
+            data = np.asarray(data, dtype=np.float64)
+            self._d[ch, pos:pos + first] = data[skip:skip + first]
+            self._d[ch, :n - first] = data[skip + first:]
+
+        # data is in place, make it visible
+        self._hdr[_HDR_SEQ] = seq + n
+
+    def attach(self, source, period):
+        """ Periodically publish the data of an acquisition source.
+
+            Args:
+                source: Object with a `data` property returning a (time,
+                    data, ...) tuple, as `Poller` or `Monitor`, or a callable
+                    returning such tuple.
+                period (int, float): Read period (s).
+        """
+
+        def run():
+            while not self._stop.wait(period):
+                data = source() if callable(source) else source.data
+                self.publish(data[0], data[1])
+
+        self._stop.clear()
+        self._thread = Thread(target=run)
+        self._thread.daemon = True
+        self._thread.start()
+
+    def detach(self):
+        """ Stop publishing the attached source. """
+
+        self._stop.set()
+        if self._thread is not None:
+            self._thread.join()
+            self._thread = None
+
+    def close(self):
+        """ Close and remove the shared memory block. """
+
+        self.detach()
+
+        self._hdr = self._t = self._d = None
+        self._shm.close()
+        self._shm.unlink()
+        with _OWNED_LOCK:
+            _OWNED.discard(self._shm._name)
+
+
+class ShmSubscriber(object):
+    """ Shared memory acquisition subscriber.
+
+        Args:
+            name (str): Shared memory block name (see `ShmPublisher.name`).
+            from_start (bool, optional): Start reading from the oldest
+                available sample instead of the latest one.
+
+        Raises:
+            ValueError: If the block is not an acquisition ring buffer.
+            RuntimeError: If shared memory is not available
+                (Python < 3.8).
+    """
+
+    def __init__(self, name, from_start=False):
+        _check_shm()
+
+        # the publisher owns the block, it must not be removed when this
+        # process exits
+        try:
+            self._shm = shared_memory.SharedMemory(name=name, track=False)
+        except TypeError:
+            # Python < 3.13 registers the block on POSIX, take it out of the
+            # resource tracker (unless a publisher of this process owns it)
+            self._shm = shared_memory.SharedMemory(name=name)
+            with _OWNED_LOCK:
+                owned = self._shm._name in _OWNED
+            if os.name == 'posix' and not owned:
+                resource_tracker.unregister(self._shm._name, 'shared_memory')
+
+        hdr = np.ndarray((_HDR_SZ, ), dtype=np.int64, buffer=self._shm.buf)
+        if hdr[_HDR_MAGIC] != _MAGIC:
+            raise ValueError('Not an acquisition ring buffer')
+
+        self._capacity = int(hdr[_HDR_CAPACITY])
+        self._n_ch = int(hdr[_HDR_N_CH])
+        self._hdr, self._t, self._d = _layout(self._shm.buf, self._capacity,
+                                              self._n_ch)
+
+        seq = int(self._hdr[_HDR_SEQ])
+        wseq = int(self._hdr[_HDR_WSEQ])
+        self._seq = max(wseq - self._capacity, 0) if from_start else seq
+        self._last = self._seq
+        self._lost = 0
+
+    @property
+    def n_ch(self):
+        """ int: Number of channels. """
+        return self._n_ch
+
+    @property
+    def available(self):
+        """ int: Number of samples available to read. """
+        return max(int(self._hdr[_HDR_SEQ]) - self._seq, 0)
+
+    @property
+    def lost(self):
+        """ int: Total number of samples lost due to overruns. """
+        return self._lost
+
+    def _stale(self, start):
+        """ Obtain the number of samples from start that the publisher has
+            overwritten, or is overwriting.
+        """
+
+        return max(int(self._hdr[_HDR_WSEQ]) - self._capacity - start, 0)
+
+    def read(self, max_samples=None, copy=False):
+        """ Read the available samples.
+
+            By default the returned arrays are views of the shared memory:
+            they are only valid until the publisher wraps around, which can
+            be checked with `overrun` once they have been consumed. With
+            copy, the samples are copied and checked after the copy, and
+            those overwritten meanwhile are dropped and counted as lost. A
+            single contiguous region is returned; call again to read the
+            rest after a wrap.
+
+            Args:
+                max_samples (int, optional): Maximum number of samples.
+                copy (bool, optional): Copy the samples.
+
+            Returns:
+                tuple (array, array, int): Time vector, data (channel x
+                    sample) and number of samples lost before them.
+        """
+
+        seq = int(self._hdr[_HDR_SEQ])
+
+        lost = self._stale(self._seq)
+        if lost:
+            self._seq += lost
+            self._lost += lost
+
+        pos = self._seq % self._capacity
+        n = max(min(seq - self._seq, self._capacity - pos), 0)
+        if max_samples is not None:
+            n = min(n, max_samples)
+
+        t = self._t[pos:pos + n]
+        d = self._d[:, pos:pos + n]
+
+        torn = 0
+        if copy:
+            t = t.copy()
+            d = d.copy()
+
+            torn = min(self._stale(self._seq), n)
+            if torn:
+                t = t[torn:]
+                d = d[:, torn:]
+                lost += torn
+                self._lost += torn
+
+        self._last = self._seq + torn
+        self._seq += n
+
+        return t, d, lost
+
+    @property
+    def overrun(self):
+        """ bool: True if the data returned by the last read may have been
+            overwritten by the publisher.
+        """
+
+        return self._stale(self._last) > 0
+
+    def close(self):
+        """ Detach from the shared memory block. """
+
+        self._hdr = self._t = self._d = None
+        self._shm.close()
@@ -0,0 +1,129 @@
+import time
+
+
+if hasattr(time, 'monotonic_ns'):
+    _monotonic_ns = time.monotonic_ns
+    _time_ns = time.time_ns
+else:
+    # Python < 3.7, nanosecond clocks are not available
+    def _monotonic_ns():
+        return int(time.monotonic() * 1e9)
+
+    def _time_ns():
+        return int(time.time() * 1e9)
+
+
+def now_ns():
+    """ Obtain the monotonic clock time.
+
+        Returns:
+            int: Monotonic time (ns).
+    """
+
+    return _monotonic_ns()
+
+
+class Timebase(object):
+    """ Acquisition timebase.
+
+        Acquisitions are timestamped with the monotonic clock as integer
+        nanoseconds. The timebase keeps the monotonic time of the
+        acquisition start, so that the relative times (s) given by the
+        pollers and monitors can be converted to absolute monotonic
+        timestamps, and thus correlated among them. Optionally, a wall-clock
+        anchor (a monotonic and wall-clock time pair taken together) allows
+        converting them to wall-clock time.
+
+        Args:
+            anchor (bool, optional): Take a wall-clock anchor.
+    """
+
+    def __init__(self, anchor=False):
+        self._start_ns = now_ns()
+        self._anchor = None
+
+        if anchor:
+            self.anchor()
+
+    def anchor(self):
+        """ Take a wall-clock anchor.
+
+            The wall-clock time is read between two monotonic clock reads,
+            keeping the closest pair of a few tries.
+        """
+
+        best = None
+        for _ in range(5):
+            before = now_ns()
+            wall = _time_ns()
+            after = now_ns()
+            if best is None or after - before < best[0]:
+                best = (after - before, (before + after) // 2, wall)
+
+        self._anchor = best[1:]
+
+    @property
+    def start_ns(self):
+        """ int: Monotonic time of the acquisition start (ns). """
+        return self._start_ns
+
+    @property
+    def anchored(self):
+        """ bool: True if the timebase has a wall-clock anchor. """
+        return self._anchor is not None
+
+    def to_ns(self, t):
+        """ Convert relative times to monotonic timestamps.
+
+            Args:
+                t (float, list, array): Time since the start (s).
+
+            Returns:
+                int, list, array: Monotonic timestamps (ns).
+        """
+
+        if hasattr(t, 'astype'):
+            return (t * 1e9).round().astype('int64') + self._start_ns
+        if isinstance(t, (list, tuple)):
+            return [self._start_ns + int(round(v * 1e9)) for v in t]
+
+        return self._start_ns + int(round(t * 1e9))
+
+    def to_seconds(self, t_ns):
+        """ Convert monotonic timestamps to relative times.
+
+            Args:
+                t_ns (int, list, array): Monotonic timestamps (ns).
+
+            Returns:
+                float, list, array: Time since the start (s).
+        """
+
+        if hasattr(t_ns, 'astype'):
+            return (t_ns - self._start_ns) / 1e9
+        if isinstance(t_ns, (list, tuple)):
+            return [(v - self._start_ns) / 1e9 for v in t_ns]
+
+        return (t_ns - self._start_ns) / 1e9
+
+    def to_wall_ns(self, t_ns):
+        """ Convert monotonic timestamps to wall-clock time.
+
+            Args:
+                t_ns (int, list, array): Monotonic timestamps (ns).
+
+            Returns:
+                int, list, array: Wall-clock time (ns since the epoch).
+
+            Raises:
+                RuntimeError: If the timebase has no wall-clock anchor.
+        """
+
+        if self._anchor is None:
+            raise RuntimeError('Timebase has no wall-clock anchor')
+
+        offset = self._anchor[1] - self._anchor[0]
+        if isinstance(t_ns, (list, tuple)):
+            return [v + offset for v in t_ns]
+
+        return t_ns + offset
@@ -0,0 +1,201 @@
+import time
+from threading import Thread, Event
+
+import numpy as np
+
+
+class TrajectoryStreamer(object):
+    """ Trajectory streamer.
+
+        Streams position and/or velocity points given as NumPy arrays to a
+        servo from a background thread. Each point is sent when its
+        timestamp is due (minus the `lead` time, which allows feeding the
+        drive buffer ahead). Points are read from the arrays one at a time,
+        so long trajectories are not expanded to Python objects.
+
+        Points are sent either through the servo setters (cffi `Servo`, the
+        position set-point acknowledge acting as flow control), or through a
+        CANopen RPDO when `rpdo` is given. Additionally, a buffer fill level
+        can be used as flow control: sending pauses while it is at or above
+        `fill_max`.
+
+        Args:
+            servo (Servo): Servo instance.
+            t (array): Point timestamps (s, relative to the stream start).
+            position (array, optional): Position points.
+            velocity (array, optional): Velocity points.
+            lead (int, float, optional): Time a point can be sent before its
+                timestamp (s).
+            underrun_tol (int, float, optional): Lateness tolerated before a
+                point is counted as an underrun (s).
+            rpdo (canopen.pdo.Map, optional): RPDO used to send the points.
+            pos_var (str, int, optional): RPDO variable for the position.
+            vel_var (str, int, optional): RPDO variable for the velocity.
+            fill (Register, str, optional): Buffer fill level, either a
+                register (read through the servo) or a PDO variable (its
+                last received value is used).
+            fill_max (int, optional): Maximum buffer fill level.
+
+        Raises:
+            ValueError: If the arrays are not consistent.
+    """
+
+    def __init__(self, servo, t, position=None, velocity=None, lead=0.,
+                 underrun_tol=1e-3, rpdo=None, pos_var=None, vel_var=None,
+                 fill=None, fill_max=None):
+        if position is None and velocity is None:
+            raise ValueError('No points given')
+
+        self._t = np.ascontiguousarray(t, dtype=np.float64)
+        self._pos = self._points(position)
+        self._vel = self._points(velocity)
+
+        if np.any(np.diff(self._t) < 0):
+            raise ValueError('Timestamps must be monotonic')
+
+        if rpdo is None and self._pos is not None and self._vel is not None:
+            raise ValueError('Position and velocity streaming requires a PDO')
+
+        if rpdo is not None:
+            if ((self._pos is not None and pos_var is None) or
+                    (self._vel is not None and vel_var is None)):
+                raise ValueError('Missing RPDO variable')
+
+        if fill is not None and fill_max is None:
+            raise ValueError('Missing maximum buffer fill level')
+
+        self._servo = servo
+        self._lead = lead
+        self._underrun_tol = underrun_tol
+        self._rpdo = rpdo
+        self._pos_var = pos_var
+        self._vel_var = vel_var
+        self._fill = fill
+        self._fill_max = fill_max
+
+        self._thread = None
+        self._stop = Event()
+        self._done = Event()
+        self._error = None
+
+        self._sent = 0
+        self._underruns = 0
+        self._max_late = 0.
+        self._t_start = None
+        self._t_end = None
+
+    def _points(self, points):
+        if points is None:
+            return None
+
+        points = np.ascontiguousarray(points, dtype=np.float64)
+        if points.shape != self._t.shape:
+            raise ValueError('Points and timestamps size mismatch')
+
+        return points
+
+    def _fill_level(self):
+        if hasattr(self._fill, 'raw'):
+            return self._fill.raw
+
+        return self._servo.raw_read(self._fill)
+
+    def _send(self, i):
+        if self._rpdo is not None:
+            if self._pos is not None:
+                self._rpdo[self._pos_var].raw = int(self._pos.item(i))
+            if self._vel is not None:
+                self._rpdo[self._vel_var].raw = int(self._vel.item(i))
+            self._rpdo.transmit()
+        elif self._pos is not None:
+            self._servo.position = (self._pos.item(i),
+                                    {'immediate': self._lead <= 0})
+        else:
+            self._servo.velocity = self._vel.item(i)
+
+    def _run(self):
+        t = self._t
+        self._t_start = time.perf_counter()
+
+        try:
+            for i in range(len(t)):
+                due = self._t_start + t.item(i)
+
+                wait = due - self._lead - time.perf_counter()
+                if wait > 0 and self._stop.wait(wait):
+                    break
+
+                if self._fill is not None:
+                    while self._fill_level() >= self._fill_max:
+                        if self._stop.wait(1e-3):
+                            break
+
+                if self._stop.is_set():
+                    break
+
+                late = time.perf_counter() - due
+                if late > self._underrun_tol:
+                    self._underruns += 1
+                    self._max_late = max(self._max_late, late)
+
+                self._send(i)
+                self._sent += 1
+        except Exception as e:
+            self._error = e
+        finally:
+            self._t_end = time.perf_counter()
+            self._done.set()
+
+    def start(self):
+        """ Start streaming. """
+
+        if self._thread is not None:
+            raise RuntimeError('Trajectory already started')
+
+        self._thread = Thread(target=self._run)
+        self._thread.daemon = True
+        self._thread.start()
+
+    def stop(self):
+        """ Stop streaming. """
+
+        self._stop.set()
+        if self._thread is not None:
+            self._thread.join()
+
+    def wait(self, timeout=None):
+        """ Wait until all the points have been sent.
+
+            Args:
+                timeout (int, float, optional): Timeout (s).
+
+            Returns:
+                bool: True if finished, False on timeout.
+
+            Raises:
+                Exception: The error that aborted the streaming, if any.
+        """
+
+        finished = self._done.wait(timeout)
+        if self._error is not None:
+            raise self._error
+
+        return finished
+
+    @property
+    def stats(self):
+        """ dict: Points sent, underruns, maximum lateness (s) and achieved
+            point rate (points/s).
+        """
+
+        rate = None
+        if self._t_start is not None:
+            end = self._t_end if self._t_end else time.perf_counter()
+            if end > self._t_start:
+                rate = self._sent / (end - self._t_start)
+
+        return {'points': len(self._t),
+                'sent': self._sent,
+                'underruns': self._underruns,
+                'max_late': self._max_late,
+                'rate': rate}
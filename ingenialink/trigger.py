@@ -0,0 +1,218 @@
+import numpy as np
+
+
+_MODES = ('IMMEDIATE', 'POS', 'NEG', 'WINDOW', 'DIN')
+""" tuple: Supported trigger modes (MONITOR_TRIGGER names). The modes are
+    matched by name, so that the trigger does not depend on the C library
+    (it is shared with the CANopen poller).
+"""
+
+
+class SoftwareTrigger(object):
+    """ Software trigger with pre-trigger buffering.
+
+        Samples are pushed in blocks and kept in a rolling pre-trigger ring.
+        The trigger condition is evaluated on the whole block at once; when
+        it fires, the pre-trigger samples and the following post-trigger
+        samples are stored as a segment. Samples outside of the triggered
+        windows are discarded.
+
+        Args:
+            n_ch (int): Number of channels.
+            mode (MONITOR_TRIGGER): Trigger mode. MONITOR_TRIGGER.MOTION is
+                not supported.
+            channel (int, optional): Trigger source channel.
+            pre_samples (int, optional): Samples kept before the trigger.
+            post_samples (int, optional): Samples kept after the trigger
+                (the trigger sample included).
+            th_pos (int, float, optional): Positive threshold, used for
+                MONITOR_TRIGGER.POS, MONITOR_TRIGGER.WINDOW
+            th_neg (int, float, optional): Negative threshold, used for
+                MONITOR_TRIGGER.NEG, MONITOR_TRIGGER.WINDOW
+            din_msk (int, optional): Bit mask, used for MONITOR_TRIGGER.DIN
+            repetitions (int, optional): Number of segments to capture, 0 to
+                re-arm forever.
+
+        Raises:
+            TypeError: If the trigger mode is invalid.
+            ValueError: If any of the parameters is out of range.
+    """
+
+    def __init__(self, n_ch, mode, channel=0, pre_samples=0, post_samples=1,
+                 th_pos=0., th_neg=0., din_msk=0, repetitions=1):
+        if not hasattr(mode, 'name'):
+            raise TypeError('Invalid trigger mode')
+
+        if mode.name not in _MODES:
+            raise ValueError('Unsupported trigger mode')
+
+        if not 0 <= channel < n_ch:
+            raise ValueError('Trigger channel out of range')
+
+        if pre_samples < 0 or post_samples < 1 or repetitions < 0:
+            raise ValueError('Invalid trigger window')
+
+        self._n_ch = n_ch
+        self._mode = mode.name
+        self._channel = channel
+        self._pre = pre_samples
+        self._post = post_samples
+        self._th_pos = th_pos
+        self._th_neg = th_neg
+        self._din_msk = int(din_msk)
+        self._repetitions = repetitions
+
+        self.reset()
+
+    def reset(self):
+        """ Re-arm the trigger and drop all the captured segments. """
+
+        self._ring_t = np.empty(self._pre)
+        self._ring_d = np.empty((self._n_ch, self._pre))
+        self._ring_pos = 0
+        self._ring_cnt = 0
+
+        self._last = None
+        self._seg = None
+        self._seg_cnt = 0
+        self._remaining = 0
+        self._triggers = 0
+        self._segments = []
+
+    def _ring_push(self, t, d):
+        """ Push samples to the pre-trigger ring. """
+
+        n = len(t)
+        if not self._pre or not n:
+            return
+
+        if n >= self._pre:
+            self._ring_t[:] = t[-self._pre:]
+            self._ring_d[:] = d[:, -self._pre:]
+            self._ring_pos = 0
+            self._ring_cnt = self._pre
+            return
+
+        idx = (self._ring_pos + np.arange(n)) % self._pre
+        self._ring_t[idx] = t
+        self._ring_d[:, idx] = d
+        self._ring_pos = (self._ring_pos + n) % self._pre
+        self._ring_cnt = min(self._ring_cnt + n, self._pre)
+
+    def _detect(self, x, prev):
+        """ Obtain the index of the first trigger condition in x, or -1. """
+
+        if self._mode == 'IMMEDIATE':
+            return 0
+
+        p = np.empty_like(x)
+        p[1:] = x[:-1]
+        p[0] = prev if prev is not None else x[0]
+
+        if self._mode == 'POS':
+            hit = (p < self._th_pos) & (x >= self._th_pos)
+        elif self._mode == 'NEG':
+            hit = (p > self._th_neg) & (x <= self._th_neg)
+        elif self._mode == 'WINDOW':
+            inside = (p >= self._th_neg) & (p <= self._th_pos)
+            hit = inside & ((x < self._th_neg) | (x > self._th_pos))
+        else:
+            # missing samples (NaN) never trigger, nor arm the edge
+            valid = ~(np.isnan(p) | np.isnan(x))
+            p = np.where(valid, p, 0).astype(np.int64) & self._din_msk
+            x = np.where(valid, x, 0).astype(np.int64) & self._din_msk
+            hit = valid & (p == 0) & (x != 0)
+
+        if not hit.any():
+            return -1
+
+        return int(np.argmax(hit))
+
+    def _start_segment(self):
+        """ Start a segment with the current pre-trigger ring content. """
+
+        sz = self._ring_cnt + self._post
+        self._seg = (np.empty(sz), np.empty((self._n_ch, sz)))
+
+        idx = (self._ring_pos - self._ring_cnt + np.arange(self._ring_cnt))
+        idx %= max(self._pre, 1)
+        self._seg[0][:self._ring_cnt] = self._ring_t[idx]
+        self._seg[1][:, :self._ring_cnt] = self._ring_d[:, idx]
+
+        self._seg_cnt = self._ring_cnt
+        self._remaining = self._post
+        self._triggers += 1
+
+    def _finish_segment(self):
+        """ Store the current segment. """
+
+        self._segments.append(self._seg)
+        self._seg = None
+
+    @property
+    def armed(self):
+        """ bool: True if the trigger can still fire. """
+        return (not self._repetitions or
+                self._triggers < self._repetitions)
+
+    def push(self, t, d):
+        """ Push a block of samples.
+
+            Args:
+                t (list, array): Time vector.
+                d (list, array): Data vectors, one per channel.
+        """
+
+        t = np.asarray(t, dtype=np.float64)
+        d = np.asarray(d, dtype=np.float64).reshape(self._n_ch, len(t))
+        n = len(t)
+        pos = 0
+
+        while pos < n:
+            if self._seg is not None:
+                take = min(self._remaining, n - pos)
+                end = self._seg_cnt + take
+                self._seg[0][self._seg_cnt:end] = t[pos:pos + take]
+                self._seg[1][:, self._seg_cnt:end] = d[:, pos:pos + take]
+                self._seg_cnt = end
+                self._remaining -= take
+
+                self._ring_push(t[pos:pos + take], d[:, pos:pos + take])
+                pos += take
+
+                if not self._remaining:
+                    self._finish_segment()
+                continue
+
+            if not self.armed:
+                break
+
+            prev = d[self._channel, pos - 1] if pos else self._last
+            idx = self._detect(d[self._channel, pos:], prev)
+            if idx < 0:
+                self._ring_push(t[pos:], d[:, pos:])
+                break
+
+            self._ring_push(t[pos:pos + idx], d[:, pos:pos + idx])
+            self._start_segment()
+            pos += idx
+
+        if n:
+            self._last = d[self._channel, -1]
+
+    @property
+    def segments(self):
+        """ list: Captured segments, as (time vector, data array) tuples.
+
+            Reading the segments removes them from the trigger.
+        """
+
+        segments = self._segments
+        self._segments = []
+
+        return segments
+
+    @property
+    def triggers(self):
+        """ int: Number of times the trigger has fired. """
+        return self._triggers
@@ -0,0 +1,85 @@
+import pytest
+
+np = pytest.importorskip('numpy')
+
+from ingenialink.aggregate import StreamStats
+
+
+_N_CH = 3
+""" int: Number of channels. """
+
+_BINS = 16
+""" int: Histogram bins. """
+
+_RANGE = (-3., 3.)
+""" tuple: Histogram range, narrower than the data to get out of range
+    samples.
+"""
+
+
+def _blocks(rng, n_blocks=50):
+    """ Random blocks of random length, with NaNs and disabled channels. """
+
+    blocks = []
+    t0 = 0
+    for _ in range(n_blocks):
+        n = int(rng.integers(0, 200))
+        t = np.arange(t0, t0 + n) * 1e-3
+        t0 += n
+
+        d = []
+        for ch in range(_N_CH):
+            x = rng.normal(loc=10. * ch, scale=1. + ch, size=n)
+            x[rng.random(n) < 0.1] = np.nan
+            d.append(x)
+
+        # last channel disabled on some blocks
+        if rng.random() < 0.2:
+            d[-1] = None
+
+        blocks.append((t, d))
+
+    return blocks
+
+
+def test_stream_stats_match_offline():
+    rng = np.random.default_rng(1234)
+    blocks = _blocks(rng)
+
+    stats = StreamStats(_N_CH, bins=_BINS, ranges=_RANGE)
+    for t, d in blocks:
+        stats.push(t, d)
+    snapshot = stats.snapshot()
+
+    edges = np.linspace(_RANGE[0], _RANGE[1], _BINS + 1)
+    for ch in range(_N_CH):
+        x = np.concatenate([d[ch] for _, d in blocks if d[ch] is not None])
+        x = x[~np.isnan(x)]
+
+        assert snapshot['count'][ch] == len(x)
+        assert snapshot['min'][ch] == x.min()
+        assert snapshot['max'][ch] == x.max()
+        assert snapshot['mean'][ch] == pytest.approx(x.mean(), rel=1e-12)
+        assert snapshot['std'][ch] == pytest.approx(x.std(), rel=1e-12)
+        assert snapshot['var'][ch] == pytest.approx(x.var(), rel=1e-12)
+        assert snapshot['rms'][ch] == pytest.approx(
+            np.sqrt(np.mean(np.square(x))), rel=1e-12)
+
+        hist, _ = np.histogram(x, bins=edges)
+        assert np.array_equal(snapshot['hist'][ch], hist)
+        assert snapshot['underflow'][ch] == np.count_nonzero(x < edges[0])
+        assert snapshot['overflow'][ch] == np.count_nonzero(x > edges[-1])
+
+    assert snapshot['t'] == [t for t, _ in blocks if len(t)][-1][-1]
+
+
+def test_stream_stats_empty_channel():
+    stats = StreamStats(2)
+    stats.push([0., 1.], [[1., 3.], [np.nan, np.nan]])
+    snapshot = stats.snapshot()
+
+    assert list(snapshot['count']) == [2, 0]
+    assert snapshot['mean'][0] == 2.
+    assert snapshot['std'][0] == 1.
+    assert np.isnan(snapshot['mean'][1])
+    assert np.isnan(snapshot['std'][1])
@@ -0,0 +1,73 @@
+import sys
+import time
+import threading
+
+import pytest
+
+from ingenialink.canopen.daemon import BusDaemon, DaemonClient
+
+
+pytestmark = pytest.mark.skipif(sys.platform == 'win32',
+                                reason='Unix-domain sockets required')
+
+
+class SimServo(object):
+    """ Servo answering reads after a fixed SDO transaction time. """
+
+    def __init__(self, latency=1e-3):
+        self._latency = latency
+        self._lock = threading.Lock()
+
+    def raw_read(self, reg, subnode=1):
+        with self._lock:
+            time.sleep(self._latency)
+            return 42
+
+    def state_subscribe(self, cb):
+        return 0
+
+
+@pytest.fixture
+def daemon(tmp_path):
+    path = str(tmp_path / 'il.sock')
+    daemon = BusDaemon({1: SimServo()}, path)
+    daemon.start()
+
+    yield daemon, path
+
+    daemon.stop()
+
+
+def test_shared_reads(daemon):
+    """ Clients reading the same register concurrently get all replies. """
+
+    daemon, path = daemon
+    n_clients, n_reqs = 16, 50
+
+    results = [[] for _ in range(n_clients)]
+    errors = []
+
+    def client(results):
+        cli = DaemonClient(path, timeout=2.)
+        servo = cli.servo(1)
+        try:
+            for _ in range(n_reqs):
+                results.append(servo.raw_read('REG'))
+        except Exception as e:
+            errors.append(e)
+        finally:
+            cli.close()
+
+    threads = [threading.Thread(target=client, args=(results[i], ))
+               for i in range(n_clients)]
+    for thread in threads:
+        thread.start()
+    for thread in threads:
+        thread.join()
+
+    assert not errors
+    assert results == [[42] * n_reqs] * n_clients
+
+    stats = daemon.stats
+    assert stats['requests'] == n_clients * n_reqs
+    assert stats['deduplicated'] > 0
@@ -0,0 +1,184 @@
+import pytest
+
+np = pytest.importorskip('numpy')
+
+from ingenialink.filters import Boxcar, MinMax, CIC, LowPass, FilterStage
+
+
+_FACTOR = 8
+""" int: Decimation factor. """
+
+_N = 1000
+""" int: Samples of the test signals (not a multiple of the factor). """
+
+
+def _signal(seed=1234, n=_N):
+    rng = np.random.default_rng(seed)
+    t = np.arange(n) * 1e-3
+    x = np.sin(2 * np.pi * 5 * t) + rng.normal(scale=0.1, size=n)
+
+    return t, x
+
+
+def _split(rng, n):
+    """ Random block boundaries, including empty blocks. """
+
+    cuts = np.sort(rng.integers(0, n + 1, size=20))
+    return [0] + list(cuts) + [n]
+
+
+def _run(stage, t, d, bounds):
+    t_out, d_out = [], [[] for _ in d]
+    for lo, hi in zip(bounds[:-1], bounds[1:]):
+        tb, db = stage.process(t[lo:hi], [x[lo:hi] for x in d])
+        t_out.append(tb)
+        for ch, y in enumerate(db):
+            d_out[ch].append(y)
+
+    return np.concatenate(t_out), [np.concatenate(y) for y in d_out]
+
+
+@pytest.mark.parametrize('make', [
+    lambda: Boxcar(_FACTOR),
+    lambda: MinMax(_FACTOR),
+    lambda: CIC(_FACTOR),
+    lambda: LowPass(alpha=0.05, factor=_FACTOR),
+])
+def test_block_split_invariance(make):
+    t, x = _signal()
+    d = [x, 2. * x - 1.]
+    rng = np.random.default_rng(5678)
+
+    ref_t, ref_d = _run(FilterStage([make(), make()]), t, d, [0, _N])
+    n_out = _N // _FACTOR * make().outputs
+    assert len(ref_t) == n_out
+
+    for _ in range(5):
+        t_out, d_out = _run(FilterStage([make(), make()]), t, d,
+                            _split(rng, _N))
+
+        assert np.array_equal(t_out, ref_t)
+        for y, ref in zip(d_out, ref_d):
+            assert len(y) == n_out
+            assert np.allclose(y, ref, rtol=1e-12, atol=1e-12)
+
+
+@pytest.mark.parametrize('alpha, factor', [
+    (0.05, 1), (0.05, _FACTOR), (0.001, 3), (1., 2)])
+def test_lowpass_recursive(alpha, factor):
+    _, x = _signal(n=5000)
+
+    y = np.empty(len(x))
+    prev = x[0]
+    for n, xn in enumerate(x):
+        prev = prev + alpha * (xn - prev)
+        y[n] = prev
+
+    f = LowPass(alpha=alpha, factor=factor)
+    step = 1000 // factor * factor
+    out = np.concatenate([f.process(x[lo:lo + step])
+                          for lo in range(0, len(x), step)])
+
+    n = len(x) // factor * factor
+    assert np.allclose(out, y[:n][factor - 1::factor], rtol=1e-9, atol=1e-12)
+
+
+def test_lowpass_fc():
+    f = LowPass(fc=10., fs=1000.)
+    assert f.alpha == pytest.approx(1. - np.exp(-2. * np.pi * 10. / 1000.))
+
+    with pytest.raises(ValueError):
+        LowPass(fc=10.)
+    with pytest.raises(ValueError):
+        LowPass(alpha=0.)
+
+
+@pytest.mark.parametrize('order', [1, 2, 3, 5])
+def test_cic_cascaded_average(order):
+    _, x = _signal(n=960)
+
+    # zero initial history, one output per input sample
+    y = np.concatenate((np.zeros(order * (_FACTOR - 1)), x))
+    for _ in range(order):
+        y = np.convolve(y, np.ones(_FACTOR) / _FACTOR, mode='valid')
+    assert len(y) == len(x)
+
+    f = CIC(_FACTOR, order=order)
+    out = np.concatenate([f.process(x[lo:lo + 4 * _FACTOR])
+                          for lo in range(0, len(x), 4 * _FACTOR)])
+
+    assert np.allclose(out, y[_FACTOR - 1::_FACTOR], rtol=1e-12, atol=1e-12)
+
+
+def test_minmax_order_and_time():
+    t = np.arange(12) * 0.1
+    x = np.array([3., 9., 1., 5.,
+                  0., 2., 4., 8.,
+                  7., 7., -1., 6.])
+
+    stage = FilterStage([MinMax(4)])
+    t_out, d_out = stage.process(t, [x])
+
+    # min and max in order of occurrence
+    assert list(d_out[0]) == [9., 1., 0., 8., 7., -1.]
+    # timestamped with the last sample of every group half
+    assert np.array_equal(t_out, t[[1, 3, 5, 7, 9, 11]])
+
+
+def test_nan_groups():
+    t, x = _signal(n=10 * _FACTOR)
+    missing = slice(3 * _FACTOR + 2, 3 * _FACTOR + 3)
+    x_nan = x.copy()
+    x_nan[missing] = np.nan
+
+    for make in (lambda: Boxcar(_FACTOR),
+                 lambda: LowPass(alpha=0.2, factor=_FACTOR)):
+        _, d_out = FilterStage([make()]).process(t, [x_nan])
+        y = d_out[0]
+
+        assert np.isnan(y[3])
+        assert not np.isnan(np.delete(y, 3)).any()
+
+        # the group is not fed to the filter, its state is kept
+        kept = np.delete(x, np.s_[3 * _FACTOR:4 * _FACTOR])
+        ref = make().process(kept)
+        assert np.allclose(np.delete(y, 3), ref, rtol=1e-12, atol=1e-12)
+
+
+def test_disabled_channel():
+    t, x = _signal(n=4 * _FACTOR)
+    stage = FilterStage([Boxcar(_FACTOR), Boxcar(_FACTOR)])
+    mean = x.reshape(-1, _FACTOR).mean(axis=1)
+
+    # second channel disabled, then enabled again mid-group
+    lo, hi = _FACTOR // 2, _FACTOR + _FACTOR // 2
+    t0, d0 = stage.process(t[:lo], [x[:lo], x[:lo]])
+    t1, d1 = stage.process(t[lo:hi], [x[lo:hi], None])
+    t2, d2 = stage.process(t[hi:], [x[hi:], x[hi:]])
+
+    assert len(t0) == 0
+    assert np.array_equal(t1, t[[_FACTOR - 1]])
+    assert np.allclose(d1[0], mean[:1])
+    assert d1[1] is None
+
+    # pending samples stay aligned, the group with missing samples is NaN
+    assert np.array_equal(t2, t[[2 * _FACTOR - 1, 3 * _FACTOR - 1,
+                                 4 * _FACTOR - 1]])
+    assert np.allclose(d2[0], mean[1:])
+    assert np.isnan(d2[1][0])
+    assert np.allclose(d2[1][1:], mean[2:])
+
+
+def test_invalid_factor():
+    for factor in (0, 2.5, '2'):
+        with pytest.raises(ValueError):
+            Boxcar(factor)
+    with pytest.raises(ValueError):
+        MinMax(1)
+    with pytest.raises(ValueError):
+        CIC(4, order=1.5)
+    with pytest.raises(ValueError):
+        FilterStage([Boxcar(4), MinMax(4)])
+
+    # integral floats are accepted
+    assert Boxcar(4.).factor == 4
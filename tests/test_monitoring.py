@@ -0,0 +1,233 @@
+import time
+import struct
+
+import pytest
+
+np = pytest.importorskip('numpy')
+
+from ingenialink.registers import REG_DTYPE
+from ingenialink.exceptions import ILValueError
+from ingenialink.monitoring import (MonitoringDecoder, MonitoringSession,
+                                    mapping_dtype)
+
+
+_MAPPING = {0: (0x0030, REG_DTYPE.S16),
+            1: (0x0031, REG_DTYPE.U32),
+            2: (0x0032, REG_DTYPE.FLOAT)}
+""" dict: Mixed data types mapping, as given by
+    `Network.monitoring_mapping`.
+"""
+
+_BLOCK = struct.Struct('<hIf')
+""" Struct: Packed little-endian block of the mapping. """
+
+
+def _samples(start, n):
+    """ Samples of every channel, exactly representable in their type. """
+
+    i = np.arange(start, start + n)
+    return [list(-1000 + 3 * i), list(0xFFFF0000 + i), list(0.25 * i - 7.5)]
+
+
+def _raw(samples):
+    return b''.join(_BLOCK.pack(*values) for values in zip(*samples))
+
+
+def test_mapping_dtype():
+    dtype = mapping_dtype(_MAPPING)
+
+    assert dtype.names == ('ch0', 'ch1', 'ch2')
+    assert dtype.itemsize == _BLOCK.size
+    assert [dtype.fields[name][1] for name in dtype.names] == [0, 2, 6]
+
+    # data types given alone, channels sorted
+    assert mapping_dtype({1: REG_DTYPE.U8, 0: REG_DTYPE.S64}).names == \
+        ('ch0', 'ch1')
+
+
+def test_decode():
+    decoder = MonitoringDecoder(_MAPPING)
+    samples = _samples(0, 10)
+
+    # trailing bytes of an incomplete block are ignored
+    blocks = decoder.decode(_raw(samples) + b'\x01\x02')
+
+    assert len(blocks) == 10
+    for ch, values in enumerate(samples):
+        assert list(blocks['ch{}'.format(ch)]) == values
+
+
+def test_append_grows():
+    decoder = MonitoringDecoder(_MAPPING, capacity=4)
+
+    expected = [[], [], []]
+    start = 0
+    for n in (3, 0, 5, 17, 1):
+        samples = _samples(start, n)
+        assert decoder.append(_raw(samples)) == n
+        for ch, values in enumerate(samples):
+            expected[ch].extend(values)
+        start += n
+
+    assert len(decoder) == start
+    assert [list(d) for d in decoder.data] == expected
+    assert decoder.data[0].dtype == np.int16
+    assert decoder.data[1].dtype == np.uint32
+    assert decoder.data[2].dtype == np.float32
+    assert list(decoder.channel_data(2)) == expected[2]
+
+    decoder.reset()
+    assert len(decoder) == 0
+
+
+def test_bytes_per_block():
+    decoder = MonitoringDecoder(_MAPPING, bytes_per_block=_BLOCK.size)
+    assert decoder.bytes_per_block == _BLOCK.size
+
+    with pytest.raises(ILValueError):
+        MonitoringDecoder(_MAPPING, bytes_per_block=_BLOCK.size + 2)
+
+    with pytest.raises(ILValueError):
+        MonitoringDecoder({})
+
+    with pytest.raises(ILValueError):
+        MonitoringDecoder({0: (0x0030, REG_DTYPE.STR)})
+
+
+class FakeReg(object):
+    def __init__(self, address, dtype):
+        self.address = address
+        self.dtype = dtype
+
+
+class FakeDict(object):
+    def get_regs(self, subnode):
+        return {'CH{}'.format(ch): FakeReg(address, dtype)
+                for ch, (address, dtype) in _MAPPING.items()}
+
+
+class FakeNet(object):
+    """ Network serving a list of monitoring reads. """
+
+    def __init__(self, reads):
+        self.reads = list(reads)
+        self.raw = b''
+        self.mapping = {}
+        self.enabled = 0
+        self.disabled = 0
+
+    def monitoring_remove_all_mapped_registers(self):
+        self.mapping = {}
+
+    def monitoring_set_mapped_register(self, channel, address, dtype):
+        self.mapping[channel] = (address, dtype)
+
+    @property
+    def monitoring_mapping(self):
+        return dict(self.mapping)
+
+    def monitoring_get_bytes_per_block(self):
+        return mapping_dtype(self.mapping).itemsize
+
+    def monitoring_enable(self):
+        self.enabled += 1
+
+    def monitoring_disable(self):
+        self.disabled += 1
+
+    def monitoring_read_data(self):
+        self.raw = self.reads.pop(0)
+
+    @property
+    def monitoring_raw_data(self):
+        return self.raw
+
+
+class FakeServo(object):
+    def __init__(self, net):
+        self.net = net
+        self.dict = FakeDict()
+        self.written = {}
+
+    def write(self, reg, value, subnode=1):
+        self.written[reg] = value
+
+    def raw_read(self, reg, subnode=1):
+        assert reg == 'MONITOR_NUMBER_CYCLES'
+        return len(self.net.reads)
+
+
+def _wait(cond, timeout=5.):
+    deadline = time.monotonic() + timeout
+    while not cond():
+        assert time.monotonic() < deadline, 'Timed out'
+        time.sleep(0.005)
+
+
+def _session(reads, **kwargs):
+    servo = FakeServo(FakeNet(reads))
+    session = MonitoringSession(servo, ['CH0', 'CH1', 'CH2'], period=0.001,
+                                **kwargs)
+
+    return servo, session
+
+
+def test_session_delivers_in_order():
+    reads = [_raw(_samples(10 * i, 10)) for i in range(20)]
+    blocks = []
+    servo, session = _session(reads, on_block=blocks.append, window=10)
+    net = servo.net
+
+    session.start()
+    _wait(lambda: len(blocks) == len(reads))
+    session.stop()
+
+    assert servo.written['MONITOR_WINDOW_SAMPLES'] == 10
+    assert [block.seq for block in blocks] == list(range(len(reads)))
+    assert list(np.concatenate([b.data['ch0'] for b in blocks])) == \
+        _samples(0, 200)[0]
+    t_ns = [block.t_ns for block in blocks]
+    assert t_ns == sorted(t_ns)
+
+    stats = session.stats
+    assert stats['blocks'] == len(reads)
+    assert stats['samples'] == 200
+    assert stats['bytes'] == 200 * _BLOCK.size
+    assert stats['dropped'] == 0
+    assert stats['errors'] == 0
+
+    assert net.enabled == 1
+    assert net.disabled == 1
+    session.stop()
+    assert net.disabled == 1
+
+
+def test_session_drops_on_full_queue():
+    reads = [_raw(_samples(i, 1)) for i in range(5)]
+    servo, session = _session(reads, queue_sz=2, put_timeout=0.01)
+    net = servo.net
+
+    session.start()
+    _wait(lambda: session.stats['blocks'] == len(reads) and
+          session.dropped == 3)
+    session.stop()
+
+    assert session.stats['dropped'] == 3
+    assert [session.get(0).seq for _ in range(2)] == [0, 1]
+    assert session.get(0) is None
+    assert net.disabled == 1
+
+
+@pytest.mark.filterwarnings(
+    'ignore::pytest.PytestUnhandledThreadExceptionWarning')
+def test_session_disabled_on_read_loop_error():
+    # not a buffer, decoding fails in the read loop
+    servo, session = _session([12345, _raw(_samples(0, 1))])
+    net = servo.net
+
+    session.start()
+    _wait(lambda: not session.running)
+    assert net.disabled == 1
+
+    session.stop()
+    assert net.disabled == 1
@@ -0,0 +1,104 @@
+import time
+import threading
+
+import pytest
+
+np = pytest.importorskip('numpy')
+
+from ingenialink.exceptions import ILIOError
+from ingenialink.recorder import Recorder, RecordingReader
+
+
+def _wait_error(rec, timeout=5.):
+    deadline = time.monotonic() + timeout
+    while rec.stats['error'] is None:
+        assert time.monotonic() < deadline, 'Writer did not fail'
+        time.sleep(0.01)
+
+
+def _stop(rec, timeout=5.):
+    """ Stop a recorder, failing if it does not return in time. """
+
+    thread = threading.Thread(target=rec.stop)
+    thread.daemon = True
+    thread.start()
+    thread.join(timeout)
+
+    assert not thread.is_alive(), 'Recorder.stop() did not return'
+
+
+def test_round_trip(tmp_path):
+    path = str(tmp_path / 'rec')
+    rec = Recorder(path, ['pos', 'cnt'], dtypes=[np.float64, np.int32],
+                   chunk_samples=100, fsync='never')
+    rec.start()
+
+    t = np.arange(1050) * 1e-3
+    pos = np.sin(t)
+    cnt = np.arange(1050, dtype=np.int32)
+    for lo in range(0, 1050, 70):
+        hi = lo + 70
+        assert rec.push(t[lo:hi], [pos[lo:hi], cnt[lo:hi]], block=True)
+    # disabled channel
+    assert rec.push([1.05, 1.051], [None, [7, 8]], block=True)
+    rec.stop()
+
+    stats = rec.stats
+    assert stats['samples'] == 1052
+    assert stats['chunks'] == 11
+    assert stats['dropped'] == 0
+    assert stats['error'] is None
+
+    reader = RecordingReader(path)
+    assert reader.channels == ['pos', 'cnt']
+    assert reader.samples == 1052
+
+    assert np.array_equal(reader.read('t', 0, 1050), t)
+    assert np.array_equal(reader.read('pos', 0, 1050), pos)
+    assert np.array_equal(reader.read('cnt', 0, 1050), cnt)
+    assert reader.read('cnt').dtype == np.int32
+    assert np.all(np.isnan(reader.read('pos', 1050)))
+    assert list(reader.read('cnt', 1050)) == [7, 8]
+
+    # ranges across chunks
+    assert np.array_equal(reader.read('pos', 95, 305), pos[95:305])
+    assert len(reader.read('pos', 2000)) == 0
+
+    chunks = list(reader.chunks())
+    assert len(chunks) == 11
+    assert np.array_equal(np.concatenate([c[0] for c in chunks]),
+                          reader.read('t'))
+    assert np.array_equal(chunks[3][1]['cnt'], cnt[300:400])
+
+
+def test_writer_error(tmp_path):
+    rec = Recorder(str(tmp_path / 'rec'), ['pos'], queue_sz=2,
+                   fsync='never')
+    rec.start()
+
+    # not numeric, fails in the writer
+    assert rec.push([0., 1.], [['a', 'b']])
+    _wait_error(rec)
+
+    with pytest.raises(ILIOError):
+        rec.push([2., 3.], [[1., 2.]])
+    with pytest.raises(ILIOError):
+        rec.push([2., 3.], [[1., 2.]], block=True)
+
+    _stop(rec)
+    assert isinstance(rec.stats['error'], ValueError)
+
+
+def test_writer_error_attached(tmp_path):
+    rec = Recorder(str(tmp_path / 'rec'), ['pos'], queue_sz=2,
+                   fsync='never')
+
+    def source():
+        return [0., 1.], [['a', 'b']], False
+
+    rec.start()
+    rec.attach(source, 0.001)
+    _wait_error(rec)
+
+    _stop(rec)
+    assert rec.stats['error'] is not None
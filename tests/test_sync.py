@@ -0,0 +1,124 @@
+import time
+import struct
+
+import pytest
+
+np = pytest.importorskip('numpy')
+canopen = pytest.importorskip('canopen')
+
+from ingenialink.canopen.sync import SyncAcquisition
+
+
+_NODES = (1, 2)
+""" tuple: Simulated node ids. """
+
+_DROP_NODE = 2
+""" int: Node not sending its TPDO on some SYNC cycles. """
+
+_DROP_EVERY = 5
+""" int: SYNC counters (multiples of it) on which the TPDO is dropped. """
+
+
+def _tpdo(node_id):
+    return 0x180 + node_id
+
+
+@pytest.fixture
+def bus(request):
+    """ Acquisition and simulated nodes networks on a virtual bus. """
+
+    channel = 'il_sync_' + request.node.name
+
+    nodes = canopen.Network()
+    nodes.connect(interface='virtual', channel=channel)
+
+    def on_sync(can_id, data, timestamp):
+        counter = data[0] if data else 0
+        for node_id in _NODES:
+            if node_id == _DROP_NODE and counter % _DROP_EVERY == 0:
+                continue
+            nodes.send_message(_tpdo(node_id),
+                               struct.pack('<ih', 1000 * node_id + counter,
+                                           -node_id))
+
+    nodes.subscribe(0x80, on_sync)
+
+    net = canopen.Network()
+    net.connect(interface='virtual', channel=channel)
+
+    yield net, channel
+
+    net.disconnect()
+    nodes.disconnect()
+
+
+def _acquisition(net):
+    acq = SyncAcquisition(net)
+    for node_id in _NODES:
+        acq.add_pdo(_tpdo(node_id),
+                    [('pos_{}'.format(node_id), 0, np.int32),
+                     ('vel_{}'.format(node_id), 4, np.int16)])
+
+    return acq
+
+
+def test_rows_aligned_with_sync(bus):
+    net, _ = bus
+
+    acq = _acquisition(net)
+    acq.start(period=0.005)
+    time.sleep(0.5)
+    acq.stop()
+
+    t, counter, d, mask = acq.data
+    assert acq.fields == ['pos_1', 'vel_1', 'pos_2', 'vel_2']
+    assert len(t) > 2 * _DROP_EVERY
+    assert np.all(np.diff(t) > 0)
+    assert np.all(counter >= 1)
+
+    # the last cycle may have been closed before its TPDOs arrived
+    t, counter, d, mask = t[:-1], counter[:-1], d[:-1], mask[:-1]
+
+    dropped = counter % _DROP_EVERY == 0
+    assert np.all(mask[:, 0])
+    assert np.array_equal(mask[:, 1], ~dropped)
+
+    for col, node_id in ((0, 1), (2, 2)):
+        received = mask[:, _NODES.index(node_id)]
+        assert np.array_equal(d[received, col],
+                              1000 * node_id + counter[received])
+        assert np.all(d[received, col + 1] == -node_id)
+        assert np.all(np.isnan(d[~received, col]))
+
+    stats = acq.stats
+    assert stats['missing'][_tpdo(1)] <= 1
+    assert stats['missing'][_tpdo(2)] >= np.count_nonzero(dropped)
+    assert stats['sync_lost'] == 0
+    assert stats['cycles_lost'] == 0
+
+
+def test_sync_counter_gaps(bus):
+    net, channel = bus
+
+    # SYNC produced by another device
+    producer = canopen.Network()
+    producer.connect(interface='virtual', channel=channel)
+
+    acq = _acquisition(net)
+    acq.start()
+
+    # counters 3 and 5 are lost
+    for counter in (1, 2, 4, 6, 7):
+        producer.sync.transmit(counter)
+        time.sleep(0.02)
+    acq.stop()
+    producer.disconnect()
+
+    t, counter, d, mask = acq.data
+    assert list(counter) == [1, 2, 4, 6, 7]
+    assert np.array_equal(d[:, 0], 1000 + counter)
+    assert mask.all()
+
+    stats = acq.stats
+    assert stats['sync_lost'] == 2
+    assert stats['missing'] == {_tpdo(1): 0, _tpdo(2): 0}